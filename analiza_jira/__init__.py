@@ -0,0 +1,13 @@
+"""
+Analiza eksportów Jira bez aplikacji Dash: kategoryzacja zadań, agregacja wyników
+i wsadowe raporty (python -m analiza_jira).
+"""
+from .core import (
+    PlatformRules, IssueHierarchy, OlapCube, FlowMetrics, JiraDataModel, FederatedDataModel, load_platform_rules,
+    get_platform_rules,
+    build_issue_hierarchy, build_categorized_issues, filter_categorized_issues, aggregate_categorized_issues,
+    aggregate_cube, build_aggregate_payload, categorize_and_filter_changes, load_jira_export, load_data_model,
+    find_latest_export, load_federated_model
+)
+from .charts import build_charts_and_kpis, build_chart_templates, build_flow_charts
+from .report import compute_export_report, compute_reports
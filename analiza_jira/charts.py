@@ -0,0 +1,207 @@
+"""
+Budowa wykresów Plotly i wartości KPI z wyników agregacji (wspólne dla aplikacji Dash
+i raportów wsadowych).
+"""
+import json
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from .core import VELOCITY_WINDOW_WEEKS
+from .instrumentation import stage_timer
+
+# Kolory kwartałów roku na wykresie platform (gdy zakres filtra obejmuje jeden rok)
+quarter_colors = {'Q1': '#2ecc71', 'Q2': '#3498db', 'Q3': '#e67e22', 'Q4': '#9b59b6'}
+
+
+def build_charts_and_kpis(filtered_categorized_results, filtered_issue_type_breakdown, kpi_quarters):
+    """
+    Buduje figury obu wykresów (jako słowniki JSON) i wartości KPI z wyników agregacji.
+    kpi_quarters to dwa kwartały pokazywane w kartach KPI (kpi-q1-total, kpi-q2-total).
+    """
+    # Kwartały z zakresu filtra, w kolejności chronologicznej
+    quarters = list(filtered_issue_type_breakdown)
+
+    # Aktualizacja KPI
+    total_q1 = sum(filtered_categorized_results.get(kpi_quarters[0], []))
+    total_q2 = sum(filtered_categorized_results.get(kpi_quarters[1], []))
+    total_overall = sum(sum(filtered_categorized_results[q]) for q in quarters)
+
+    # Przygotowanie danych dla wykresu 2D (Platforma vs Liczba Zadań)
+    # df_plot_2d_filtered musi odzwierciedlać tylko wybrane platformy
+    current_platforms_for_display = filtered_categorized_results["Platforma"] # Lista platform po filtrowaniu
+
+    plot_data_2d_filtered_items = []
+    for platform in current_platforms_for_display:
+        platform_idx = filtered_categorized_results["Platforma"].index(platform)
+        for quarter in quarters:
+            plot_data_2d_filtered_items.append({
+                "Platforma": platform,
+                "Liczba zadań": filtered_categorized_results[quarter][platform_idx],
+                "Kwartał": quarter
+            })
+    df_plot_2d_filtered = pd.DataFrame(plot_data_2d_filtered_items, columns=['Platforma', 'Liczba zadań', 'Kwartał'])
+
+    # Stałe kolory kwartałów roku mają sens tylko w obrębie jednego roku
+    if len({q.split()[-1] for q in quarters}) == 1:
+        quarter_color_map = {q: quarter_colors[q.split()[0]] for q in quarters}
+    else:
+        quarter_color_map = {}
+
+    fig_2d = px.bar(df_plot_2d_filtered, 
+                    x='Platforma', 
+                    y='Liczba zadań', 
+                    color='Kwartał', 
+                    barmode='group',
+                    title='Zakończone Zadania według Platform i Kwartałów',
+                    labels={'Liczba zadań': 'Liczba Zadań', 'Platforma': 'Platforma / Kategoria'},
+                    color_discrete_map=quarter_color_map,
+                    hover_data={'Kwartał': True, 'Liczba zadań': True, 'Platforma': False},
+                    template="plotly_white"
+                   ).update_layout(
+                       title_x=0.5, 
+                       font_size=14, 
+                       title_font_size=20,
+                       xaxis_title_font_size=16,
+                       yaxis_title_font_size=16,
+                       legend_title_font_size=14,
+                       legend_font_size=12
+                   )
+
+    # Przygotowanie danych dla wykresu rozkładu typów zadań (Issue Type Breakdown)
+    issue_type_data_filtered = []
+
+    # Zbierz wszystkie unikalne typy zadań zebrane przez categorize_and_filter_changes
+    all_issue_types_in_filtered_data = sorted({t for types in filtered_issue_type_breakdown.values() for t in types})
+
+    for issue_type in all_issue_types_in_filtered_data:
+        for quarter in quarters:
+            issue_type_data_filtered.append({
+                'Kwartał': quarter,
+                'Typ Zadania': issue_type,
+                'Liczba': filtered_issue_type_breakdown[quarter].get(issue_type, 0)
+            })
+
+    df_issue_type_filtered = pd.DataFrame(issue_type_data_filtered, columns=['Kwartał', 'Typ Zadania', 'Liczba'])
+
+    fig_issue_type = px.bar(df_issue_type_filtered,
+                            x='Kwartał',
+                            y='Liczba',
+                            color='Typ Zadania',
+                            barmode='stack',
+                            title=f'Rozkład Zakończonych Zadań według Typu ({" vs ".join(quarters)})',
+                            labels={'Liczba': 'Liczba Zadań', 'Typ Zadania': 'Typ Zadania'},
+                            template="plotly_white",
+                            hover_data={'Liczba': True, 'Kwartał': False, 'Typ Zadania': True}
+                           ).update_layout(
+                               title_x=0.5,
+                               font_size=14,
+                               title_font_size=20,
+                               xaxis_title_font_size=16,
+                               yaxis_title_font_size=16,
+                               legend_title_font_size=14,
+                               legend_font_size=12
+                           )
+    
+    # Dash i tak serializuje figury do JSON - trzymamy gotowe słowniki, żeby trafienie w cache
+    # pomijało zarówno Plotly Express, jak i walidację obiektów go.Figure
+    with stage_timer('serialize_figures'):
+        figures = json.loads(fig_2d.to_json()), json.loads(fig_issue_type.to_json())
+    return figures + (total_q1, total_q2, total_overall)
+
+
+def build_chart_templates(platforms):
+    """
+    Szablony wykresów dla callbacku po stronie przeglądarki (assets/clientside.js): layouty
+    obu wykresów i szkielety ich serii (bez danych) z build_charts_and_kpis, paleta kolorów
+    szablonu i kolory kwartałów. Dzięki temu wygląd wykresów jest zdefiniowany tylko tutaj.
+    """
+    quarter = 'Q1 2000'
+    fig_2d, fig_issue_type = build_charts_and_kpis(
+        {'Platforma': platforms, quarter: [1] * len(platforms)}, {quarter: {'Story': 1}}, [None, None]
+    )[:2]
+
+    def trace_skeleton(figure):
+        trace = dict(figure['data'][0])
+        for key in ['x', 'y', 'customdata', 'name', 'legendgroup']:
+            trace.pop(key, None)
+        trace['marker'] = {k: v for k, v in trace['marker'].items() if k != 'color'}
+        return trace
+
+    return {
+        'platform_layout': fig_2d['layout'],
+        'platform_trace': trace_skeleton(fig_2d),
+        'issue_type_layout': fig_issue_type['layout'],
+        'issue_type_trace': trace_skeleton(fig_issue_type),
+        'colorway': fig_2d['layout']['template']['layout']['colorway'],
+        'quarter_colors': quarter_colors
+    }
+
+
+def build_flow_charts(flow_metrics, platforms, selected_platform=None, selected_assignee=None):
+    """
+    Buduje figury czasu cyklu (p50/p90/p99 dla każdej platformy z filtra i całości)
+    oraz tygodniowej przepustowości z prędkością kroczącą (jako słowniki JSON).
+    selected_platform/selected_assignee równe None oznaczają wszystkie wartości.
+    """
+    # Percentyle czasu cyklu - całość i platformy z zakresu filtra, dla wybranej osoby
+    slices = [('Wszystkie', None)] if selected_platform is None else []
+    slices += [(p, p) for p in platforms if selected_platform is None or p == selected_platform]
+    cycle_rows = []
+    for label, platform in slices:
+        stats = flow_metrics.slice_percentiles(platform, selected_assignee)
+        if stats is None:
+            continue
+        for percentile in ['p50', 'p90', 'p99']:
+            cycle_rows.append({
+                'Platforma': label,
+                'Percentyl': percentile,
+                'Dni': round(stats[percentile], 1),
+                'Liczba zadań': stats['count']
+            })
+    df_cycle = pd.DataFrame(cycle_rows, columns=['Platforma', 'Percentyl', 'Dni', 'Liczba zadań'])
+
+    fig_cycle = px.bar(df_cycle,
+                       x='Platforma',
+                       y='Dni',
+                       color='Percentyl',
+                       barmode='group',
+                       title='Czas Cyklu Zadań (od rozpoczęcia do zakończenia)',
+                       labels={'Dni': 'Dni', 'Platforma': 'Platforma / Kategoria'},
+                       hover_data={'Liczba zadań': True, 'Percentyl': True},
+                       template="plotly_white"
+                      ).update_layout(
+                          title_x=0.5,
+                          font_size=14,
+                          title_font_size=20,
+                          xaxis_title_font_size=16,
+                          yaxis_title_font_size=16,
+                          legend_title_font_size=14,
+                          legend_font_size=12
+                      )
+    if df_cycle.empty:
+        fig_cycle.add_annotation(text='Brak zakończonych zadań z datą rozpoczęcia i zakończenia',
+                                 showarrow=False, xref='paper', yref='paper', x=0.5, y=0.5)
+
+    # Tygodniowa przepustowość (słupki) i prędkość krocząca (linia) wybranego przekroju
+    throughput, velocity = flow_metrics.slice_throughput(selected_platform, selected_assignee)
+    fig_throughput = go.Figure([
+        go.Bar(x=throughput.index, y=throughput.to_numpy(), name='Zakończone w tygodniu', marker_color='#3498db'),
+        go.Scatter(x=velocity.index, y=velocity.round(2).to_numpy(), mode='lines',
+                   name=f'Średnia krocząca ({VELOCITY_WINDOW_WEEKS} tyg.)',
+                   line={'color': '#e67e22', 'width': 3})
+    ]).update_layout(
+        title='Przepustowość Tygodniowa i Prędkość',
+        title_x=0.5,
+        template="plotly_white",
+        font_size=14,
+        title_font_size=20,
+        xaxis_title='Tydzień',
+        yaxis_title='Liczba Zadań',
+        xaxis_title_font_size=16,
+        yaxis_title_font_size=16,
+        legend_font_size=12
+    )
+
+    return json.loads(fig_cycle.to_json()), json.loads(fig_throughput.to_json())
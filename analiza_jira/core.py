@@ -0,0 +1,1508 @@
+"""
+Rdzeń analizy eksportów Jira: reguły platform, hierarchia zadań, kategoryzacja,
+agregacja wyników i wczytywanie eksportów. Import modułu nie wczytuje danych
+(jedynie plik reguł platform), więc można go używać poza aplikacją Dash.
+"""
+import numpy as np
+import pandas as pd
+import os
+import re
+import sys
+import json
+import copy
+import hashlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from .instrumentation import stage_timer
+
+try:
+    import pyarrow.parquet  # silnik Parquet dla pandas (opcjonalny)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# --- 1. Funkcje do parsowania i kategoryzacji danych ---
+
+class PlatformRules:
+    """
+    Skompilowane reguły przypisywania platform z pliku platform_rules.json: słowa kluczowe
+    z priorytetami (jedno wyrażenie regularne dla wszystkich słów) i manualne nadpisania
+    kwartału/platform dla wybranych kluczy zadań.
+    """
+
+    def __init__(self, platforms, default_platform, keyword_rules, manual_overrides):
+        self.platforms = list(platforms)
+        self.default_platform = default_platform
+        for platform in [default_platform] + [rule['platform'] for rule in keyword_rules]:
+            if platform not in self.platforms:
+                raise ValueError(f"Nieznana platforma w regułach: '{platform}'.")
+
+        # Słowa uporządkowane wg priorytetu reguły; ranga słowa to jego pozycja na liście.
+        # Przy powtórzonym słowie wygrywa reguła o wyższym priorytecie.
+        self.keyword_ranks = {}
+        self.rank_platforms = []
+        for rule in sorted(keyword_rules, key=lambda r: r['priority']):
+            for keyword in rule['keywords']:
+                if keyword not in self.keyword_ranks:
+                    self.keyword_ranks[keyword] = len(self.rank_platforms)
+                    self.rank_platforms.append(rule['platform'])
+        self.rank_platforms = np.array(self.rank_platforms + [default_platform], dtype=object)
+
+        # Lookahead zwraca dopasowanie na każdej pozycji tekstu (także nakładające się),
+        # a kolejność alternatyw wg priorytetu rozstrzyga słowa zaczynające się w tym samym miejscu
+        alternatives = '|'.join(re.escape(keyword) for keyword in self.keyword_ranks)
+        self.keyword_pattern = re.compile(f'(?=({alternatives}))') if alternatives else None
+        # To samo bez grupy - do samego sprawdzenia, czy tekst zawiera jakiekolwiek słowo
+        self.any_keyword_pattern = re.compile(alternatives) if alternatives else None
+
+        # Manualne mapowania kluczy zadań do przypisanych platform i kwartałów,
+        # jeden wiersz na (klucz, platforma) - zadanie może mieć kilka platform
+        for override in manual_overrides:
+            for platform in override['platforms']:
+                if platform not in self.platforms:
+                    raise ValueError(f"Nieznana platforma '{platform}' w nadpisaniu {override['key']}.")
+        # Przy powtórzonym kluczu obowiązuje ostatnie nadpisanie
+        last_overrides = {o['key']: o for o in manual_overrides}.values()
+        self.overrides = pd.DataFrame(
+            [(o['key'], o['quarter'], platform, order)
+             for o in last_overrides
+             for order, platform in enumerate(o['platforms'])],
+            columns=['Key', 'Quarter', 'Platforma', 'Order']
+        )
+
+    @property
+    def default_rank(self):
+        """
+        Ranga oznaczająca brak słowa kluczowego (platforma domyślna).
+        """
+        return len(self.rank_platforms) - 1
+
+    def rank(self, *texts):
+        """
+        Zwraca tablicę rang (mniejsza = wyższy priorytet) najlepszego słowa kluczowego
+        w tekstach danego wiersza; rank_platforms[ranga] to przypisana platforma.
+        """
+        n_rows = len(texts[0])
+        if self.keyword_pattern is None or n_rows == 0:
+            return np.full(n_rows, self.default_rank, dtype=np.int64)
+
+        # Jeden przebieg wyrażenia po połączonych tekstach (\x00 nie występuje w słowach kluczowych)
+        combined = pd.Series(np.asarray(texts[0], dtype=object), index=np.arange(n_rows))
+        for text in texts[1:]:
+            combined = combined + '\x00' + np.asarray(text, dtype=object)
+        matches = combined.str.findall(self.keyword_pattern).explode()
+        best_rank = matches.map(self.keyword_ranks).groupby(level=0).min()
+        best_rank = best_rank.reindex(np.arange(n_rows)).fillna(self.default_rank)
+        return best_rank.to_numpy(dtype=np.int64)
+
+
+class IssueHierarchy:
+    """
+    Tablicowy indeks hierarchii zadań (epik -> story -> sub-task ...), budowany raz przy
+    wczytaniu danych. Dla każdego klucza przechowuje wskaźnik na rodzica (-1 = brak), korzeń
+    drzewa oraz najlepszą rangę słowa kluczowego platformy wśród zadania i wszystkich jego
+    przodków. Dzieci trzymane są w układzie CSR, więc potomków epika zwracamy w czasie
+    proporcjonalnym do ich liczby.
+    """
+
+    def __init__(self, keys, parent_keys, keyword_ranks, default_rank, row_positions=None):
+        self.keys = pd.Index(keys)
+        self.default_rank = default_rank
+        # Klucze rodziców w postaci z eksportu - do łączenia indeksów kilku eksportów (combine_hierarchies)
+        self.parent_keys = parent_keys
+        # Własne rangi zadań (bez przodków) - pozwalają przebudować indeks po zmianie części zadań
+        self.keyword_ranks = np.asarray(keyword_ranks, dtype=np.int64)
+        # Pozycja wiersza eksportu dla każdego klucza (do wyświetlania szczegółów potomków)
+        self.row_positions = row_positions
+        n_issues = len(self.keys)
+
+        parent = self.positions(parent_keys)
+        parent[parent == np.arange(n_issues)] = -1
+        ancestor, root, inherited_rank = self._resolve_ancestors(parent, np.asarray(keyword_ranks))
+        # Zapętlone łańcuchy rodziców (błędne dane) nigdy nie dochodzą do korzenia - odcinamy je
+        cyclic = ancestor >= 0
+        if cyclic.any():
+            parent[cyclic] = -1
+            ancestor, root, inherited_rank = self._resolve_ancestors(parent, np.asarray(keyword_ranks))
+        self.parent = parent
+        self.root = root
+        self.inherited_rank = inherited_rank
+
+        # Dzieci w układzie CSR: dzieci zadania i to children[child_offsets[i]:child_offsets[i + 1]]
+        has_parent = parent >= 0
+        self.children = np.flatnonzero(has_parent)[np.argsort(parent[has_parent], kind='stable')]
+        self.child_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(parent[has_parent], minlength=n_issues))]
+        )
+
+    @staticmethod
+    def _resolve_ancestors(parent, keyword_ranks):
+        """
+        Podwajanie wskaźników: po k krokach ancestor to przodek w odległości 2^k, a rank to
+        minimum rang zadania i jego 2^k - 1 najbliższych przodków. Kończymy, gdy żaden
+        wskaźnik nie ma już przodka (najwyżej log2(n) kroków).
+        """
+        n_issues = len(parent)
+        ancestor = parent.copy()
+        root = np.where(parent >= 0, parent, np.arange(n_issues))
+        rank = keyword_ranks.astype(np.int64, copy=True)
+        for _ in range(int(np.log2(n_issues + 1)) + 2):
+            has_ancestor = ancestor >= 0
+            if not has_ancestor.any():
+                break
+            targets = ancestor[has_ancestor]
+            rank[has_ancestor] = np.minimum(rank[has_ancestor], rank[targets])
+            ancestor[has_ancestor] = ancestor[targets]
+            root = root[root]
+        return ancestor, root, rank
+
+    def positions(self, keys):
+        """
+        Pozycje podanych kluczy w indeksie (-1 dla braków i nieznanych kluczy).
+        """
+        keys = pd.Series(np.asarray(keys, dtype=object))
+        positions = self.keys.get_indexer(keys.astype(str))
+        positions[keys.isna().to_numpy()] = -1
+        return positions
+
+    def parent_ranks(self, parent_keys):
+        """
+        Ranga dziedziczona po rodzicu (i wszystkich jego przodkach) dla podanych kluczy rodziców.
+        """
+        parent = self.positions(parent_keys)
+        return np.where(parent >= 0, self.inherited_rank[np.maximum(parent, 0)], self.default_rank)
+
+    def descendants(self, positions):
+        """
+        Pozycje wszystkich potomków podanych zadań, poziom po poziomie.
+        """
+        found = []
+        frontier = np.asarray(positions, dtype=np.int64)
+        frontier = frontier[frontier >= 0]
+        while frontier.size:
+            starts = self.child_offsets[frontier]
+            counts = self.child_offsets[frontier + 1] - starts
+            total = counts.sum()
+            if total == 0:
+                break
+            # Indeksy wszystkich dzieci frontu naraz: start każdego zadania + przesunięcie w grupie
+            offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+            frontier = self.children[offsets]
+            found.append(frontier)
+        return np.concatenate(found) if found else np.array([], dtype=np.int64)
+
+
+def build_issue_hierarchy(df_raw_input, previous_hierarchy=None, changed_keys=None):
+    """
+    Buduje IssueHierarchy dla eksportu (przy powtórzonym kluczu wygrywa ostatni wiersz).
+    Z poprzednim indeksem i listą zmienionych kluczy rangi słów kluczowych pozostałych zadań
+    są przepisywane z poprzedniego indeksu zamiast ponownego dopasowania reguł do Summary.
+    """
+    platform_rules = get_platform_rules()
+    df = df_raw_input
+    keys = df['Key'].astype(str)
+    is_last = ~keys.duplicated(keep='last').to_numpy()
+    keys = keys[is_last]
+    summary = df['Summary'][is_last]
+    if previous_hierarchy is None or len(previous_hierarchy.keys) == 0:
+        stale = np.ones(len(keys), dtype=bool)
+        keyword_ranks = np.empty(len(keys), dtype=np.int64)
+    else:
+        previous_positions = previous_hierarchy.keys.get_indexer(keys)
+        stale = (previous_positions < 0) | keys.isin(changed_keys if changed_keys is not None else []).to_numpy()
+        keyword_ranks = previous_hierarchy.keyword_ranks[np.maximum(previous_positions, 0)]
+    keyword_ranks[stale] = platform_rules.rank(summary[stale].astype(object).fillna('').astype(str))
+    return IssueHierarchy(
+        keys.to_numpy(), df['Parent'][is_last].array,
+        keyword_ranks, platform_rules.default_rank,
+        row_positions=np.flatnonzero(is_last)
+    )
+
+
+def load_platform_rules(rules_path):
+    """
+    Wczytuje i kompiluje reguły platform z pliku JSON. Błędny JSON, brakujące pola
+    i nieznane platformy zgłaszają ValueError ze ścieżką pliku.
+    """
+    try:
+        with open(rules_path, encoding='utf-8') as f:
+            rules = json.load(f)
+        return PlatformRules(
+            rules['platforms'], rules['default_platform'],
+            rules.get('keyword_rules', []), rules.get('manual_overrides', [])
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Błędny plik reguł platform '{rules_path}': {e!r}") from e
+
+
+# Reguły wczytywane i kompilowane raz, przy pierwszym użyciu - brakujący lub błędny plik
+# reguł nie psuje importu pakietu (np. w narzędziach, które reguł nie potrzebują)
+platform_rules_path = os.environ.get(
+    'JIRA_PLATFORM_RULES',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'platform_rules.json')
+)
+_platform_rules = None
+
+
+def get_platform_rules():
+    """
+    Reguły platform z platform_rules_path, wczytane przy pierwszym wywołaniu.
+    """
+    global _platform_rules
+    if _platform_rules is None:
+        _platform_rules = load_platform_rules(platform_rules_path)
+    return _platform_rules
+
+
+def __getattr__(name):
+    """
+    Nazwy modułu zależne od reguł platform (platform_rules, all_platforms_for_display
+    i platform_filter_values - wartości filtra platform) liczone przy pierwszym odczycie.
+    """
+    if name == 'platform_rules':
+        return get_platform_rules()
+    if name == 'all_platforms_for_display':
+        return get_platform_rules().platforms
+    if name == 'platform_filter_values':
+        return ['All Platforms'] + get_platform_rules().platforms
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def quarter_sort_key(quarter_label):
+    """
+    Klucz sortowania chronologicznego etykiet kwartałów w formacie 'Q1 2025'.
+    """
+    quarter, year = quarter_label.split()
+    return int(year), int(quarter[1:])
+
+
+def discover_quarters(categorized_issues):
+    """
+    Lista kwartałów występujących w tabeli z build_categorized_issues, w kolejności chronologicznej.
+    """
+    return sorted(categorized_issues['Quarter'].dropna().unique(), key=quarter_sort_key)
+
+
+def get_quarters_in_scope(quarters, selected_quarter=None):
+    """
+    Kwartały pokazywane dla wybranej wartości filtra: wszystkie dla 'All', a dla roku
+    ('All 2025') lub pojedynczego kwartału ('Q1 2025') - kwartały tego roku.
+    """
+    if selected_quarter is None or selected_quarter == 'All':
+        return list(quarters)
+    year = selected_quarter.split()[-1]
+    return [q for q in quarters if q.split()[-1] == year]
+
+
+def build_quarter_filter_options(quarters):
+    """
+    Opcje filtra kwartałów: wszystkie, poszczególne lata i poszczególne kwartały z danych.
+    """
+    years = sorted({q.split()[-1] for q in quarters})
+    return ([{'label': 'Wszystkie Kwartały', 'value': 'All'}] +
+            [{'label': f'Cały {year}', 'value': f'All {year}'} for year in years] +
+            [{'label': q, 'value': q} for q in quarters])
+
+
+done_issue_columns = [
+    'Key', 'Issue Type', 'Parent', 'Summary', 'Start date', 'Inferred start date', 'Due date', 'Inferred due date',
+    'Assignee', 'Sprint', 'Issue color'
+]
+
+# Dodatkowe wymiary przekroju zadań (kostka OLAP); brak wartości w eksporcie to osobna wartość
+cube_dimensions = ['Assignee', 'Sprint', 'Issue Type', 'Issue color']
+missing_dimension_label = '(brak)'
+# Kolumny tabeli skategoryzowanych zadań (wynik categorize_done_issues)
+categorized_issue_columns = [
+    'Key', 'Issue Type', 'Summary', 'Detail', 'Quarter', 'Platforma', 'Assignee', 'Sprint', 'Issue color',
+    'Start_Date', 'Completion_Date'
+]
+
+
+def build_categorized_issues(df_raw_input, hierarchy=None):
+    """
+    Jednorazowo kategoryzuje zakończone zadania i przypisuje je do kwartałów z danych.
+    Zwraca tabelę z jednym wierszem na (zadanie, kwartał, platforma), z której
+    callbacki odczytują wyniki dla dowolnych filtrów. Tabelę traktujemy jako tylko do odczytu.
+    """
+    df = df_raw_input
+    if hierarchy is None:
+        with stage_timer('build_hierarchy', rows=len(df)):
+            hierarchy = build_issue_hierarchy(df)
+    df_done = df.loc[df['Status'] == 'Done', done_issue_columns]
+    with stage_timer('categorize', rows=len(df_done)):
+        return categorize_done_issues(df_done, hierarchy)
+
+
+def categorize_done_issues(df_done, hierarchy):
+    """
+    Kategoryzuje zakończone zadania (kolumny done_issue_columns). Platforma ze słów
+    kluczowych jest dziedziczona po wszystkich przodkach zadania z IssueHierarchy.
+    """
+    # Kopiujemy tylko zakończone zadania i tylko potrzebne kolumny
+    df_done = df_done[['Key', 'Issue Type', 'Parent', 'Summary', 'Assignee', 'Sprint', 'Issue color']].assign(
+        Start_Date=pd.to_datetime(df_done['Start date'], errors='coerce', format='%Y/%m/%d').fillna(
+            pd.to_datetime(df_done['Inferred start date'], errors='coerce', format='%Y/%m/%d')
+        ),
+        Completion_Date=pd.to_datetime(df_done['Due date'], errors='coerce', format='%Y/%m/%d').fillna(
+            pd.to_datetime(df_done['Inferred due date'], errors='coerce', format='%Y/%m/%d')
+        )
+    )
+
+    # Wszystkie obliczenia poniżej wykonujemy na całych kolumnach (bez iterrows),
+    # zachowując kolejność wierszy z df_done, aby listy szczegółów były identyczne.
+    # astype(object) pozwala uzupełnić braki również w kolumnach kategorycznych ze snapshotu
+    summary = df_done['Summary'].astype(object).fillna('').astype(str)
+    issue_type = df_done['Issue Type'].astype(object).fillna('').astype(str)
+    key = df_done['Key'].astype(object).fillna('').astype(str)
+
+    # 1. Kwartał z daty zakończenia - jedna konwersja na okresy kwartalne (NaT -> brak kwartału)
+    quarter_periods = df_done['Completion_Date'].dt.to_period('Q')
+    current_item_quarter = quarter_periods.dt.strftime('Q%q %Y').to_numpy(dtype=object)
+
+    # 2. Kategoria ze słów kluczowych - jeden przebieg skompilowanych reguł po Summary zadania,
+    # a ranga przodków (rodzic, epik rodzica, ...) jest już policzona w indeksie hierarchii.
+    # Test "[Umpire" in summary zawiera się w "Umpire" in summary, więc wystarczy samo słowo.
+    platform_rules = get_platform_rules()
+    best_rank = np.minimum(platform_rules.rank(summary), hierarchy.parent_ranks(df_done['Parent']))
+    determined_category = platform_rules.rank_platforms[best_rank]
+
+    # Tabela (zadanie, kwartał, kategoria) - jeden wiersz na każdą kategorię zadania
+    items = pd.DataFrame({
+        'Row': np.arange(len(df_done)),
+        'Order': 0,
+        'Key': key.to_numpy(),
+        'Issue Type': issue_type.to_numpy(),
+        'Summary': summary.to_numpy(),
+        'Detail': ("[" + key + "] " + summary + " (" + issue_type + ")").to_numpy(),
+        'Quarter': current_item_quarter,
+        'Platforma': determined_category,
+        'Start_Date': df_done['Start_Date'].to_numpy(),
+        'Completion_Date': df_done['Completion_Date'].to_numpy(),
+        **{
+            column: df_done[column].astype(object).fillna(missing_dimension_label).astype(str).to_numpy()
+            for column in ['Assignee', 'Sprint', 'Issue color']
+        }
+    })
+
+    # Manualne nadpisania zastępują kwartał i kategorie (zadanie może mieć ich kilka)
+    overrides = platform_rules.overrides
+    is_overridden = items['Key'].isin(overrides['Key'])
+    overridden_items = items.loc[
+        is_overridden,
+        ['Row', 'Key', 'Issue Type', 'Summary', 'Detail', 'Assignee', 'Sprint', 'Issue color', 'Start_Date', 'Completion_Date']
+    ].merge(overrides, on='Key')
+    items = pd.concat([items[~is_overridden], overridden_items], ignore_index=True)
+    items = items.sort_values(['Row', 'Order'], kind='stable')
+
+    # Zostawiamy tylko zadania przypisane do kwartału i znanej platformy
+    items = items[items['Quarter'].notna() & items['Platforma'].isin(platform_rules.platforms)]
+    return items[categorized_issue_columns].reset_index(drop=True)
+
+
+# Opcje odczytu eksportu CSV porcjami w trybie strumieniowym
+stream_read_options = {'sep': ',', 'quotechar': '"', 'dtype': str}
+
+
+def scan_issue_hierarchy(file_path, chunksize=100_000):
+    """
+    Pierwszy przebieg strumieniowy po eksporcie CSV: IssueHierarchy (ostatnie wystąpienie
+    klucza, z pozycją jego wiersza w pliku) i klucze występujące w pliku więcej niż raz.
+    Z Summary potrzebna jest tylko ranga słowa kluczowego, więc samych tekstów nie przechowujemy.
+    """
+    platform_rules = get_platform_rules()
+    keys, parents, ranks = [], [], []
+    for chunk in pd.read_csv(file_path, usecols=['Key', 'Parent', 'Summary'], chunksize=chunksize,
+                             **stream_read_options):
+        keys.append(chunk['Key'].astype(str))
+        parents.append(chunk['Parent'])
+        ranks.append(platform_rules.rank(chunk['Summary'].astype(object).fillna('').astype(str)))
+    keys = pd.concat(keys, ignore_index=True) if keys else pd.Series([], dtype=str)
+    parents = pd.concat(parents, ignore_index=True) if parents else pd.Series([], dtype=str)
+    ranks = np.concatenate(ranks) if ranks else np.array([], dtype=np.int64)
+    is_last = ~keys.duplicated(keep='last').to_numpy()
+    repeated_keys = keys[keys.duplicated(keep=False).to_numpy()].unique()
+    hierarchy = IssueHierarchy(
+        keys[is_last].to_numpy(dtype=object), parents[is_last].array, ranks[is_last], platform_rules.default_rank,
+        row_positions=np.flatnonzero(is_last)
+    )
+    return hierarchy, repeated_keys
+
+
+class CategorizedStream:
+    """
+    Kategoryzacja porcjami dla jednego modelu: każda porcja zakończonych zadań jest od razu
+    kategoryzowana z podaną hierarchią i doliczana do komórek kostki OLAP, a w pamięci zostaje
+    zwarty wiersz na zadanie - bez tytułu, z samym kluczem jako Detail. Zadania z kluczem
+    powtórzonym w danych (repeated_keys) zachowują pełne wiersze, a ich komórki są liczone
+    na końcu: jak w build_categorized_issues każdy wiersz jest kategoryzowany, a w kostce
+    liczą się unikalne opisy.
+    """
+
+    def __init__(self, hierarchy, repeated_keys=()):
+        self.hierarchy = hierarchy
+        self.repeated_keys = pd.Index(np.asarray(repeated_keys, dtype=object))
+        self.chunks = []
+        self.cells, self.totals = Counter(), Counter()
+
+    def is_repeated(self, keys):
+        return self.repeated_keys.get_indexer(keys) >= 0
+
+    def add(self, df_done):
+        categorized_chunk = categorize_done_issues(df_done, self.hierarchy)
+        is_repeated = self.is_repeated(categorized_chunk['Key'])
+        compact_chunk = categorized_chunk.assign(
+            Summary=np.where(is_repeated, categorized_chunk['Summary'].to_numpy(dtype=object), ''),
+            Detail=np.where(is_repeated, categorized_chunk['Detail'].to_numpy(dtype=object),
+                            categorized_chunk['Key'].to_numpy(dtype=object))
+        )
+        # Klucze spoza repeated_keys nie powtarzają się w innych porcjach, więc komórki kostki się sumują
+        chunk_cells, chunk_totals = count_cube_cells(compact_chunk[~is_repeated])
+        self.cells.update(chunk_cells)
+        self.totals.update(chunk_totals)
+        self.chunks.append(compact_chunk)
+
+    @classmethod
+    def merged(cls, streams):
+        """
+        Połączenie strumieni kolejnych części danych z rozłącznymi kluczami (np. plików federacji).
+        """
+        merged = cls(streams[0].hierarchy, streams[0].repeated_keys)
+        for stream in streams:
+            merged.chunks += stream.chunks
+            merged.cells.update(stream.cells)
+            merged.totals.update(stream.totals)
+        return merged
+
+    def result(self):
+        """
+        (zwarta tabela skategoryzowanych zadań, OlapCube) po wszystkich porcjach.
+        """
+        if not self.chunks:
+            self.chunks.append(categorize_done_issues(pd.DataFrame(columns=done_issue_columns), self.hierarchy))
+        categorized_issues = pd.concat(self.chunks, ignore_index=True)
+        cells, totals = self.cells, self.totals
+        repeated = categorized_issues[self.is_repeated(categorized_issues['Key'])]
+        if len(repeated):
+            repeated_cells, repeated_totals = count_cube_cells(repeated)
+            cells, totals = cells + Counter(repeated_cells), totals + repeated_totals
+        return categorized_issues, OlapCube.from_cells(dict(cells), totals)
+
+
+def stream_categorized_issues(file_path, chunksize=100_000):
+    """
+    Strumieniowa wersja build_categorized_issues dla bardzo dużych eksportów CSV. Plik jest
+    czytany porcjami dwa razy: najpierw powstaje indeks hierarchii, potem porcje zakończonych
+    zadań trafiają do CategorizedStream. Pełne wiersze eksportu i tytuły zadań nie są
+    przechowywane, ale pamięć nadal rośnie z rozmiarem pliku: indeks hierarchii ma klucz,
+    rodzica i rangę każdego zadania, a tabela - zwarty wiersz każdego zakończonego zadania
+    (dla panelu szczegółów i analizy przepływu).
+    Zwraca (zwarta tabela skategoryzowanych zadań, IssueHierarchy, OlapCube).
+    """
+    hierarchy, repeated_keys = scan_issue_hierarchy(file_path, chunksize)
+    stream = CategorizedStream(hierarchy, repeated_keys)
+    for chunk in pd.read_csv(file_path, usecols=['Status'] + done_issue_columns, chunksize=chunksize,
+                             **stream_read_options):
+        stream.add(chunk.loc[(chunk['Status'] == 'Done').to_numpy(), done_issue_columns])
+    categorized_issues, cube = stream.result()
+    return categorized_issues, hierarchy, cube
+
+
+def combine_hierarchies(hierarchies):
+    """
+    IssueHierarchy zadań kilku eksportów podanych od najstarszego do najnowszego - przy
+    powtórzonym kluczu wygrywa najnowszy eksport, jak w combine_source_exports - oraz numer
+    eksportu, z którego pochodzi każde zadanie indeksu.
+    """
+    keys = np.concatenate([hierarchy.keys.to_numpy(dtype=object) for hierarchy in hierarchies])
+    parent_keys = np.concatenate([np.asarray(hierarchy.parent_keys, dtype=object) for hierarchy in hierarchies])
+    keyword_ranks = np.concatenate([hierarchy.keyword_ranks for hierarchy in hierarchies])
+    source_index = np.concatenate([np.full(len(hierarchy.keys), i) for i, hierarchy in enumerate(hierarchies)])
+    is_last = ~pd.Series(keys).duplicated(keep='last').to_numpy()
+    combined = IssueHierarchy(keys[is_last], parent_keys[is_last], keyword_ranks[is_last],
+                              get_platform_rules().default_rank)
+    return combined, source_index[is_last]
+
+
+# Powyżej tej części zadań dotkniętych zmianą przeładowanie buduje model od nowa - porównanie
+# wierszy i poprawki kostki kosztowałyby wtedy więcej niż pełna kategoryzacja
+INCREMENTAL_RELOAD_MAX_SHARE = 0.25
+
+
+def find_changed_keys(previous_df_raw, df_raw_input):
+    """
+    Klucze zadań nowego eksportu, których nie było w poprzednim albo których kolumny używane
+    przy kategoryzacji się zmieniły. Kolumny są porównywane wprost (po dopasowaniu wierszy
+    po Key), bez zamiany na tekst. None, gdy powtórzone klucze nie pozwalają jednoznacznie
+    porównać wierszy.
+    """
+    previous_keys = previous_df_raw['Key'].astype(str)
+    keys = df_raw_input['Key'].astype(str)
+    if previous_keys.duplicated().any() or keys.duplicated().any():
+        return None
+    previous_positions = pd.Index(previous_keys).get_indexer(keys)
+    changed = previous_positions < 0
+    previous_rows = previous_df_raw.iloc[np.maximum(previous_positions, 0)]
+    for column in ['Status'] + done_issue_columns:
+        previous_values = previous_rows[column].reset_index(drop=True)
+        values = df_raw_input[column].reset_index(drop=True)
+        # Kategorie z różnych eksportów mają różne zbiory wartości - porównujemy same wartości
+        if isinstance(previous_values.dtype, pd.CategoricalDtype) or isinstance(values.dtype, pd.CategoricalDtype):
+            previous_values, values = previous_values.astype(object), values.astype(object)
+        same = (previous_values == values).fillna(False).to_numpy(dtype=bool)
+        changed |= ~(same | (previous_values.isna() & values.isna()).to_numpy())
+    return keys[changed].to_numpy()
+
+
+def update_categorized_issues(previous_categorized_issues, previous_hierarchy, df_raw_input, hierarchy, changed_keys):
+    """
+    Aktualizuje tabelę z build_categorized_issues po wczytaniu nowego eksportu, kategoryzując
+    ponownie tylko zmienione zadania (changed_keys z find_changed_keys) oraz zadania, których
+    przodkowie zmienili dziedziczoną platformę. Zwraca (tabela taka sama jak
+    build_categorized_issues(df_raw_input), nowe wiersze dotkniętych zadań, ich dotychczasowe
+    wiersze razem z wierszami usuniętych zadań) albo None, gdy zmiana obejmuje więcej niż
+    INCREMENTAL_RELOAD_MAX_SHARE zadań i taniej jest zbudować tabelę od nowa.
+    """
+    keys = df_raw_input['Key'].astype(str)
+    # Zmiana Summary lub rodzica u dowolnego przodka może zmienić rangę dziedziczoną przez zadanie
+    parent_rank_changed = (hierarchy.parent_ranks(df_raw_input['Parent']) !=
+                           previous_hierarchy.parent_ranks(df_raw_input['Parent']))
+    affected = keys.isin(changed_keys).to_numpy() | parent_rank_changed
+    if affected.sum() > INCREMENTAL_RELOAD_MAX_SHARE * len(keys):
+        return None
+
+    df_affected = df_raw_input[affected]
+    added_issues = categorize_done_issues(
+        df_affected.loc[df_affected['Status'] == 'Done', done_issue_columns], hierarchy
+    )
+    # Dotychczasowe wiersze dotkniętych zadań i zadań, których nie ma już w eksporcie
+    previous_keys = previous_categorized_issues['Key']
+    is_removed = previous_keys.isin(keys[affected].unique()).to_numpy() | (hierarchy.positions(previous_keys) < 0)
+    removed_issues = previous_categorized_issues[is_removed].reset_index(drop=True)
+
+    # Przywracamy kolejność wierszy nowego eksportu (stabilnie - kolejność kategorii zadania zostaje)
+    row_position = pd.Series(np.arange(len(keys)), index=keys.to_numpy())
+    items = pd.concat([previous_categorized_issues[~is_removed], added_issues], ignore_index=True)
+    items = items.iloc[np.argsort(row_position.reindex(items['Key']).to_numpy(), kind='stable')]
+    return items.reset_index(drop=True), added_issues, removed_issues
+
+
+def filter_categorized_issues(categorized_issues, selected_quarter=None, selected_platform=None):
+    """
+    Zwraca wiersze tabeli z build_categorized_issues pasujące do wybranego kwartału/platformy.
+    selected_quarter to 'All', rok ('All 2025') albo pojedynczy kwartał ('Q1 2025').
+    """
+    mask = np.ones(len(categorized_issues), dtype=bool)
+    if selected_quarter is not None and selected_quarter.startswith('All '):
+        year = selected_quarter.split()[-1]
+        mask &= (categorized_issues['Quarter'].str[-4:] == year).to_numpy()
+    elif selected_quarter is not None and selected_quarter != 'All':
+        mask &= (categorized_issues['Quarter'] == selected_quarter).to_numpy()
+    if selected_platform is not None and selected_platform != 'All Platforms':
+        mask &= (categorized_issues['Platforma'] == selected_platform).to_numpy()
+    return categorized_issues[mask]
+
+
+def quarter_in_filter(quarter, selected_quarter=None):
+    """
+    Sprawdza, czy kwartał ('Q1 2025') mieści się w wartości filtra kwartałów
+    (te same reguły co w filter_categorized_issues).
+    """
+    if selected_quarter is None or selected_quarter == 'All':
+        return True
+    if selected_quarter.startswith('All '):
+        return quarter[-4:] == selected_quarter.split()[-1]
+    return quarter == selected_quarter
+
+
+class DetailsIndex:
+    """
+    Indeks szczegółów zadań dla panelu szczegółów: wiersze każdej pary (kwartał, platforma)
+    bez powtórzonych Detail, posortowane po Detail. Pobranie grupy to jedno wyszukanie
+    w słowniku, bez filtrowania całości, a zmiana części zadań przebudowuje tylko grupy,
+    których dotyczy (updated).
+    """
+    columns = ['Quarter', 'Platforma', 'Key', 'Summary', 'Detail'] + cube_dimensions
+
+    def __init__(self, categorized_issues):
+        details = categorized_issues[self.columns]
+        self.empty = details.iloc[0:0]
+        self.groups = {
+            group: self.sorted_group(rows) for group, rows in details.groupby(['Quarter', 'Platforma'], sort=False)
+        }
+
+    @staticmethod
+    def sorted_group(rows):
+        return rows.drop_duplicates('Detail').sort_values('Detail', kind='stable').reset_index(drop=True)
+
+    def group(self, quarter, platform):
+        """
+        Wiersze szczegółów dla (kwartał, platforma); pusta tabela, gdy grupa nie ma zadań.
+        """
+        return self.groups.get((quarter, platform), self.empty)
+
+    def updated(self, added_issues, removed_issues):
+        """
+        Indeks po zmianie zadań: removed_issues to wszystkie dotychczasowe wiersze zmienionych
+        zadań, a added_issues - ich nowe wiersze. Przebudowywane są tylko grupy z tymi wierszami,
+        pozostałe są współdzielone z bieżącym indeksem.
+        """
+        index = copy.copy(self)
+        index.groups = dict(self.groups)
+        added_groups = dict(list(added_issues[self.columns].groupby(['Quarter', 'Platforma'], sort=False)))
+        # Dotychczasowe wiersze zmienionych zadań w grupie to dokładnie ich wiersze w removed_issues
+        removed_keys = {
+            group: keys.unique() for group, keys in removed_issues.groupby(['Quarter', 'Platforma'], sort=False)['Key']
+        }
+        for group in added_groups.keys() | removed_keys.keys():
+            rows = self.groups.get(group, self.empty)
+            if group in removed_keys:
+                rows = rows[~rows['Key'].isin(removed_keys[group]).to_numpy()]
+            if group in added_groups:
+                rows = pd.concat([rows, added_groups[group]]) if len(rows) else added_groups[group]
+            if len(rows):
+                index.groups[group] = self.sorted_group(rows)
+            else:
+                index.groups.pop(group, None)
+        return index
+
+
+def count_cube_cells(categorized_issues, dimensions=None):
+    """
+    Komórki kostki OLAP dla tabeli skategoryzowanych zadań: słownik (kwartał, platforma,
+    wartości wymiarów z None dla agregatów zbiorczych) -> liczba unikalnych zadań (po Detail)
+    oraz sumy komórek dla każdego kwartału, platformy i wartości wymiaru ((kolumna, wartość) -> suma).
+    Dla tabel bez wspólnych wartości Detail (np. kolejne porcje eksportu bez powtórzonych
+    kluczy) komórki i sumy można dodawać.
+    """
+    dimensions = list(cube_dimensions if dimensions is None else dimensions)
+
+    # Kody całkowite zamiast tekstów - drop_duplicates i groupby działają na liczbach
+    group_columns = ['Quarter', 'Platforma'] + dimensions
+    codes = {}
+    uniques = {}
+    for column in group_columns + ['Detail']:
+        codes[column], column_uniques = pd.factorize(categorized_issues[column])
+        uniques[column] = np.asarray(column_uniques, dtype=object)
+    codes = pd.DataFrame(codes).drop_duplicates()
+
+    # Jeden przebieg na każdy podzbiór wymiarów (2^liczba wymiarów grup)
+    cells = {}
+    totals = Counter()
+    for mask in range(1 << len(dimensions)):
+        grouped = ['Quarter', 'Platforma'] + [
+            dimension for i, dimension in enumerate(dimensions) if mask >> i & 1
+        ]
+        counts = codes.drop_duplicates(grouped + ['Detail']).groupby(grouped, sort=False).size()
+        index = counts.index.to_frame(index=False)
+        key_columns = [
+            uniques[column][index[column].to_numpy()] if column in grouped else [None] * len(counts)
+            for column in group_columns
+        ]
+        cells.update(zip(zip(*key_columns), counts.tolist()))
+        # Sumy osi z komórek bez wymiarów, sumy wartości wymiaru z komórek z tym jednym wymiarem
+        summed_columns = ['Quarter', 'Platforma'] if mask == 0 else grouped[2:] if len(grouped) == 3 else []
+        for column in summed_columns:
+            column_totals = counts.groupby(level=column, sort=False).sum()
+            totals.update({(column, uniques[column][code]): int(total) for code, total in column_totals.items()})
+    return cells, totals
+
+
+class OlapCube:
+    """
+    Kostka OLAP liczona raz przy wczytaniu danych: liczba unikalnych zakończonych zadań
+    (po Detail, jak na wykresie platform) dla każdej kombinacji kwartału, platformy
+    i wartości wymiarów (domyślnie cube_dimensions). Dla każdego podzbioru wymiarów
+    kostka zawiera też agregaty zbiorcze (roll-up), w których wymiar ma w kluczu wartość None.
+    Kwartał i platforma są osiami wykresów, więc występują w każdej komórce.
+    Odczyt komórki to jedno wyszukanie w słowniku, a zmiana części zadań poprawia tylko
+    komórki, których dotyczy (updated).
+    """
+
+    def __init__(self, categorized_issues, dimensions=None):
+        self.dimensions = list(cube_dimensions if dimensions is None else dimensions)
+        self._set_cells(*count_cube_cells(categorized_issues, self.dimensions))
+
+    @classmethod
+    def from_cells(cls, cells, totals, dimensions=None):
+        """
+        Kostka z gotowych komórek i sum z count_cube_cells (np. zsumowanych po porcjach eksportu).
+        """
+        cube = cls.__new__(cls)
+        cube.dimensions = list(cube_dimensions if dimensions is None else dimensions)
+        cube._set_cells(cells, totals)
+        return cube
+
+    def _set_cells(self, cells, totals):
+        self.cells = cells
+        self.totals = totals
+        # Wartości osi i wymiarów to te, które mają niezerową sumę komórek
+        values = {}
+        for (column, value), count in totals.items():
+            if count:
+                values.setdefault(column, []).append(value)
+        self.dimension_values = {dimension: sorted(values.get(dimension, [])) for dimension in self.dimensions}
+        self.quarters = sorted(values.get('Quarter', []), key=quarter_sort_key)
+        self.quarter_count = len(self.quarters)
+        self.platform_count = len(values.get('Platforma', []))
+
+    def updated(self, added_issues, removed_issues):
+        """
+        Kostka po zmianie zadań: removed_issues to wszystkie dotychczasowe wiersze zmienionych
+        zadań, a added_issues - ich nowe wiersze (klucz zadania występuje w kostce raz, jak
+        w magazynie zadań). Komórki i sumy są poprawiane o różnicę liczników tych wierszy.
+        """
+        added_cells, added_totals = count_cube_cells(added_issues, self.dimensions)
+        removed_cells, removed_totals = count_cube_cells(removed_issues, self.dimensions)
+        cells = dict(self.cells)
+        for key in added_cells.keys() | removed_cells.keys():
+            count = cells.get(key, 0) + added_cells.get(key, 0) - removed_cells.get(key, 0)
+            if count:
+                cells[key] = count
+            else:
+                cells.pop(key, None)
+        totals = self.totals + added_totals
+        totals.subtract(removed_totals)
+        return OlapCube.from_cells(cells, +totals, self.dimensions)
+
+    def count(self, quarter, platform, filters=None):
+        """
+        Liczba unikalnych zadań w komórce. filters to słownik wymiar -> wartość;
+        wymiar pominięty (lub None) oznacza wszystkie wartości.
+        """
+        filters = filters or {}
+        return self.cells.get((quarter, platform) + tuple(filters.get(d) for d in self.dimensions), 0)
+
+    def memory_report(self):
+        """
+        Rozmiar kostki przy licznościach wymiarów z danych: liczba niepustych komórek,
+        liczba komórek gęstej kostki z agregatami oraz szacunek pamięci słownika komórek
+        (słownik, klucze-krotki i liczniki; teksty wartości są współdzielone z danymi).
+        """
+        estimated_bytes = sys.getsizeof(self.cells) + sum(
+            sys.getsizeof(key) + (sys.getsizeof(count) if count > 256 else 0)
+            for key, count in self.cells.items()
+        )
+        dense_cells = self.quarter_count * self.platform_count
+        for values in self.dimension_values.values():
+            dense_cells *= len(values) + 1
+        return {
+            'dimensions': {d: len(values) for d, values in self.dimension_values.items()},
+            'quarters': self.quarter_count,
+            'platforms': self.platform_count,
+            'cells': len(self.cells),
+            'dense_cells': dense_cells,
+            'estimated_bytes': estimated_bytes,
+            'bytes_per_cell': round(estimated_bytes / len(self.cells), 1) if self.cells else 0
+        }
+
+
+# Percentyle czasu cyklu i okno (w tygodniach) średniej kroczącej przepustowości
+flow_percentiles = [0.5, 0.9, 0.99]
+flow_percentile_columns = [f"p{round(q * 100)}" for q in flow_percentiles]
+VELOCITY_WINDOW_WEEKS = 4
+
+
+def flow_slice_key(grouped, values):
+    """
+    Klucz przekroju (platforma, osoba) dla wartości grupy groupby po kolumnach grouped.
+    """
+    values = dict(zip(grouped, values if isinstance(values, tuple) else (values,)))
+    return values.get('Platforma'), values.get('Assignee')
+
+
+def flow_contributions(categorized_issues):
+    """
+    Wkład zadań w przekroje analizy przepływu: (czasy cyklu, tygodnie zakończenia) - słowniki
+    przekrój (platforma, osoba) -> posortowane czasy cyklu w dniach oraz przekrój -> liczba
+    zadań zakończonych w tygodniu (seria indeksowana poniedziałkami). None w kluczu przekroju
+    oznacza wszystkie wartości; przekroje bez zadań są pomijane.
+    """
+    # Zadanie liczymy raz na (platforma, osoba), nawet gdy nadpisanie dało mu kilka kwartałów
+    flow = categorized_issues[['Key', 'Platforma', 'Assignee', 'Start_Date', 'Completion_Date']].drop_duplicates(
+        ['Key', 'Platforma', 'Assignee']
+    )
+    cycle_days = (flow['Completion_Date'] - flow['Start_Date']).dt.total_seconds() / 86400
+    flow = flow.assign(
+        Cycle_Days=cycle_days.where(cycle_days >= 0),
+        Week=flow['Completion_Date'].dt.to_period('W').dt.start_time
+    )
+
+    # Przekroje: (platforma, osoba), (platforma), (osoba), całość
+    slice_cycle_days = {}
+    slice_weeks = {}
+    timed = flow[flow['Cycle_Days'].notna()]
+    completed = flow[flow['Week'].notna()]
+    for grouped in [['Platforma', 'Assignee'], ['Platforma'], ['Assignee'], []]:
+        slice_timed = timed.drop_duplicates(['Key'] + grouped)
+        slice_completed = completed.drop_duplicates(['Key'] + grouped)
+        for key, days in sorted_slice_values(slice_timed, grouped, 'Cycle_Days'):
+            slice_cycle_days[key] = days
+        for key, weeks in sorted_slice_values(slice_completed, grouped, 'Week'):
+            unique_weeks, counts = np.unique(weeks, return_counts=True)
+            slice_weeks[key] = pd.Series(counts, index=pd.DatetimeIndex(unique_weeks, name='Week'), name='count')
+    return slice_cycle_days, slice_weeks
+
+
+def sorted_slice_values(flow, grouped, column):
+    """
+    Pary (klucz przekroju, posortowane wartości kolumny) dla przekrojów po kolumnach grouped.
+    Jedno sortowanie numpy całej tabeli zamiast iteracji po grupach - w delcie przekrojów bywają setki.
+    """
+    if not len(flow):
+        return []
+    codes = flow.groupby(grouped, sort=False).ngroup().to_numpy() if grouped else np.zeros(len(flow), dtype=np.int64)
+    values = flow[column].to_numpy()
+    order = np.lexsort((values, codes))
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(codes[order])) + 1])
+    # Przekrój całości: itertuples bez kolumn nie zwraca żadnych krotek
+    group_values = flow[grouped].iloc[order[starts]].itertuples(index=False, name=None) if grouped else [()]
+    return [
+        (flow_slice_key(grouped, slice_values), slice_sorted)
+        for slice_values, slice_sorted in zip(group_values, np.split(values[order], starts[1:]))
+    ]
+
+
+def cycle_time_percentiles(sorted_days):
+    """
+    Słownik {'p50', 'p90', 'p99', 'count'} dla posortowanych czasów cyklu przekroju.
+    """
+    return dict(
+        zip(flow_percentile_columns, np.quantile(sorted_days, flow_percentiles).tolist()), count=len(sorted_days)
+    )
+
+
+def remove_sorted_values(values, removed):
+    """
+    Usuwa z posortowanej tablicy po jednym wystąpieniu każdej wartości z posortowanej tablicy removed.
+    """
+    # Kolejne powtórzenia tej samej wartości w removed usuwają kolejne pozycje w values
+    repeat = np.arange(len(removed)) - np.searchsorted(removed, removed, side='left')
+    return np.delete(values, np.searchsorted(values, removed, side='left') + repeat)
+
+
+def sum_week_counts(signed_counts):
+    """
+    Suma tygodniowych liczb zadań z par (seria indeksowana tygodniami, znak) bez tygodni z zerem.
+    """
+    template = signed_counts[0][0]
+    weeks = np.concatenate([counts.index.to_numpy().astype(template.index.dtype) for counts, _ in signed_counts])
+    values = np.concatenate([counts.to_numpy() * sign for counts, sign in signed_counts])
+    # Jedno przejście numpy zamiast złączania serii - przekrojów w delcie bywają setki
+    unique_weeks, positions = np.unique(weeks, return_inverse=True)
+    totals = np.bincount(positions, weights=values).astype(np.int64)
+    nonzero = totals != 0
+    return pd.Series(totals[nonzero], index=pd.DatetimeIndex(unique_weeks[nonzero], name=template.index.name),
+                     name=template.name)
+
+
+class FlowMetrics:
+    """
+    Czas cyklu i przepustowość liczone raz przy wczytaniu danych dla wszystkich przekrojów
+    (platforma, osoba), w tym zbiorczych - None w kluczu oznacza wszystkie wartości.
+    Czas cyklu to dni od daty rozpoczęcia do daty zakończenia (Start date / Due date
+    z wartościami Inferred jako uzupełnieniem); zadania bez którejś z dat lub z datą
+    zakończenia przed rozpoczęciem nie wchodzą do percentyli.
+    Przepustowość to liczba unikalnych zadań zakończonych w tygodniu (od poniedziałku),
+    a prędkość - jej średnia krocząca z VELOCITY_WINDOW_WEEKS tygodni.
+    Przekroje przechowują posortowane czasy cyklu i tygodniowe liczby zadań, więc zmianę
+    części zadań nanosimy tylko na przekroje, których dotyczy (updated).
+    """
+
+    def __init__(self, categorized_issues):
+        self.cycle_days, self.weekly = flow_contributions(categorized_issues)
+        self.percentiles = {key: cycle_time_percentiles(days) for key, days in self.cycle_days.items()}
+        self._set_weeks()
+
+    def _set_weeks(self):
+        # Tygodnie bez zakończonych zadań to zera - ciągła oś od pierwszego do ostatniego tygodnia
+        weeks = self.weekly.get((None, None))
+        self.weeks = (
+            pd.date_range(weeks.index[0], weeks.index[-1], freq='W-MON') if weeks is not None
+            else pd.DatetimeIndex([])
+        )
+
+    def updated(self, added_issues, removed_issues):
+        """
+        Metryki po zmianie zadań: removed_issues to wszystkie dotychczasowe wiersze zmienionych
+        zadań, a added_issues - ich nowe wiersze. Przeliczane są tylko przekroje z tymi
+        zadaniami, pozostałe są współdzielone z bieżącymi metrykami.
+        """
+        added_cycle_days, added_weeks = flow_contributions(added_issues)
+        removed_cycle_days, removed_weeks = flow_contributions(removed_issues)
+        flow = copy.copy(self)
+        flow.cycle_days = dict(self.cycle_days)
+        flow.percentiles = dict(self.percentiles)
+        flow.weekly = dict(self.weekly)
+
+        for key in added_cycle_days.keys() | removed_cycle_days.keys():
+            days = self.cycle_days.get(key, np.array([]))
+            if key in removed_cycle_days:
+                days = remove_sorted_values(days, removed_cycle_days[key])
+            if key in added_cycle_days:
+                days = np.insert(days, np.searchsorted(days, added_cycle_days[key]), added_cycle_days[key])
+            if len(days):
+                flow.cycle_days[key] = days
+                flow.percentiles[key] = cycle_time_percentiles(days)
+            else:
+                del flow.cycle_days[key]
+                del flow.percentiles[key]
+
+        for key in added_weeks.keys() | removed_weeks.keys():
+            counts = [(weeks, 1) for weeks in (self.weekly.get(key), added_weeks.get(key)) if weeks is not None]
+            if key in removed_weeks:
+                counts.append((removed_weeks[key], -1))
+            counts = sum_week_counts(counts)
+            if len(counts):
+                flow.weekly[key] = counts
+            else:
+                flow.weekly.pop(key, None)
+        flow._set_weeks()
+        return flow
+
+    def slice_percentiles(self, platform=None, assignee=None):
+        """
+        Słownik {'p50', 'p90', 'p99', 'count'} czasu cyklu (w dniach) przekroju albo None,
+        gdy przekrój nie ma zadań z obiema datami.
+        """
+        return self.percentiles.get((platform, assignee))
+
+    def slice_throughput(self, platform=None, assignee=None):
+        """
+        (tygodniowa przepustowość, prędkość krocząca) przekroju jako serie indeksowane tygodniami.
+        """
+        weekly = self.weekly.get((platform, assignee), pd.Series(dtype=int))
+        throughput = weekly.reindex(self.weeks, fill_value=0).astype(int)
+        return throughput, throughput.rolling(VELOCITY_WINDOW_WEEKS, min_periods=1).mean()
+
+
+def aggregate_cube(cube, quarters, selected_quarter=None, selected_platform=None, filters=None):
+    """
+    Odpowiednik aggregate_categorized_issues (bez list szczegółów) odczytany z kostki OLAP.
+    Koszt zależy od liczby kwartałów, platform i typów zadań, a nie od liczby zadań.
+    Rozkład typów sumuje zadania po platformach, jak w widoku kwartału.
+    """
+    filters = filters or {}
+    all_platforms_for_display = get_platform_rules().platforms
+    quarters = get_quarters_in_scope(quarters, selected_quarter)
+    platforms = [
+        p for p in all_platforms_for_display if selected_platform in (None, 'All Platforms') or p == selected_platform
+    ]
+
+    categorized_data = {"Platforma": all_platforms_for_display}
+    issue_type_breakdown = {q: {} for q in quarters}
+    issue_types = [filters['Issue Type']] if filters.get('Issue Type') is not None else cube.dimension_values['Issue Type']
+    for quarter in quarters:
+        # Pojedynczy kwartał w filtrze: pozostałe kwartały roku zostają na osi z zerami
+        if not quarter_in_filter(quarter, selected_quarter):
+            categorized_data[quarter] = [0] * len(all_platforms_for_display)
+            continue
+        categorized_data[quarter] = [
+            cube.count(quarter, p, filters) if p in platforms else 0 for p in all_platforms_for_display
+        ]
+        for issue_type in issue_types:
+            count = sum(cube.count(quarter, p, {**filters, 'Issue Type': issue_type}) for p in platforms)
+            if count:
+                issue_type_breakdown[quarter][issue_type] = count
+
+    return categorized_data, issue_type_breakdown
+
+
+def build_aggregate_payload(cube, quarters, filters=None):
+    """
+    Zwarty zestaw agregatów kostki dla wszystkich wartości filtrów kwartału i platformy
+    (przy ustalonych filtrach wymiarów): liczby zadań na kwartał i platformę oraz liczby
+    zadań każdego typu na kwartał i platformę. Przeglądarka odtwarza z niego wynik
+    aggregate_cube dla dowolnego kwartału/platformy bez zapytania do serwera.
+    """
+    filters = filters or {}
+    all_platforms_for_display = get_platform_rules().platforms
+    issue_types = [filters['Issue Type']] if filters.get('Issue Type') is not None else cube.dimension_values['Issue Type']
+    counts = {}
+    issue_type_counts = {}
+    for quarter in quarters:
+        counts[quarter] = [cube.count(quarter, p, filters) for p in all_platforms_for_display]
+        issue_type_counts[quarter] = {}
+        for issue_type in issue_types:
+            type_counts = [cube.count(quarter, p, {**filters, 'Issue Type': issue_type}) for p in all_platforms_for_display]
+            if any(type_counts):
+                issue_type_counts[quarter][issue_type] = type_counts
+    return {
+        'quarters': list(quarters),
+        'platforms': all_platforms_for_display,
+        'counts': counts,
+        'issue_type_counts': issue_type_counts
+    }
+
+
+def aggregate_categorized_issues(categorized_issues, selected_quarter=None, selected_platform=None):
+    """
+    Buduje struktury categorized_data i issue_type_breakdown dla wybranych kwartałów/platform
+    na podstawie tabeli z build_categorized_issues.
+    """
+    quarters = get_quarters_in_scope(discover_quarters(categorized_issues), selected_quarter)
+    all_platforms_for_display = get_platform_rules().platforms
+
+    # Nowe, wyczyszczone struktury dla danych - po jednym kluczu na kwartał z zakresu filtra
+    categorized_data = {"Platforma": all_platforms_for_display}
+    categorized_data.update({q: [0] * len(all_platforms_for_display) for q in quarters})
+    categorized_data.update({f"Details {q}": {p: [] for p in all_platforms_for_display} for q in quarters})
+
+    issue_type_breakdown = {q: {} for q in quarters}
+
+    with stage_timer('filter', rows=len(categorized_issues)):
+        items = filter_categorized_issues(categorized_issues, selected_quarter, selected_platform)
+
+    with stage_timer('aggregate', rows=len(items)):
+        # Listy szczegółów i liczba unikalnych zadań (dla głównego wykresu)
+        for (quarter, platform), details in items.groupby(['Quarter', 'Platforma'], sort=False)['Detail']:
+            categorized_data[f"Details {quarter}"][platform] = details.tolist()
+            categorized_data[quarter][categorized_data["Platforma"].index(platform)] = int(details.nunique())
+
+        # Zliczanie dla issue_type_breakdown (bez usuwania duplikatów, jak w widoku kwartału)
+        for quarter, issue_types in items.groupby('Quarter', sort=False)['Issue Type']:
+            issue_type_breakdown[quarter] = {
+                t: int(n) for t, n in issue_types.value_counts(sort=False).items()
+            }
+
+    return categorized_data, issue_type_breakdown
+
+
+def categorize_and_filter_changes(df_raw_input, selected_quarter=None, selected_platform=None):
+    """
+    Kategoryzuje i filtruje zakończone zadania dla kwartałów występujących w danych
+    oraz dla wybranych kwartałów/platform.
+    """
+    return aggregate_categorized_issues(
+        build_categorized_issues(df_raw_input), selected_quarter, selected_platform
+    )
+
+def compute_data_fingerprint(file_path, chunk_size=1 << 20):
+    """
+    Zwraca skrót SHA-256 zawartości pliku z danymi - zmienia się przy każdej zmianie eksportu.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+date_columns = ['Start date', 'Inferred start date', 'Due date', 'Inferred due date']
+categorical_columns = ['Status', 'Issue Type', 'Assignee']
+
+
+def prepare_jira_export(df_raw_input):
+    """
+    Zamienia kolumny dat na datetime, a powtarzalne kolumny tekstowe na typ kategoryczny.
+    """
+    df = df_raw_input.copy()
+    for column in date_columns:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors='coerce', format='%Y/%m/%d')
+    for column in categorical_columns:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def get_snapshot_path(file_path):
+    """
+    Ścieżka kolumnowego snapshotu (Parquet) dla danego eksportu CSV.
+    """
+    return os.path.splitext(file_path)[0] + '.parquet'
+
+
+def write_snapshot(df_prepared, snapshot_path, fingerprint=None):
+    """
+    Zapisuje przygotowane dane do Parquet razem z odciskiem pliku CSV, z którego powstały.
+    Zwraca False, gdy zapis nie jest możliwy.
+    """
+    if not PARQUET_AVAILABLE:
+        return False
+    df_prepared.attrs['source_fingerprint'] = fingerprint
+    try:
+        df_prepared.to_parquet(snapshot_path, index=False)
+    except OSError as e:
+        print(f"Nie udało się zapisać snapshotu '{snapshot_path}': {e}")
+        return False
+    finally:
+        df_prepared.attrs.pop('source_fingerprint', None)
+    return True
+
+
+def read_snapshot_fingerprint(snapshot_path):
+    """
+    Odcisk pliku CSV zapisany w metadanych snapshotu (atrybuty pandas) - odczytuje tylko
+    schemat pliku, bez danych. Zwraca None dla snapshotu bez odcisku lub nieczytelnego.
+    """
+    try:
+        metadata = pyarrow.parquet.read_schema(snapshot_path).metadata or {}
+        attrs = json.loads(metadata.get(b'PANDAS_ATTRS', b'{}'))
+    except (OSError, ValueError) as e:
+        print(f"Nie udało się odczytać metadanych snapshotu '{snapshot_path}': {e}")
+        return None
+    return attrs.get('source_fingerprint')
+
+
+def load_jira_export(file_path, fingerprint=None):
+    """
+    Wczytuje eksport Jira z typowanymi kolumnami. Korzysta ze snapshotu Parquet, jeśli powstał
+    z pliku CSV o tym samym odcisku zawartości; w przeciwnym razie parsuje CSV i odświeża
+    snapshot. Daty modyfikacji nie wystarczą - kopiowanie, rsync czy checkout mogą zapisać
+    nowszy eksport z datą starszą niż snapshot.
+    """
+    fingerprint = fingerprint or compute_data_fingerprint(file_path)
+    snapshot_path = get_snapshot_path(file_path)
+    # Nieaktualnego snapshotu nie wczytujemy - wystarczy odcisk z metadanych
+    if (PARQUET_AVAILABLE and os.path.exists(snapshot_path)
+            and read_snapshot_fingerprint(snapshot_path) == fingerprint):
+        with stage_timer('load_snapshot'):
+            df = pd.read_parquet(snapshot_path)
+        df.attrs.pop('source_fingerprint', None)
+        return df
+
+    with stage_timer('parse_csv'):
+        df = pd.read_csv(file_path, sep=',', quotechar='"')
+    with stage_timer('prepare_export', rows=len(df)):
+        df = prepare_jira_export(df)
+    with stage_timer('write_snapshot', rows=len(df)):
+        write_snapshot(df, snapshot_path, fingerprint)
+    return df
+
+
+def format_issue_details(rows):
+    """
+    Posortowane opisy zadań '[klucz] tytuł (typ) - status' dla wierszy eksportu.
+    """
+    return sorted(
+        "[" + rows['Key'].astype(str) + "] " + rows['Summary'].astype(object).fillna('').astype(str) +
+        " (" + rows['Issue Type'].astype(object).fillna('').astype(str) + ") - " +
+        rows['Status'].astype(object).fillna('').astype(str)
+    )
+
+
+class JiraDataModel:
+    """
+    Niezmienny komplet danych jednego eksportu: surowe dane, tabela skategoryzowanych zadań
+    i odcisk zawartości pliku. Przeładowanie tworzy nowy obiekt zamiast modyfikować istniejący,
+    a porównanie i hash opierają się na odcisku (klucz cache wyników).
+    """
+
+    def __init__(self, source_path, fingerprint, df_raw, categorized_issues, hierarchy, cube=None):
+        self.source_path = source_path
+        self.fingerprint = fingerprint
+        self.df_raw = df_raw
+        self.categorized_issues = categorized_issues
+        self.categorized_rows = len(categorized_issues)
+        self.hierarchy = hierarchy
+        with stage_timer('build_details_index', rows=len(categorized_issues)):
+            self.details_index = DetailsIndex(categorized_issues)
+        if cube is None:
+            with stage_timer('build_olap_cube', rows=len(categorized_issues)):
+                cube = OlapCube(categorized_issues)
+        self.cube = cube
+        with stage_timer('build_flow_metrics', rows=len(categorized_issues)):
+            self.flow = FlowMetrics(categorized_issues)
+        self._set_quarters()
+
+    def _set_quarters(self):
+        self.quarters = self.cube.quarters
+        # Karty KPI pokazują dwa ostatnie kwartały z danych
+        self.kpi_quarters = ([None, None] + self.quarters)[-2:]
+
+    def with_changes(self, fingerprint, df_raw, categorized_issues, hierarchy, added_issues, removed_issues):
+        """
+        Nowy model po zmianie części zadań: df_raw, categorized_issues i hierarchy to dane nowego
+        modelu (None, gdy model ich nie przechowuje), removed_issues - wszystkie dotychczasowe
+        wiersze skategoryzowanych zmienionych zadań, a added_issues - ich nowe wiersze. Kostka,
+        metryki przepływu i indeks szczegółów są poprawiane tylko o te wiersze, a niezmienione
+        części współdzielone z bieżącym modelem.
+        """
+        model = copy.copy(self)
+        model.fingerprint = fingerprint
+        model.df_raw = df_raw
+        model.categorized_issues = categorized_issues
+        model.hierarchy = hierarchy
+        model.categorized_rows = self.categorized_rows + len(added_issues) - len(removed_issues)
+        with stage_timer('update_details_index', rows=len(added_issues) + len(removed_issues)):
+            model.details_index = self.details_index.updated(added_issues, removed_issues)
+        with stage_timer('update_olap_cube', rows=len(added_issues) + len(removed_issues)):
+            model.cube = self.cube.updated(added_issues, removed_issues)
+        with stage_timer('update_flow_metrics', rows=len(added_issues) + len(removed_issues)):
+            model.flow = self.flow.updated(added_issues, removed_issues)
+        model._set_quarters()
+        return model
+
+    def descendant_details(self, epic_key):
+        """
+        Posortowane opisy wszystkich potomków zadania (na każdym poziomie). Tryb strumieniowy
+        nie przechowuje pełnych wierszy eksportu - wtedy opisy to same klucze.
+        """
+        if self.hierarchy is None:
+            raise ValueError('Model nie przechowuje hierarchii zadań - potomków trzeba odczytać ze źródła danych.')
+        descendants = self.hierarchy.descendants(self.hierarchy.positions([epic_key]))
+        if self.df_raw is None:
+            return sorted(f"[{key}]" for key in self.hierarchy.keys[descendants])
+        return format_issue_details(self.df_raw.iloc[self.hierarchy.row_positions[descendants]])
+
+    def __eq__(self, other):
+        return isinstance(other, JiraDataModel) and self.fingerprint == other.fingerprint
+
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+
+def load_data_model(file_path, previous_model=None):
+    """
+    Wczytuje eksport i buduje JiraDataModel. Jeśli podano poprzedni model, zwraca go bez zmian
+    dla identycznej zawartości, a w przeciwnym razie kategoryzuje ponownie tylko zmienione zadania.
+    """
+    fingerprint = compute_data_fingerprint(file_path)
+    if previous_model is not None and previous_model.fingerprint == fingerprint:
+        return previous_model
+
+    if os.environ.get('JIRA_STREAMING_INGEST') == '1':
+        # Tryb strumieniowy dla bardzo dużych eksportów - pełny eksport nie trafia do pamięci,
+        # a zmieniony plik jest ponownie czytany w całości (i tak trzeba go przeczytać)
+        categorized_issues, hierarchy, cube = stream_categorized_issues(file_path)
+        return JiraDataModel(file_path, fingerprint, None, categorized_issues, hierarchy, cube)
+
+    # Snapshot Parquet (daty już sparsowane, kategorie) albo CSV, gdy snapshot jest nieaktualny
+    df_raw = load_jira_export(file_path, fingerprint)
+    return build_data_model(file_path, fingerprint, df_raw, previous_model)
+
+
+def build_data_model(source_path, fingerprint, df_raw, previous_model=None):
+    """
+    Buduje JiraDataModel dla przygotowanego eksportu. Z poprzednim modelem tego samego źródła
+    (z surowymi danymi) kategoryzuje ponownie tylko zmienione zadania i ich potomków, rangi słów
+    kluczowych pozostałych zadań bierze z poprzedniej hierarchii, a kostkę, metryki przepływu
+    i indeks szczegółów poprawia o wiersze dotkniętych zadań. Przy zmianie większej niż
+    INCREMENTAL_RELOAD_MAX_SHARE zadań model jest budowany od nowa.
+    """
+    changed_keys = None
+    if previous_model is not None and previous_model.df_raw is not None:
+        with stage_timer('find_changed_keys', rows=len(df_raw)):
+            changed_keys = find_changed_keys(previous_model.df_raw, df_raw)
+        if changed_keys is not None and len(changed_keys) > INCREMENTAL_RELOAD_MAX_SHARE * len(df_raw):
+            changed_keys = None
+
+    if changed_keys is not None:
+        with stage_timer('build_hierarchy', rows=len(df_raw)):
+            hierarchy = build_issue_hierarchy(df_raw, previous_model.hierarchy, changed_keys)
+        with stage_timer('categorize', rows=len(changed_keys)):
+            update = update_categorized_issues(
+                previous_model.categorized_issues, previous_model.hierarchy, df_raw, hierarchy, changed_keys
+            )
+        if update is not None:
+            categorized_issues, added_issues, removed_issues = update
+            return previous_model.with_changes(
+                fingerprint, df_raw, categorized_issues, hierarchy, added_issues, removed_issues
+            )
+    else:
+        with stage_timer('build_hierarchy', rows=len(df_raw)):
+            hierarchy = build_issue_hierarchy(df_raw)
+    categorized_issues = build_categorized_issues(df_raw, hierarchy)
+    return JiraDataModel(source_path, fingerprint, df_raw, categorized_issues, hierarchy)
+
+
+def find_latest_export(data_dir):
+    """
+    Najnowszy (wg daty modyfikacji) plik CSV w katalogu z eksportami albo None.
+    """
+    exports = [os.path.join(data_dir, name) for name in os.listdir(data_dir) if name.lower().endswith('.csv')]
+    return max(exports, key=os.path.getmtime, default=None)
+
+
+# --- Federacja wielu eksportów (np. kilku projektów albo kolejnych snapshotów) ---
+def find_exports(data_dir):
+    """
+    Wszystkie pliki CSV z katalogu jako lista (nazwa źródła, ścieżka), posortowana po nazwie.
+    """
+    return [
+        (os.path.splitext(name)[0], os.path.join(data_dir, name))
+        for name in sorted(os.listdir(data_dir)) if name.lower().endswith('.csv')
+    ]
+
+
+def load_export_manifest(manifest_path):
+    """
+    Wczytuje manifest eksportów (JSON): listę ścieżek albo obiektów {"name": ..., "path": ...},
+    także pod kluczem "exports". Ścieżki względne są liczone od katalogu manifestu.
+    Źródła są zwracane w kolejności manifestu (od najstarszego do najnowszego), chyba że
+    pozycje mają pole "exported_at" (data eksportu, ISO 8601) - wtedy sortujemy po nim.
+    """
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, dict):
+        manifest = manifest['exports']
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    sources = []
+    exported_at = []
+    for entry in manifest:
+        if isinstance(entry, str):
+            entry = {'path': entry}
+        path = os.path.join(manifest_dir, entry['path'])
+        sources.append((entry.get('name') or os.path.splitext(os.path.basename(path))[0], path))
+        exported_at.append(entry.get('exported_at'))
+    names = [name for name, _ in sources]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Powtórzone nazwy źródeł w manifeście '{manifest_path}'.")
+    if any(exported_at):
+        if not all(exported_at):
+            raise ValueError(f"Pole 'exported_at' musi mieć każda pozycja manifestu '{manifest_path}' albo żadna.")
+        timestamps = [pd.Timestamp(value) for value in exported_at]
+        sources = [source for _, source in sorted(zip(timestamps, sources), key=lambda item: item[0])]
+    return sources
+
+
+def get_export_sources(location):
+    """
+    Źródła federacji od najstarszego do najnowszego (przy powtórzonym Key wygrywa ostatnie):
+    pozycje manifestu JSON w kolejności z load_export_manifest albo pliki CSV z katalogu
+    posortowane po dacie modyfikacji (kopiowanie plików ją zmienia - stąd pierwszeństwo manifestu).
+    """
+    if os.path.isdir(location):
+        return sorted(find_exports(location), key=lambda source: os.path.getmtime(source[1]))
+    return load_export_manifest(location)
+
+
+def combine_source_exports(source_frames):
+    """
+    Łączy przygotowane eksporty podane od najstarszego do najnowszego. Zadanie obecne
+    w kilku źródłach pochodzi z najnowszego z nich (deduplikacja po Key).
+    """
+    with stage_timer('combine_sources', rows=sum(len(df) for df in source_frames)):
+        df = pd.concat(source_frames, ignore_index=True)
+        df = df[~df['Key'].astype(str).duplicated(keep='last').to_numpy()].reset_index(drop=True)
+        # Różne zbiory kategorii w źródłach dają po złączeniu kolumny object
+        for column in categorical_columns:
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+    return df
+
+
+class FederatedDataModel:
+    """
+    Modele poszczególnych źródeł (od najstarszego do najnowszego eksportu) i model połączony
+    z zadaniami zdeduplikowanymi po Key. Każde źródło ma własny odcisk i snapshot Parquet,
+    więc zmiana jednego pliku nie wymusza ponownego wczytania pozostałych.
+    """
+
+    def __init__(self, location, source_models, combined):
+        self.location = location
+        self.source_models = source_models
+        self.combined = combined
+
+
+def combine_source_fingerprints(source_fingerprints):
+    """
+    Odcisk modelu połączonego ze słownika (nazwa źródła -> odcisk) w kolejności pierwszeństwa.
+    """
+    digest = hashlib.sha256()
+    for name, source_fingerprint in source_fingerprints.items():
+        digest.update(f'{name}\0{source_fingerprint}\0'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_federated_model(location, previous_model=None, max_workers=None):
+    """
+    Wczytuje równolegle (pula wątków - parsowanie CSV/Parquet i liczenie skrótów zwalniają
+    GIL) wszystkie źródła z katalogu lub manifestu i buduje FederatedDataModel. Źródła
+    o niezmienionej zawartości są brane z poprzedniego modelu, a model połączony jest
+    kategoryzowany przyrostowo względem poprzedniego. W trybie strumieniowym
+    (JIRA_STREAMING_INGEST=1) działa load_streamed_federated_model.
+    """
+    sources = get_export_sources(location)
+    if not sources:
+        raise FileNotFoundError(f"Brak eksportów CSV w '{location}'.")
+    if os.environ.get('JIRA_STREAMING_INGEST') == '1':
+        return load_streamed_federated_model(location, sources, previous_model, max_workers)
+    previous_sources = previous_model.source_models if previous_model is not None else {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            name: executor.submit(load_data_model, path, previous_sources.get(name))
+            for name, path in sources
+        }
+        loaded = {name: future.result() for name, future in futures.items()}
+
+    # Kolejność od najstarszego eksportu (get_export_sources) - przy powtórzonym Key wygrywa najnowszy
+    source_models = {name: loaded[name] for name, _ in sources}
+    fingerprint = combine_source_fingerprints({name: model.fingerprint for name, model in source_models.items()})
+    previous_combined = previous_model.combined if previous_model is not None else None
+    if previous_combined is not None and previous_combined.fingerprint == fingerprint:
+        return previous_model
+
+    df_raw = combine_source_exports([model.df_raw for model in source_models.values()])
+    combined = build_data_model(location, fingerprint, df_raw, previous_combined)
+    return FederatedDataModel(location, source_models, combined)
+
+
+def load_streamed_federated_model(location, sources, previous_model=None, max_workers=None, chunksize=100_000):
+    """
+    FederatedDataModel w trybie strumieniowym. Każdy plik jest czytany najwyżej dwa razy:
+    indeks hierarchii powstaje tylko dla zmienionych plików (niezmienione źródła biorą go
+    z poprzedniego modelu), a w drugim przebiegu każda porcja jest kategoryzowana od razu
+    dla modelu źródła (gdy się zmieniło) i dla modelu połączonego, do którego trafia tylko
+    ostatnie wystąpienie klucza we wszystkich źródłach, jak w combine_source_exports.
+    """
+    names = [name for name, _ in sources]
+    previous_sources = previous_model.source_models if previous_model is not None else {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        fingerprints = dict(zip(names, executor.map(compute_data_fingerprint, [path for _, path in sources])))
+        fingerprint = combine_source_fingerprints(fingerprints)
+        if previous_model is not None and previous_model.combined.fingerprint == fingerprint:
+            return previous_model
+
+        # Źródła bez zmian, wczytane wcześniej strumieniowo, zostają z poprzedniego modelu
+        source_models = {
+            name: previous_sources[name] for name in names
+            if name in previous_sources and previous_sources[name].fingerprint == fingerprints[name]
+            and previous_sources[name].df_raw is None
+        }
+        changed = [(name, path) for name, path in sources if name not in source_models]
+        scans = dict(zip(
+            [name for name, _ in changed],
+            executor.map(lambda path: scan_issue_hierarchy(path, chunksize), [path for _, path in changed])
+        ))
+        source_hierarchies = [
+            source_models[name].hierarchy if name in source_models else scans[name][0] for name in names
+        ]
+        combined_hierarchy, winning_source = combine_hierarchies(source_hierarchies)
+
+        def categorize_source(source_index):
+            name, path = sources[source_index]
+            source_hierarchy = source_hierarchies[source_index]
+            source_stream = CategorizedStream(*scans[name]) if name in scans else None
+            combined_stream = CategorizedStream(combined_hierarchy)
+            row_offset = 0
+            for chunk in pd.read_csv(path, usecols=['Status'] + done_issue_columns, chunksize=chunksize,
+                                     **stream_read_options):
+                is_done = (chunk['Status'] == 'Done').to_numpy()
+                if source_stream is not None:
+                    source_stream.add(chunk.loc[is_done, done_issue_columns])
+                # Do modelu połączonego - wiersz z ostatnim wystąpieniem klucza w najnowszym źródle z tym kluczem
+                keys = chunk['Key'].astype(str)
+                combined_positions = combined_hierarchy.positions(keys)
+                row_positions = source_hierarchy.row_positions[np.maximum(source_hierarchy.positions(keys), 0)]
+                is_winner = (
+                    (combined_positions >= 0) & (winning_source[np.maximum(combined_positions, 0)] == source_index) &
+                    (row_positions == row_offset + np.arange(len(chunk)))
+                )
+                row_offset += len(chunk)
+                combined_stream.add(chunk.loc[is_done & is_winner, done_issue_columns])
+            return source_stream, combined_stream
+
+        streams = list(executor.map(categorize_source, range(len(sources))))
+
+    for (name, path), (source_stream, _) in zip(sources, streams):
+        if source_stream is not None:
+            categorized_issues, cube = source_stream.result()
+            source_models[name] = JiraDataModel(
+                path, fingerprints[name], None, categorized_issues, source_stream.hierarchy, cube
+            )
+    categorized_issues, cube = CategorizedStream.merged([combined for _, combined in streams]).result()
+    combined = JiraDataModel(location, fingerprint, None, categorized_issues, combined_hierarchy, cube)
+    return FederatedDataModel(location, {name: source_models[name] for name in names}, combined)
@@ -0,0 +1,252 @@
+"""
+Opcjonalna instrumentacja przetwarzania i callbacków: czasy etapów (histogramy), liczby
+przetworzonych wierszy i dodatkowe metryki (np. liczniki cache) w formacie tekstowym
+Prometheusa oraz profilowanie na żądanie najwolniejszych wywołań.
+
+Włączana zmienną środowiskową JIRA_INSTRUMENTATION=1 - bez niej stage_timer zwraca
+pusty kontekst, a instrumented_callback zwraca funkcję bez zmian.
+"""
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+
+try:
+    import pyinstrument  # noqa: F401 - profiler próbkujący (opcjonalny, domyślnie cProfile)
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+instrumentation_enabled = os.environ.get('JIRA_INSTRUMENTATION') == '1'
+
+# Granice kubełków histogramu czasów etapów (sekundy)
+duration_buckets = [0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+
+class StageMetrics:
+    """
+    Rejestr metryk etapów, bezpieczny dla wielu wątków serwera. Kolektory to funkcje
+    zwracające dodatkowe linie metryk, wywoływane dopiero przy odczycie /metrics.
+    """
+
+    def __init__(self, buckets=duration_buckets):
+        self.buckets = list(buckets)
+        self.lock = threading.Lock()
+        self.bucket_counts = {}
+        self.duration_sums = {}
+        self.duration_counts = {}
+        self.rows_totals = {}
+        self.collectors = []
+
+    def record(self, stage, seconds, rows=None):
+        with self.lock:
+            if stage not in self.bucket_counts:
+                self.bucket_counts[stage] = [0] * len(self.buckets)
+                self.duration_sums[stage] = 0.0
+                self.duration_counts[stage] = 0
+            counts = self.bucket_counts[stage]
+            for i, upper_bound in enumerate(self.buckets):
+                if seconds <= upper_bound:
+                    counts[i] += 1
+            self.duration_sums[stage] += seconds
+            self.duration_counts[stage] += 1
+            if rows is not None:
+                self.rows_totals[stage] = self.rows_totals.get(stage, 0) + int(rows)
+
+    def add_collector(self, collector):
+        """
+        Rejestruje funkcję zwracającą listę krotek (nazwa, typ, opis, [(etykiety, wartość), ...]).
+        """
+        self.collectors.append(collector)
+
+    def render_prometheus(self):
+        """
+        Zwraca wszystkie metryki w formacie tekstowym Prometheusa (wersja 0.0.4).
+        """
+        with self.lock:
+            bucket_counts = {stage: list(counts) for stage, counts in self.bucket_counts.items()}
+            duration_sums = dict(self.duration_sums)
+            duration_counts = dict(self.duration_counts)
+            rows_totals = dict(self.rows_totals)
+
+        lines = [
+            '# HELP jira_stage_duration_seconds Czas wykonania etapu przetwarzania lub callbacku.',
+            '# TYPE jira_stage_duration_seconds histogram'
+        ]
+        for stage in sorted(bucket_counts):
+            label = format_label_value(stage)
+            for upper_bound, count in zip(self.buckets, bucket_counts[stage]):
+                lines.append(f'jira_stage_duration_seconds_bucket{{stage="{label}",le="{upper_bound}"}} {count}')
+            lines.append(f'jira_stage_duration_seconds_bucket{{stage="{label}",le="+Inf"}} {duration_counts[stage]}')
+            lines.append(f'jira_stage_duration_seconds_sum{{stage="{label}"}} {duration_sums[stage]:.6f}')
+            lines.append(f'jira_stage_duration_seconds_count{{stage="{label}"}} {duration_counts[stage]}')
+
+        lines += [
+            '# HELP jira_stage_rows_total Liczba wierszy przetworzonych przez etap.',
+            '# TYPE jira_stage_rows_total counter'
+        ]
+        lines += [f'jira_stage_rows_total{{stage="{format_label_value(stage)}"}} {rows}'
+                  for stage, rows in sorted(rows_totals.items())]
+
+        for collector in self.collectors:
+            for name, metric_type, description, samples in collector():
+                lines += [f'# HELP {name} {description}', f'# TYPE {name} {metric_type}']
+                for labels, value in samples:
+                    label_text = ','.join(f'{key}="{format_label_value(v)}"' for key, v in labels.items())
+                    lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def format_label_value(value):
+    """
+    Wartość etykiety Prometheusa z ucieczką znaków \\, " i nowej linii.
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class StageTimer:
+    """
+    Kontekst mierzący czas etapu i zapisujący go w stage_metrics (z liczbą wierszy wejścia).
+    """
+    __slots__ = ('stage', 'rows', 'start')
+
+    def __init__(self, stage, rows=None):
+        self.stage = stage
+        self.rows = rows
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        stage_metrics.record(self.stage, time.perf_counter() - self.start, self.rows)
+        return False
+
+
+class NullStageTimer:
+    """
+    Pusty kontekst używany, gdy instrumentacja jest wyłączona.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+null_stage_timer = NullStageTimer()
+
+
+def stage_timer(stage, rows=None):
+    """
+    Kontekst mierzący etap - przy wyłączonej instrumentacji nie robi nic.
+    """
+    if not instrumentation_enabled:
+        return null_stage_timer
+    return StageTimer(stage, rows)
+
+
+class ProfileSampler:
+    """
+    Profilowanie na żądanie: po arm(n) kolejne n wywołań callbacków jest profilowanych,
+    a raport najwolniejszego z nich jest zachowywany do odczytu.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.remaining = 0
+        self.slowest = None
+
+    def arm(self, requests):
+        with self.lock:
+            self.remaining = max(0, int(requests))
+            self.slowest = None
+
+    def take(self):
+        """
+        Zwraca True, jeśli bieżące wywołanie ma być profilowane (zmniejsza licznik).
+        """
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def run(self, name, function, *args, **kwargs):
+        """
+        Wykonuje function pod profilerem i zapamiętuje raport, jeśli to najwolniejsze wywołanie.
+        """
+        if PYINSTRUMENT_AVAILABLE:
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                profiler.stop()
+                self.keep_if_slowest(name, seconds, lambda: profiler.output_text(unicode=True))
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            return profiler.runcall(function, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+
+            def report():
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(40)
+                return stream.getvalue()
+            self.keep_if_slowest(name, seconds, report)
+
+    def keep_if_slowest(self, name, seconds, build_report):
+        with self.lock:
+            if self.slowest is not None and self.slowest['seconds'] >= seconds:
+                return
+        # Raport budujemy poza blokadą - formatowanie profilu może chwilę potrwać
+        snapshot = {
+            'callback': name,
+            'seconds': round(seconds, 6),
+            'profiler': 'pyinstrument' if PYINSTRUMENT_AVAILABLE else 'cProfile',
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'report': build_report()
+        }
+        with self.lock:
+            if self.slowest is None or self.slowest['seconds'] < seconds:
+                self.slowest = snapshot
+
+    def status(self):
+        with self.lock:
+            slowest = self.slowest
+            return {
+                'remaining_requests': self.remaining,
+                'slowest': None if slowest is None else {k: v for k, v in slowest.items() if k != 'report'}
+            }
+
+
+stage_metrics = StageMetrics()
+profile_sampler = ProfileSampler()
+
+
+def instrumented_callback(name):
+    """
+    Dekorator callbacku: mierzy czas wywołania jako etap name i - gdy profilowanie jest
+    uzbrojone - wykonuje wywołanie pod profilerem. Bez instrumentacji zwraca funkcję bez zmian.
+    """
+    def decorator(function):
+        if not instrumentation_enabled:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with StageTimer(name):
+                if profile_sampler.take():
+                    return profile_sampler.run(name, function, *args, **kwargs)
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
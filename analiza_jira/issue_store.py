@@ -0,0 +1,543 @@
+"""
+Lokalny magazyn zadań (SQLite) zasilany deltami z Jiry - plikami CSV z kolumnami eksportu,
+które zawierają tylko zadania zmienione od poprzedniej delty. Delta trafia do magazynu
+przez upsert po Key, a liczniki zakończonych zadań na (kwartał, platforma, typ zadania)
+są korygowane tylko o zadania dotknięte zmianą: zmienione i ich potomków, którzy dziedziczą
+po nich platformę. Każda delta to nowa rewizja magazynu z dziennikiem skategoryzowanych
+wierszy dotkniętych zadań sprzed i po zmianie, więc model danych aplikacji odświeżany
+z magazynu nanosi na siebie tylko tę różnicę - koszt odświeżenia zależy od wielkości zmian,
+a nie od całej historii.
+
+Zastosowanie delt bez uruchamiania aplikacji:
+    python -m analiza_jira.issue_store magazyn.sqlite delty/ delta_2025-06-20.csv
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+from .core import (
+    JiraDataModel, build_issue_hierarchy, build_categorized_issues, categorize_done_issues, done_issue_columns,
+    categorized_issue_columns, format_issue_details, prepare_jira_export, compute_data_fingerprint,
+    platform_rules_path
+)
+from .instrumentation import stage_timer
+
+# Kolumny eksportu Jira przechowywane w magazynie (w kolejności eksportu)
+store_columns = [
+    'Key', 'Issue Type', 'Parent', 'Summary', 'Status', 'Assignee', 'Sprint', 'Start date', 'Inferred start date',
+    'Due date', 'Inferred due date', 'Issue color'
+]
+# Liczniki kategoryzacji: zakończone zadania na (kwartał, platforma, typ zadania), jak issue_type_breakdown
+count_columns = ['Quarter', 'Platforma', 'Issue Type']
+# Kolumny dat w dzienniku zmian skategoryzowanych zadań (zapisywane jako tekst ISO)
+change_date_columns = ['Start_Date', 'Completion_Date']
+# Ile ostatnich rewizji obejmuje dziennik zmian; starszy model jest budowany od nowa
+CHANGE_LOG_REVISIONS = 1000
+
+
+def quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+issue_columns_sql = ', '.join(quote(column) for column in store_columns)
+change_columns_sql = ', '.join(quote(column) for column in categorized_issue_columns)
+
+schema_sql = f'''
+CREATE TABLE IF NOT EXISTS issues (
+    "Key" TEXT PRIMARY KEY,
+    {', '.join(f'{quote(column)} TEXT' for column in store_columns[1:])},
+    "Completion date" TEXT,
+    "Position" INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_status ON issues ("Status");
+CREATE INDEX IF NOT EXISTS issues_completion_date ON issues ("Completion date");
+CREATE INDEX IF NOT EXISTS issues_parent ON issues ("Parent");
+CREATE INDEX IF NOT EXISTS issues_position ON issues ("Position");
+CREATE TABLE IF NOT EXISTS categorized_changes (
+    revision INTEGER NOT NULL,
+    sign INTEGER NOT NULL,
+    {', '.join(f'{quote(column)} TEXT' for column in categorized_issue_columns)}
+);
+CREATE INDEX IF NOT EXISTS categorized_changes_revision ON categorized_changes (revision);
+CREATE TABLE IF NOT EXISTS category_counts (
+    quarter TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    issue_type TEXT NOT NULL,
+    issue_count INTEGER NOT NULL,
+    PRIMARY KEY (quarter, platform, issue_type)
+);
+CREATE TABLE IF NOT EXISTS applied_deltas (
+    name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    issues INTEGER NOT NULL,
+    applied_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+'''
+
+# Upsert zachowuje pozycję istniejącego zadania; nowe zadania trafiają na koniec (kolejność eksportu)
+upsert_sql = f'''
+INSERT INTO issues ({issue_columns_sql}, "Completion date", "Position")
+VALUES ({', '.join('?' * (len(store_columns) + 1))}, (SELECT COALESCE(MAX("Position"), -1) + 1 FROM issues))
+ON CONFLICT ("Key") DO UPDATE SET
+    {', '.join(f'{quote(column)} = excluded.{quote(column)}' for column in store_columns[1:] + ['Completion date'])}
+'''
+
+
+def prepare_delta_rows(df_delta):
+    """
+    Wiersze delty do upsertu: teksty z brakami jako None i data zakończenia (ISO) do indeksu.
+    Przy powtórzonym kluczu w delcie obowiązuje ostatni wiersz.
+    """
+    missing_columns = [column for column in store_columns if column not in df_delta.columns]
+    if missing_columns:
+        raise ValueError(f"Brak kolumn w delcie: {', '.join(missing_columns)}.")
+    df = df_delta[store_columns].astype(object)
+    df = df[df['Key'].notna().to_numpy()]
+    df = df[~df['Key'].astype(str).duplicated(keep='last').to_numpy()]
+    df = df.where(df.notna(), None)
+    df['Key'] = df['Key'].astype(str)
+    completion_date = pd.to_datetime(df['Due date'], errors='coerce', format='%Y/%m/%d').fillna(
+        pd.to_datetime(df['Inferred due date'], errors='coerce', format='%Y/%m/%d')
+    )
+    df['Completion date'] = completion_date.dt.strftime('%Y-%m-%d').astype(object).where(completion_date.notna(), None)
+    return df
+
+
+def load_keys(connection, table, keys):
+    """
+    Wypełnia tymczasową tabelę kluczy, z którą łączą się zapytania magazynu.
+    """
+    connection.execute(f'CREATE TEMP TABLE IF NOT EXISTS {table} ("Key" TEXT PRIMARY KEY)')
+    connection.execute(f'DELETE FROM {table}')
+    connection.executemany(f'INSERT OR IGNORE INTO {table} VALUES (?)', ((key,) for key in keys))
+
+
+def collect_affected_keys(connection):
+    """
+    Dopisuje do tabeli affected_keys zmienione klucze (changed_keys) i wszystkich potomków
+    zmienionych zadań - ich platforma dziedziczona po przodkach mogła się zmienić.
+    """
+    connection.execute('CREATE TEMP TABLE IF NOT EXISTS affected_keys ("Key" TEXT PRIMARY KEY)')
+    connection.execute('''
+        WITH RECURSIVE affected("Key") AS (
+            SELECT "Key" FROM changed_keys
+            UNION
+            SELECT issues."Key" FROM issues JOIN affected ON issues."Parent" = affected."Key"
+        )
+        INSERT OR IGNORE INTO affected_keys SELECT "Key" FROM affected
+    ''')
+
+
+def categorize_affected_keys(connection):
+    """
+    Kategoryzuje zadania z tabeli affected_keys. Z magazynu czytane są tylko te zadania
+    i ich przodkowie (rekurencyjnie po indeksie na Parent) - tyle wystarcza do rang
+    dziedziczonych, więc wynik jest taki sam jak przy kategoryzacji całego magazynu.
+    """
+    df_related = pd.read_sql_query(f'''
+        WITH RECURSIVE related("Key") AS (
+            SELECT "Key" FROM affected_keys
+            UNION
+            SELECT issues."Parent" FROM issues JOIN related USING ("Key") WHERE issues."Parent" IS NOT NULL
+        )
+        SELECT {', '.join('issues.' + quote(column) for column in store_columns)},
+               issues."Key" IN (SELECT "Key" FROM affected_keys) AS is_affected
+        FROM issues JOIN related USING ("Key")
+        ORDER BY issues."Position"
+    ''', connection)
+    hierarchy = build_issue_hierarchy(df_related)
+    is_done = df_related['is_affected'].astype(bool) & (df_related['Status'] == 'Done')
+    return categorize_done_issues(df_related.loc[is_done, done_issue_columns], hierarchy)
+
+
+def count_categories(categorized_issues):
+    """
+    Liczba wierszy skategoryzowanych zadań na (kwartał, platforma, typ zadania).
+    """
+    return categorized_issues.groupby(count_columns).size()
+
+
+def drop_unchanged_issues(before, after):
+    """
+    Wiersze skategoryzowanych zadań sprzed i po zmianie (before, after) bez zadań, których
+    wiersze są takie same przed i po - np. potomków zmienionego zadania z niezmienioną platformą.
+    Zadanie zmienione zostaje ze wszystkimi swoimi wierszami.
+    """
+    def row_signatures(categorized_issues):
+        hashes = pd.util.hash_pandas_object(categorized_issues[categorized_issue_columns], index=False)
+        return pd.Series(hashes.to_numpy(), index=categorized_issues['Key'].to_numpy()).groupby(level=0).agg(
+            lambda key_hashes: tuple(sorted(key_hashes))
+        )
+
+    before_signatures, after_signatures = row_signatures(before), row_signatures(after)
+    common = before_signatures.index.intersection(after_signatures.index)
+    unchanged = common[(before_signatures[common] == after_signatures[common]).to_numpy()]
+    return before[~before['Key'].isin(unchanged).to_numpy()], after[~after['Key'].isin(unchanged).to_numpy()]
+
+
+def write_categorized_changes(connection, revision, before, after):
+    """
+    Zapisuje w dzienniku zmian rewizji wiersze skategoryzowanych zadań sprzed zmiany (sign -1)
+    i po niej (sign 1).
+    """
+    for sign, categorized_issues in [(-1, before), (1, after)]:
+        rows = categorized_issues[categorized_issue_columns].astype(object)
+        for column in change_date_columns:
+            rows[column] = categorized_issues[column].dt.strftime('%Y-%m-%d').astype(object)
+        rows = rows.where(rows.notna(), None)
+        connection.executemany(
+            f'INSERT INTO categorized_changes VALUES ({", ".join("?" * (len(categorized_issue_columns) + 2))})',
+            ((revision, sign, *row) for row in rows.itertuples(index=False, name=None))
+        )
+
+
+def read_categorized_changes(connection, since_revision, revision):
+    """
+    Różnica skategoryzowanych zadań między rewizjami z dziennika zmian: (wiersze po zmianach,
+    wiersze sprzed zmian) zadań zmienionych w rewizjach (since_revision, revision].
+    Zadanie zmienione kilka razy ma wiersze sprzed pierwszej i po ostatniej zmianie.
+    """
+    changes = pd.read_sql_query(
+        f'SELECT revision, sign, {change_columns_sql} FROM categorized_changes '
+        'WHERE revision > ? AND revision <= ? ORDER BY revision, rowid',
+        connection, params=(since_revision, revision)
+    )
+    for column in change_date_columns:
+        changes[column] = pd.to_datetime(changes[column], format='%Y-%m-%d')
+    first_revision = changes.groupby('Key')['revision'].transform('min')
+    last_revision = changes.groupby('Key')['revision'].transform('max')
+    added = changes[(changes['sign'] > 0) & (changes['revision'] == last_revision)]
+    removed = changes[(changes['sign'] < 0) & (changes['revision'] == first_revision)]
+    return (added[categorized_issue_columns].reset_index(drop=True),
+            removed[categorized_issue_columns].reset_index(drop=True))
+
+
+def read_issues(connection, keys_table=None):
+    """
+    Zadania z magazynu (wszystkie albo z podanej tabeli kluczy) w kolejności eksportu,
+    z typami kolumn jak po prepare_jira_export.
+    """
+    join = f'JOIN {keys_table} USING ("Key")' if keys_table else ''
+    df = pd.read_sql_query(f'SELECT {issue_columns_sql} FROM issues {join} ORDER BY "Position"', connection)
+    return prepare_jira_export(df)
+
+
+class IssueStore:
+    """
+    Magazyn zadań w pliku SQLite (tryb WAL - odczyty nie blokują zapisu delty). Każda operacja
+    otwiera własne połączenie, więc obiekt można współdzielić między wątkami, a zapis delt
+    z kilku procesów (workerów serwera) jest szeregowany przez blokadę zapisu SQLite.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self.transaction(immediate=True) as connection:
+            # executescript zatwierdziłby otwartą transakcję - polecenia schematu wykonujemy pojedynczo
+            for statement in schema_sql.split(';'):
+                connection.execute(statement)
+            meta = dict(connection.execute('SELECT name, value FROM store_meta').fetchall())
+            self.store_id = meta.get('store_id') or uuid.uuid4().hex
+            connection.execute("INSERT OR IGNORE INTO store_meta VALUES ('store_id', ?)", (self.store_id,))
+            connection.execute("INSERT OR IGNORE INTO store_meta VALUES ('revision', '0')")
+            # Najstarsza rewizja modelu, którą można odświeżyć z dziennika zmian (magazyn sprzed
+            # dziennika - od bieżącej rewizji)
+            connection.execute("INSERT OR IGNORE INTO store_meta VALUES ('incremental_base', ?)",
+                               (str(self.read_revision(connection)),))
+            # Liczniki zależą od reguł platform - po ich zmianie przeliczamy je od nowa
+            rules_fingerprint = compute_data_fingerprint(platform_rules_path)
+            if meta.get('rules_fingerprint') != rules_fingerprint:
+                self.rebuild_category_counts(connection)
+                connection.execute("INSERT OR REPLACE INTO store_meta VALUES ('rules_fingerprint', ?)",
+                                   (rules_fingerprint,))
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Połączenie z otwartą transakcją (zatwierdzaną na końcu bloku). immediate=True od razu
+        bierze blokadę zapisu; transakcja tylko do odczytu widzi spójny stan magazynu.
+        """
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+    @staticmethod
+    def read_meta_int(connection, name):
+        return int(connection.execute('SELECT value FROM store_meta WHERE name = ?', (name,)).fetchone()[0])
+
+    @staticmethod
+    def read_revision(connection):
+        return IssueStore.read_meta_int(connection, 'revision')
+
+    def revision(self):
+        """
+        Numer ostatniej zastosowanej delty (0 dla pustego magazynu).
+        """
+        with self.transaction() as connection:
+            return self.read_revision(connection)
+
+    def issue_count(self):
+        with self.transaction() as connection:
+            return connection.execute('SELECT COUNT(*) FROM issues').fetchone()[0]
+
+    def rebuild_category_counts(self, connection):
+        """
+        Przelicza liczniki kategoryzacji z całego magazynu (pusty magazyn, zmiana reguł).
+        """
+        df_raw = read_issues(connection)
+        counts = count_categories(build_categorized_issues(df_raw))
+        connection.execute('DELETE FROM category_counts')
+        connection.executemany('INSERT INTO category_counts VALUES (?, ?, ?, ?)',
+                               [(*group, int(count)) for group, count in counts.items()])
+
+    @staticmethod
+    def read_delta_applied(connection, name, fingerprint):
+        applied = connection.execute('SELECT fingerprint FROM applied_deltas WHERE name = ?', (name,)).fetchone()
+        return applied is not None and applied[0] == fingerprint
+
+    def is_delta_applied(self, name, fingerprint):
+        with self.transaction() as connection:
+            return self.read_delta_applied(connection, name, fingerprint)
+
+    def apply_delta(self, df_delta, name=None, fingerprint=None):
+        """
+        Wstawia deltę (zadania z kolumnami eksportu) przez upsert po Key, koryguje liczniki
+        kategoryzacji o zadania dotknięte zmianą i zapisuje ich skategoryzowane wiersze sprzed
+        i po zmianie w dzienniku zmian (do odświeżania modelu w load_store_model). Delta o nazwie i odcisku już zastosowanym
+        jest pomijana (zwraca None); w przeciwnym razie zwraca listę faktycznie zmienionych kluczy.
+        """
+        df = prepare_delta_rows(df_delta)
+        with self.transaction(immediate=True) as connection:
+            # Sprawdzenie pod blokadą zapisu - tę samą deltę może równolegle stosować inny worker
+            if name is not None and self.read_delta_applied(connection, name, fingerprint):
+                return None
+            revision = self.read_revision(connection) + 1
+            store_was_empty = connection.execute('SELECT NOT EXISTS (SELECT 1 FROM issues)').fetchone()[0]
+
+            # Wiersze identyczne z magazynem pomijamy - nie zmieniają ani modelu, ani liczników
+            load_keys(connection, 'delta_keys', df['Key'])
+            stored = pd.read_sql_query(
+                f'SELECT {issue_columns_sql} FROM issues JOIN delta_keys USING ("Key")', connection
+            ).astype(object)
+            stored = stored.where(stored.notna(), None)
+            stored_rows = set(stored.itertuples(index=False, name=None))
+            rows = [row for row in df.itertuples(index=False, name=None) if row[:len(store_columns)] not in stored_rows]
+            changed_keys = [row[0] for row in rows]
+
+            with stage_timer('store_upsert', rows=len(rows)):
+                load_keys(connection, 'changed_keys', changed_keys)
+                if not store_was_empty:
+                    collect_affected_keys(connection)
+                    before = categorize_affected_keys(connection)
+                connection.executemany(upsert_sql, rows)
+
+            with stage_timer('store_update_counts', rows=len(rows)):
+                if store_was_empty:
+                    self.rebuild_category_counts(connection)
+                    # Pełny import nie trafia do dziennika - wcześniejsze modele budujemy od nowa
+                    connection.execute("UPDATE store_meta SET value = ? WHERE name = 'incremental_base'",
+                                       (str(revision),))
+                else:
+                    # Potomkowie po zmianie to poprzedni potomkowie i nowo podpięte (zmienione) zadania
+                    collect_affected_keys(connection)
+                    after = categorize_affected_keys(connection)
+                    write_categorized_changes(connection, revision, *drop_unchanged_issues(before, after))
+                    difference = count_categories(after).sub(count_categories(before), fill_value=0)
+                    difference = difference[difference != 0]
+                    connection.executemany('''
+                        INSERT INTO category_counts VALUES (?, ?, ?, ?)
+                        ON CONFLICT (quarter, platform, issue_type)
+                        DO UPDATE SET issue_count = issue_count + excluded.issue_count
+                    ''', [(*group, int(count)) for group, count in difference.items()])
+                    connection.execute('DELETE FROM category_counts WHERE issue_count = 0')
+
+            connection.execute("UPDATE store_meta SET value = ? WHERE name = 'revision'", (str(revision),))
+            if revision > CHANGE_LOG_REVISIONS:
+                oldest_revision = revision - CHANGE_LOG_REVISIONS
+                connection.execute('DELETE FROM categorized_changes WHERE revision <= ?', (oldest_revision,))
+                connection.execute(
+                    "UPDATE store_meta SET value = MAX(CAST(value AS INTEGER), ?) WHERE name = 'incremental_base'",
+                    (oldest_revision,)
+                )
+            if name is not None:
+                connection.execute('INSERT OR REPLACE INTO applied_deltas VALUES (?, ?, ?, ?, ?)',
+                                   (name, fingerprint, revision, len(changed_keys),
+                                    time.strftime('%Y-%m-%dT%H:%M:%S')))
+        return changed_keys
+
+    def apply_delta_file(self, file_path):
+        """
+        Stosuje deltę z pliku CSV (nazwa pliku i odcisk zawartości chronią przed ponownym zastosowaniem).
+        """
+        name = os.path.basename(file_path)
+        fingerprint = compute_data_fingerprint(file_path)
+        if self.is_delta_applied(name, fingerprint):
+            return None
+        df_delta = pd.read_csv(file_path, sep=',', quotechar='"', dtype=str)
+        return self.apply_delta(df_delta, name, fingerprint)
+
+    def apply_pending_deltas(self, delta_dir):
+        """
+        Stosuje w kolejności nazw pliki CSV z katalogu delt, których magazyn jeszcze nie zna.
+        Zwraca listę (nazwa pliku, liczba zmienionych zadań) dla zastosowanych delt.
+        """
+        if not os.path.isdir(delta_dir):
+            return []
+        applied = []
+        for name in sorted(os.listdir(delta_dir)):
+            if name.lower().endswith('.csv'):
+                changed_keys = self.apply_delta_file(os.path.join(delta_dir, name))
+                if changed_keys is not None:
+                    applied.append((name, len(changed_keys)))
+        return applied
+
+    def descendant_details(self, epic_key):
+        """
+        Posortowane opisy wszystkich potomków zadania (na każdym poziomie) prosto z magazynu.
+        """
+        with self.transaction() as connection:
+            df_descendants = pd.read_sql_query('''
+                WITH RECURSIVE descendants("Key") AS (
+                    SELECT "Key" FROM issues WHERE "Parent" = ?
+                    UNION
+                    SELECT issues."Key" FROM issues JOIN descendants ON issues."Parent" = descendants."Key"
+                )
+                SELECT "Key", "Summary", "Issue Type", "Status" FROM issues JOIN descendants USING ("Key")
+            ''', connection, params=(epic_key,))
+        return format_issue_details(df_descendants)
+
+    def category_counts(self):
+        """
+        Liczniki kategoryzacji utrzymywane przyrostowo przez apply_delta.
+        """
+        with self.transaction() as connection:
+            return pd.read_sql_query(
+                'SELECT quarter, platform, issue_type, issue_count FROM category_counts '
+                'ORDER BY quarter, platform, issue_type', connection
+            )
+
+    def stats(self):
+        """
+        Stan magazynu: liczba zadań, rewizja, ostatnia delta i liczniki kategoryzacji.
+        """
+        with self.transaction() as connection:
+            last_delta = connection.execute(
+                'SELECT name, revision, issues, applied_at FROM applied_deltas ORDER BY revision DESC LIMIT 1'
+            ).fetchone()
+            stats = {
+                'path': self.path,
+                'issues': connection.execute('SELECT COUNT(*) FROM issues').fetchone()[0],
+                'revision': self.read_revision(connection),
+                'deltas': connection.execute('SELECT COUNT(*) FROM applied_deltas').fetchone()[0],
+                'last_delta': dict(zip(['name', 'revision', 'issues', 'applied_at'], last_delta)) if last_delta else None
+            }
+        stats['category_counts'] = self.category_counts().to_dict('records')
+        return stats
+
+
+class StoreDataModel(JiraDataModel):
+    """
+    JiraDataModel zbudowany z magazynu zadań w danej rewizji; odcisk wyznacza magazyn i rewizja.
+    Model nie przechowuje surowych danych, tabeli skategoryzowanych zadań ani hierarchii -
+    te są w magazynie, a kolejne rewizje nanoszą na model różnicę z dziennika zmian.
+    """
+
+    def __init__(self, store, revision, categorized_issues):
+        super().__init__(store.path, f'{store.store_id}:{revision}', None, categorized_issues, None)
+        self.categorized_issues = None
+        self.store = store
+        self.store_id = store.store_id
+        self.revision = revision
+
+    def descendant_details(self, epic_key):
+        return self.store.descendant_details(epic_key)
+
+
+def load_store_model(store, previous_model=None):
+    """
+    Buduje StoreDataModel z aktualnej rewizji magazynu. Model poprzedniej rewizji tego samego
+    magazynu jest poprawiany o różnicę skategoryzowanych zadań z dziennika zmian (koszt zależy
+    od liczby zmienionych zadań); bez zmian zwraca poprzedni model. Model starszy niż dziennik
+    zmian jest budowany od nowa z całego magazynu.
+    """
+    incremental = isinstance(previous_model, StoreDataModel) and previous_model.store_id == store.store_id
+    with store.transaction() as connection:
+        revision = store.read_revision(connection)
+        if incremental and previous_model.revision == revision:
+            return previous_model
+        incremental = incremental and previous_model.revision >= store.read_meta_int(connection, 'incremental_base')
+        if incremental:
+            with stage_timer('read_store_changes'):
+                added_issues, removed_issues = read_categorized_changes(connection, previous_model.revision, revision)
+        else:
+            with stage_timer('read_store'):
+                df_raw = read_issues(connection)
+
+    if incremental:
+        model = previous_model.with_changes(
+            f'{store.store_id}:{revision}', None, None, None, added_issues, removed_issues
+        )
+        model.revision = revision
+        return model
+
+    with stage_timer('build_hierarchy', rows=len(df_raw)):
+        hierarchy = build_issue_hierarchy(df_raw)
+    return StoreDataModel(store, revision, build_categorized_issues(df_raw, hierarchy))
+
+
+def build_argument_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m analiza_jira.issue_store',
+        description='Stosuje delty zadań Jira (pliki CSV z kolumnami eksportu) w lokalnym magazynie SQLite.'
+    )
+    parser.add_argument('store', help='plik magazynu SQLite (tworzony, jeśli nie istnieje)')
+    parser.add_argument('deltas', nargs='*', help='pliki CSV delt lub katalogi z deltami (w kolejności nazw)')
+    return parser
+
+
+def main(argv=None):
+    """
+    Punkt wejścia CLI. Zwraca kod wyjścia: 0, gdy wszystkie delty zastosowano, 1 w przeciwnym razie.
+    """
+    args = build_argument_parser().parse_args(argv)
+    store = IssueStore(args.store)
+    failed = False
+    for delta_path in args.deltas:
+        try:
+            if os.path.isdir(delta_path):
+                applied = store.apply_pending_deltas(delta_path)
+            else:
+                changed_keys = store.apply_delta_file(delta_path)
+                applied = [] if changed_keys is None else [(os.path.basename(delta_path), len(changed_keys))]
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"Błąd: nie udało się zastosować delty '{delta_path}': {e}")
+            failed = True
+            continue
+        for name, n_changed in applied:
+            print(f"Zastosowano deltę '{name}': {n_changed} zmienionych zadań.")
+    stats = store.stats()
+    print(f"Magazyn '{args.store}': {stats['issues']} zadań, rewizja {stats['revision']}.")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Wsadowe raporty z eksportów Jira bez uruchamiania serwera: agregaty dla wszystkich
+kwartałów, platform i typów zadań liczone równolegle (jeden eksport na proces roboczy)
+i zapisywane jako CSV, JSON oraz statyczny HTML.
+
+Użycie:
+    python -m analiza_jira EKSPORT.csv [KATALOG ...] -o raporty --workers 8
+"""
+import argparse
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import quote
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from .core import aggregate_categorized_issues, load_data_model
+from .charts import build_charts_and_kpis
+
+report_formats = ['csv', 'json', 'html']
+
+
+def collect_export_paths(paths):
+    """
+    Zwraca listę plików eksportu - katalog oznacza wszystkie pliki CSV w nim (alfabetycznie).
+    Plik podany kilka razy występuje na liście raz.
+    """
+    export_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            export_paths.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith('.csv')
+            ))
+        else:
+            export_paths.append(path)
+    return list(dict.fromkeys(export_paths))
+
+
+def build_export_names(export_paths):
+    """
+    Unikalne nazwy eksportów w raportach: ścieżka względem wspólnego katalogu wszystkich
+    eksportów, bez rozszerzenia (np. teamA/export i teamB/export). Pliki różniące się tylko
+    rozszerzeniem (export.csv i export.CSV) dostają kolejne numery (export-2, export-3, ...).
+    """
+    absolute_paths = [os.path.abspath(file_path) for file_path in export_paths]
+    if not absolute_paths:
+        return []
+    common_dir = os.path.commonpath([os.path.dirname(file_path) for file_path in absolute_paths])
+    names = []
+    used = set()
+    for file_path in absolute_paths:
+        base_name = os.path.splitext(os.path.relpath(file_path, common_dir))[0].replace(os.sep, '/')
+        name, number = base_name, 1
+        while name in used:
+            number += 1
+            name = f'{base_name}-{number}'
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def count_unique_issues(categorized_issues, group_columns, quarters):
+    """
+    Liczba unikalnych zadań (po Detail, jak na wykresie platform) w grupach, posortowana
+    chronologicznie po kwartale.
+    """
+    counts = (
+        categorized_issues.groupby(group_columns, sort=True, observed=True)['Detail'].nunique()
+        .rename('Liczba zadań').reset_index()
+    )
+    quarter_order = counts['Quarter'].map({q: i for i, q in enumerate(quarters)})
+    return counts.iloc[quarter_order.argsort(kind='stable')].reset_index(drop=True)
+
+
+def compute_export_report(file_path, export_name=None):
+    """
+    Liczy wszystkie agregaty jednego eksportu. Wynik zawiera tylko proste typy, słowniki figur
+    i DataFrame'y, więc może zostać przesłany z procesu roboczego. export_name (z
+    build_export_names) to nazwa eksportu w raportach; domyślnie nazwa pliku bez rozszerzenia.
+    """
+    data_model = load_data_model(file_path)
+    categorized_issues = data_model.categorized_issues
+
+    # Figury i KPI dokładnie takie, jak w aplikacji dla filtrów 'All' / 'All Platforms'
+    categorized_data, issue_type_breakdown = aggregate_categorized_issues(categorized_issues, 'All', 'All Platforms')
+    fig_2d, fig_issue_type, total_q1, total_q2, total_overall = build_charts_and_kpis(
+        categorized_data, issue_type_breakdown, data_model.kpi_quarters
+    )
+
+    return {
+        'export': export_name or os.path.splitext(os.path.basename(file_path))[0],
+        'source_path': file_path,
+        'fingerprint': data_model.fingerprint,
+        'quarters': data_model.quarters,
+        'kpi': {
+            'quarters': data_model.kpi_quarters,
+            'totals': [total_q1, total_q2],
+            'total_overall': total_overall
+        },
+        'platform_counts': count_unique_issues(
+            categorized_issues, ['Quarter', 'Platforma'], data_model.quarters
+        ),
+        'issue_type_counts': count_unique_issues(
+            categorized_issues, ['Quarter', 'Platforma', 'Issue Type'], data_model.quarters
+        ),
+        'figures': [fig_2d, fig_issue_type]
+    }
+
+
+def compute_reports(export_paths, workers=None):
+    """
+    Liczy raporty dla wszystkich eksportów w puli procesów (jeden eksport na zadanie puli).
+    Zwraca (raporty w kolejności wejściowej, lista ścieżek, których nie udało się przetworzyć).
+    """
+    reports = {}
+    failed = []
+    export_names = dict(zip(export_paths, build_export_names(export_paths)))
+    if workers == 1 or len(export_paths) <= 1:
+        # Pojedynczy eksport liczymy w bieżącym procesie - pula tylko by go spowolniła
+        for file_path in export_paths:
+            try:
+                reports[file_path] = compute_export_report(file_path, export_names[file_path])
+            except Exception as e:
+                print(f"Błąd podczas przetwarzania eksportu '{file_path}': {e}")
+                failed.append(file_path)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(compute_export_report, file_path, export_names[file_path]): file_path
+                for file_path in export_paths
+            }
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    reports[file_path] = future.result()
+                except Exception as e:
+                    print(f"Błąd podczas przetwarzania eksportu '{file_path}': {e}")
+                    failed.append(file_path)
+    return [reports[file_path] for file_path in export_paths if file_path in reports], failed
+
+
+def combine_report_tables(reports, table_name):
+    """
+    Łączy tabelę table_name wszystkich raportów w jedną, z kolumną Eksport na początku.
+    """
+    tables = [report[table_name].assign(Eksport=report['export']) for report in reports]
+    combined = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(columns=['Eksport'])
+    return combined[['Eksport'] + [column for column in combined.columns if column != 'Eksport']]
+
+
+def write_csv_reports(reports, output_dir):
+    """
+    Zapisuje platform_counts.csv i issue_type_counts.csv dla wszystkich eksportów.
+    """
+    for table_name in ['platform_counts', 'issue_type_counts']:
+        combine_report_tables(reports, table_name).to_csv(
+            os.path.join(output_dir, f'{table_name}.csv'), index=False
+        )
+
+
+def write_json_report(reports, output_dir):
+    """
+    Zapisuje report.json z KPI i tabelami agregatów każdego eksportu.
+    """
+    payload = [
+        {
+            'export': report['export'],
+            'source_path': report['source_path'],
+            'fingerprint': report['fingerprint'],
+            'quarters': report['quarters'],
+            'kpi': report['kpi'],
+            'platform_counts': report['platform_counts'].to_dict('records'),
+            'issue_type_counts': report['issue_type_counts'].to_dict('records')
+        }
+        for report in reports
+    ]
+    with open(os.path.join(output_dir, 'report.json'), 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+
+
+def write_html_reports(reports, output_dir, include_plotlyjs='cdn'):
+    """
+    Zapisuje statyczną stronę HTML dla każdego eksportu oraz index.html z odnośnikami.
+    Strony eksportów z podkatalogów (nazwa teamA/export) trafiają do tych samych podkatalogów.
+    include_plotlyjs=True osadza bibliotekę Plotly w plikach (raporty działają bez sieci).
+    """
+    links = []
+    for report in reports:
+        kpi = report['kpi']
+        kpi_items = [
+            f"<li>{html.escape(str(quarter))}: {total}</li>"
+            for quarter, total in zip(kpi['quarters'], kpi['totals']) if quarter is not None
+        ]
+        kpi_items.append(f"<li>Łącznie: {kpi['total_overall']}</li>")
+        charts = [
+            go.Figure(figure).to_html(full_html=False, include_plotlyjs=include_plotlyjs if i == 0 else False)
+            for i, figure in enumerate(report['figures'])
+        ]
+        page = "\n".join([
+            "<!DOCTYPE html>",
+            "<html><head><meta charset=\"utf-8\">",
+            f"<title>Analiza zmian - {html.escape(report['export'])}</title></head>",
+            "<body style=\"font-family: 'Inter', sans-serif;\">",
+            f"<h1>Analiza zmian - {html.escape(report['export'])}</h1>",
+            "<h2>KPI</h2>",
+            "<ul>", *kpi_items, "</ul>",
+            *charts,
+            "<h2>Zadania według platform</h2>",
+            report['platform_counts'].to_html(index=False),
+            "<h2>Zadania według platform i typów</h2>",
+            report['issue_type_counts'].to_html(index=False),
+            "</body></html>"
+        ])
+        file_name = f"{report['export']}.html"
+        page_path = os.path.join(output_dir, *file_name.split('/'))
+        os.makedirs(os.path.dirname(page_path), exist_ok=True)
+        with open(page_path, 'w', encoding='utf-8') as f:
+            f.write(page)
+        links.append(f"<li><a href=\"{html.escape(quote(file_name))}\">{html.escape(report['export'])}</a></li>")
+
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write("\n".join([
+            "<!DOCTYPE html>",
+            "<html><head><meta charset=\"utf-8\"><title>Raporty eksportów Jira</title></head>",
+            "<body style=\"font-family: 'Inter', sans-serif;\">",
+            "<h1>Raporty eksportów Jira</h1>",
+            "<ul>", *links, "</ul>",
+            "</body></html>"
+        ]))
+
+
+def build_argument_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m analiza_jira',
+        description='Wsadowe raporty z eksportów Jira (CSV/JSON/HTML) bez uruchamiania aplikacji Dash.'
+    )
+    parser.add_argument('exports', nargs='+', help='pliki eksportu CSV lub katalogi z eksportami')
+    parser.add_argument('-o', '--output-dir', default='raporty', help='katalog wyjściowy (domyślnie: raporty)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='liczba procesów roboczych (domyślnie: liczba rdzeni)')
+    parser.add_argument('-f', '--formats', nargs='+', choices=report_formats, default=report_formats,
+                        help='formaty raportów (domyślnie: wszystkie)')
+    parser.add_argument('--embed-plotlyjs', action='store_true',
+                        help='osadź bibliotekę Plotly w plikach HTML (raporty offline)')
+    return parser
+
+
+def main(argv=None):
+    """
+    Punkt wejścia CLI. Zwraca kod wyjścia: 0, gdy wszystkie eksporty przetworzono, 1 w przeciwnym razie.
+    """
+    args = build_argument_parser().parse_args(argv)
+    export_paths = collect_export_paths(args.exports)
+    if not export_paths:
+        print("Błąd: nie znaleziono żadnych plików eksportu CSV.")
+        return 1
+
+    reports, failed = compute_reports(export_paths, workers=args.workers)
+    os.makedirs(args.output_dir, exist_ok=True)
+    if 'csv' in args.formats:
+        write_csv_reports(reports, args.output_dir)
+    if 'json' in args.formats:
+        write_json_report(reports, args.output_dir)
+    if 'html' in args.formats:
+        write_html_reports(reports, args.output_dir, include_plotlyjs=True if args.embed_plotlyjs else 'cdn')
+
+    print(f"Zapisano raporty dla {len(reports)} z {len(export_paths)} eksportów w '{args.output_dir}'.")
+    return 1 if failed else 0
@@ -0,0 +1,154 @@
+"""
+Cache wyników (gotowych figur i KPI) współdzielony przez procesy workerów serwera WSGI,
+aby kombinację filtrów liczył tylko pierwszy worker, który ją dostanie. Korzysta z diskcache,
+jeśli jest zainstalowany, a w przeciwnym razie z katalogu plików pickle.
+
+Klucze zawierają odcisk modelu danych, więc wpisy starego eksportu nigdy nie zostaną trafione
+i z czasem są usuwane (limit rozmiaru diskcache albo limit liczby plików).
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+SHARED_CACHE_SIZE_LIMIT = 512 * 2**20
+SHARED_CACHE_MAX_FILES = 4096
+# Co ile zapisów katalog plików jest sprawdzany pod kątem limitu liczby wpisów
+FILE_CACHE_CULL_EVERY = 64
+
+
+def shared_cache_key(*parts):
+    """
+    Klucz wpisu: skrót SHA-256 reprezentacji części klucza (krotki str/int/None).
+    """
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+
+class FileResultCache:
+    """
+    Jeden plik pickle na wpis. Zapis przez plik tymczasowy i os.replace jest atomowy,
+    więc równoległe zapisy tego samego klucza z kilku workerów są bezpieczne.
+    """
+    backend = 'files'
+
+    def __init__(self, directory, max_files=SHARED_CACHE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+        self.lock = threading.Lock()
+        self.writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        try:
+            with open(os.path.join(self.directory, key + '.pkl'), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key, value):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, os.path.join(self.directory, key + '.pkl'))
+        except OSError as e:
+            print(f"Nie udało się zapisać wpisu cache w '{self.directory}': {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        with self.lock:
+            self.writes += 1
+            cull = self.writes % FILE_CACHE_CULL_EVERY == 0
+        if cull:
+            self.cull()
+
+    def cull(self):
+        """
+        Usuwa najstarsze wpisy (wg daty modyfikacji) ponad limit liczby plików.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pkl'):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+        for _, path in sorted(entries)[:max(0, len(entries) - self.max_files)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def size(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith('.pkl'))
+
+
+class DiskcacheResultCache:
+    """
+    Cache na diskcache (SQLite + pliki) z limitem rozmiaru i usuwaniem najdawniej używanych wpisów.
+    """
+    backend = 'diskcache'
+
+    def __init__(self, directory, size_limit=SHARED_CACHE_SIZE_LIMIT):
+        self.directory = directory
+        self.cache = diskcache.Cache(directory, size_limit=size_limit, eviction_policy='least-recently-used')
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value):
+        self.cache.set(key, value)
+
+    def size(self):
+        return len(self.cache)
+
+
+class SharedResultCache:
+    """
+    Cache wyników z licznikami trafień/chybień bieżącego procesu.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key_parts, compute):
+        """
+        Zwraca wynik z cache dla key_parts albo wylicza go przez compute() i zapisuje.
+        """
+        key = shared_cache_key(*key_parts)
+        value = self.store.get(key)
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is None:
+            value = compute()
+            self.store.set(key, value)
+        return value
+
+    def stats(self):
+        with self.lock:
+            return {
+                'backend': self.store.backend, 'directory': self.store.directory,
+                'hits': self.hits, 'misses': self.misses, 'size': self.store.size()
+            }
+
+
+def open_shared_cache(directory):
+    """
+    Otwiera współdzielony cache w katalogu: diskcache, jeśli jest dostępny, inaczej pliki pickle.
+    """
+    if DISKCACHE_AVAILABLE:
+        return SharedResultCache(DiskcacheResultCache(directory))
+    return SharedResultCache(FileResultCache(directory))
@@ -1,171 +1,71 @@
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go 
-from dash import Dash, html, dcc, Input, Output # type: ignore
 import os
+import threading
+import time
+from functools import lru_cache
+
+from dash import Dash, html, dcc, dash_table, ctx, Input, Output, State, ClientsideFunction # type: ignore
+from flask import Response, g, request
+
+# --- 1. Parsowanie i kategoryzacja danych (pakiet analiza_jira, bez efektów ubocznych importu) ---
+from analiza_jira.core import (
+    all_platforms_for_display, platform_filter_values, build_quarter_filter_options,
+    quarter_in_filter, cube_dimensions, build_aggregate_payload, load_data_model, find_latest_export,
+    get_export_sources, load_federated_model, compute_data_fingerprint, platform_rules_path
+)
+from analiza_jira.charts import build_chart_templates, build_flow_charts
+from analiza_jira.instrumentation import (
+    instrumentation_enabled, stage_timer, stage_metrics, profile_sampler, instrumented_callback
+)
+from analiza_jira.shared_cache import open_shared_cache
+from analiza_jira.issue_store import IssueStore, load_store_model
+
 
-# --- 1. Funkcje do parsowania i kategoryzacji danych ---
-
-def categorize_and_filter_changes(df_raw_input, selected_quarter=None, selected_platform=None):
-    """
-    Kategoryzuje i filtruje zakończone zadania dla Q1 i Q2 2025
-    oraz dla wybranych kwartałów/platform.
-    """
-    
-    df = df_raw_input.copy()
-
-    df['Due date'] = pd.to_datetime(df['Due date'], errors='coerce', format='%Y/%m/%d')
-    df['Inferred due date'] = pd.to_datetime(df['Inferred due date'], errors='coerce', format='%Y/%m/%d')
-    df['Completion_Date'] = df['Due date'].fillna(df['Inferred due date'])
-
-    df_done = df[df['Status'] == 'Done'].copy()
-
-    q1_start = pd.Timestamp('2025-01-01')
-    q1_end = pd.Timestamp('2025-03-31')
-    q2_start = pd.Timestamp('2025-04-01')
-    q2_end = pd.Timestamp('2025-06-30')
-
-    all_platforms_for_display = ["UMPIRE", "WICKET", "STRIDE", "Ogólne/Cross-platformowe"]
-
-    # Nowe, wyczyszczone struktury dla danych
-    categorized_data = {
-        "Platforma": all_platforms_for_display,
-        "Q1 2025": [0] * len(all_platforms_for_display), 
-        "Q2 2025": [0] * len(all_platforms_for_display),
-        "Details Q1 2025": {p: [] for p in all_platforms_for_display},
-        "Details Q2 2025": {p: [] for p in all_platforms_for_display}
-    }
-
-    issue_type_breakdown = {
-        'Q1 2025': {},
-        'Q2 2025': {}
-    }
-
-    df['Key'] = df['Key'].astype(str)
-    df_temp_for_epic = df.copy()
-    df_temp_for_epic['Parent'] = df_temp_for_epic['Parent'].astype(str)
-    epic_summaries = df_temp_for_epic.set_index('Key')['Summary'].astype(str).to_dict()
-
-    # Manualne mapowania kluczy zadań do przypisanych platform i kwartałów
-    # Te mapowania powinny być tworzone raz i używane do kategoryzacji
-    # Zmieniono strukturę, aby klucz mapował na (kwartał, lista_kategorii)
-    all_manual_overrides = {}
-
-    # Q1 specific keys and their primary/secondary categories
-    q1_specific_keys_mapping = {
-        "TPD-474": ["UMPIRE", "STRIDE"], 
-        "TPD-535": ["UMPIRE"], "TPD-375": ["UMPIRE"], "TPD-376": ["UMPIRE"], "TPD-252": ["UMPIRE"], 
-        "TPD-333": ["WICKET"], "TPD-331": ["WICKET"], "TPD-332": ["WICKET"], "TPD-178": ["WICKET"], 
-        "TPD-516": ["WICKET"], "TPD-517": ["WICKET"], "TPD-530": ["WICKET"], 
-        "TPD-240": ["STRIDE"], "TPD-263": ["STRIDE"],
-        # Przykłady z Q1, które były wcześniej "Ogólne", ale chcemy je tu śledzić by nie pomijać w filtrowaniu kwartału
-        "TPD-158": ["Ogólne/Cross-platformowe"], # Epic CDN
-        "TPD-452": ["Ogólne/Cross-platformowe"], # Epic OTT/Quiz
-        "TPD-448": ["Ogólne/Cross-platformowe"], # Epic Analityka GA
-        "TPD-451": ["Ogólne/Cross-platformowe"], # Epic Mobile bugs
-        "TPD-330": ["Ogólne/Cross-platformowe"], # Epic QF Paweł (ale jego subtaski są Wicket)
-        "TPD-200": ["Ogólne/Cross-platformowe"], # Epic Predictor Game
-    }
-
-    # Q2 specific keys and their primary/secondary categories
-    q2_specific_keys_mapping = {
-        "TPD-440": ["WICKET"], "TPD-442": ["WICKET"], "TPD-443": ["WICKET"], "TPD-447": ["WICKET"],
-        "TPD-444": ["WICKET"], "TPD-441": ["WICKET"], "TPD-445": ["WICKET"],
-        "TPD-687": ["WICKET"], "TPD-700": ["WICKET"], "TPD-763": ["WICKET"],
-        "TPD-453": ["STRIDE"],
-        # Przykłady z Q2, które były wcześniej "Ogólne"
-        "TPD-439": ["Ogólne/Cross-platformowe"], # Epic Stride Support Improvements
-        "TPD-631": ["Ogólne/Cross-platformowe"], # Epic Support
-        "TPD-731": ["Ogólne/Cross-platformowe"], # Epic Bugs and Improvements
-        "TPD-851": ["Ogólne/Cross-platformowe"], # Epic Scalenie środowisk
-        "TPD-880": ["Ogólne/Cross-platformowe"], # Epic BRNDS ads
-    }
-
-    # Budujemy all_manual_overrides dla szybkiego dostępu
-    for k, v in q1_specific_keys_mapping.items():
-        all_manual_overrides[k] = {'quarter': 'Q1 2025', 'categories': v}
-    for k, v in q2_specific_keys_mapping.items():
-        all_manual_overrides[k] = {'quarter': 'Q2 2025', 'categories': v}
-
-
-    # Iterujemy po WSZYSTKICH zakończonych zadaniach z oryginalnego df_done
-    # Filtrowanie platform i kwartałów odbywa się wewnątrz pętli
-    for index, row in df_done.iterrows(): 
-        summary = str(row['Summary']) if pd.notna(row['Summary']) else ''
-        issue_type = str(row['Issue Type']) if pd.notna(row['Issue Type']) else ''
-        key = str(row['Key']) if pd.notna(row['Key']) else ''
-        
-        parent_key = str(row['Parent']) if pd.notna(row['Parent']) else None
-        parent_summary = epic_summaries.get(parent_key, '') if parent_key else ''
-        
-        item_detail = f"[{key}] {summary} ({issue_type})"
-
-        # 1. Określenie kwartału (najpierw z daty, potem z manualnych nadpisań)
-        current_item_quarter_str = None
-        if pd.notna(row['Completion_Date']):
-            if q1_start <= row['Completion_Date'] <= q1_end:
-                current_item_quarter_str = 'Q1 2025'
-            elif q2_start <= row['Completion_Date'] <= q2_end:
-                current_item_quarter_str = 'Q2 2025'
-        
-        # 2. Określenie kategorii (najpierw z manualnych nadpisań, potem z keywords)
-        item_categories = [] # Lista kategorii, do których należy to zadanie
-
-        if key in all_manual_overrides:
-            # Jeśli klucz jest w manualnych nadpisaniach, użyj zdefiniowanych tam kategorii i kwartału
-            item_categories = all_manual_overrides[key]['categories']
-            current_item_quarter_str = all_manual_overrides[key]['quarter'] # Nadpisz kwartał z manualnego override
-        else:
-            # Jeśli nie ma manualnego nadpisania, użyj logiki słów kluczowych
-            determined_category = "Ogólne/Cross-platformowe" # Domyślna
-            if "Umpire" in summary or "Umpire" in parent_summary or "[Umpire" in summary:
-                determined_category = "UMPIRE"
-            elif "Wicket" in summary or "Wicket" in parent_summary or "[Wicket" in summary:
-                determined_category = "WICKET"
-            elif "Stride" in summary or "Stride" in parent_summary or "[Stride" in summary:
-                determined_category = "STRIDE"
-            item_categories.append(determined_category)
-
-
-        # --- Główne filtrowanie i zliczanie ---
-        # Sprawdzamy, czy zadanie pasuje do filtra kwartału
-        quarter_match = (selected_quarter is None or selected_quarter == 'All 2025' or selected_quarter == current_item_quarter_str)
-
-        if quarter_match and current_item_quarter_str:
-            for cat in item_categories:
-                # Sprawdzamy, czy zadanie pasuje do filtra platformy
-                platform_match = (selected_platform is None or selected_platform == 'All Platforms' or selected_platform == cat)
-                
-                if platform_match:
-                    details_key_q = f"Details {current_item_quarter_str}"
-                    if cat in categorized_data[details_key_q]: # Upewnij się, że kategoria istnieje
-                        categorized_data[details_key_q][cat].append(item_detail)
-                        
-                        # Zliczanie dla issue_type_breakdown (dotyczy tylko wybranego kwartału)
-                        if current_item_quarter_str in issue_type_breakdown:
-                            issue_type_breakdown[current_item_quarter_str][issue_type] = issue_type_breakdown[current_item_quarter_str].get(issue_type, 0) + 1
-        
-    # Finalne przeliczenie unikalnych zadań na podstawie szczegółowych list (dla głównego wykresu)
-    for platform in categorized_data["Platforma"]:
-        # Używamy set() dla usunięcia duplikatów
-        q1_unique_items = set(categorized_data["Details Q1 2025"][platform])
-        q2_unique_items = set(categorized_data["Details Q2 2025"][platform])
-        
-        categorized_data["Q1 2025"][categorized_data["Platforma"].index(platform)] = len(q1_unique_items)
-        categorized_data["Q2 2025"][categorized_data["Platforma"].index(platform)] = len(q2_unique_items)
-
-    return categorized_data, issue_type_breakdown 
-
-# --- 2. Wczytanie danych z pliku CSV (tylko raz na starcie aplikacji) ---
+# --- 2. Wczytanie danych z pliku CSV (raz na starcie; nowe eksporty przeładowuje watcher) ---
 csv_file_name = 'products_development_2025-06-19_11.34am.csv'
 script_dir = os.path.dirname(__file__) 
-csv_file_path = os.path.join(script_dir, csv_file_name) 
+data_dir = os.environ.get('JIRA_DATA_DIR', script_dir)
+csv_file_path = None
+
+# Federacja eksportów: JIRA_EXPORT_MANIFEST (plik JSON z listą eksportów) albo JIRA_FEDERATE_EXPORTS=1
+# (wszystkie pliki CSV z JIRA_DATA_DIR). Bez niej aplikacja pokazuje tylko najnowszy eksport.
+# Magazyn zadań: JIRA_ISSUE_STORE (plik SQLite) zasilany deltami zmienionych zadań z JIRA_DELTA_DIR.
+# Pusty magazyn wypełnia najnowszy eksport, a model danych jest budowany z magazynu (wyklucza federację).
+issue_store_path = os.environ.get('JIRA_ISSUE_STORE')
+delta_dir = os.environ.get('JIRA_DELTA_DIR', os.path.join(data_dir, 'deltas'))
+issue_store = None
+
+export_manifest_path = os.environ.get('JIRA_EXPORT_MANIFEST')
+federate_exports = not issue_store_path and (
+    export_manifest_path is not None or os.environ.get('JIRA_FEDERATE_EXPORTS') == '1'
+)
+export_location = export_manifest_path or data_dir
+ALL_SOURCES = 'All Sources'
 
 try:
-    df_raw_global = pd.read_csv(csv_file_path, sep=',', quotechar='"')
-    # Początkowe wczytanie danych bez filtrowania, dla inicjalizacji
-    # Callbacki będą wywoływać analyze_and_filter_data z odpowiednimi filtrami
-except FileNotFoundError:
+    # Jednorazowa kategoryzacja przy starcie - callbacki tylko filtrują gotową tabelę.
+    # Callbacki odczytują data_model_global raz na wywołanie, więc podmiana modelu jest atomowa.
+    if not federate_exports:
+        csv_file_path = find_latest_export(data_dir) or os.path.join(script_dir, csv_file_name)
+    if issue_store_path:
+        federated_model_global = None
+        issue_store = IssueStore(issue_store_path)
+        if issue_store.issue_count() == 0:
+            issue_store.apply_delta_file(csv_file_path)
+        issue_store.apply_pending_deltas(delta_dir)
+        data_model_global = load_store_model(issue_store)
+    elif federate_exports:
+        federated_model_global = load_federated_model(export_location)
+        data_model_global = federated_model_global.combined
+    else:
+        federated_model_global = None
+        data_model_global = load_data_model(csv_file_path)
+except FileNotFoundError as e:
+    if federate_exports:
+        print(f"Błąd: {e}")
+        exit()
+    if not os.path.isdir(data_dir):
+        print(f"Błąd: Katalog z eksportami '{data_dir}' (JIRA_DATA_DIR) nie istnieje.")
+        exit()
     print(f"Błąd: Plik '{csv_file_name}' nie został znaleziony w katalogu '{script_dir}'.")
     print("Upewnij się, że plik CSV jest w tym samym folderze co skrypt Pythona.")
     exit()
@@ -173,298 +73,686 @@ except Exception as e:
     print(f"Wystąpił nieoczekiwany błąd podczas przetwarzania pliku CSV: {e}")
     exit()
 
+
+def get_data_model(source_value=ALL_SOURCES):
+    """
+    Model danych dla wybranego źródła; 'All Sources' (i tryb bez federacji) to model połączony.
+    """
+    federated_model = federated_model_global
+    if federated_model is None:
+        return data_model_global
+    return federated_model.source_models.get(source_value, federated_model.combined)
+
+
+# Wyniki dla kombinacji filtrów trzymamy w LRU. Model danych jest częścią klucza, a jego hash
+# to odcisk danych - po zmianie zawartości CSV stare wpisy nigdy nie zostaną trafione.
+FILTER_CACHE_SIZE = 64
+
+# Cache wyników współdzielony przez workery serwera WSGI (JIRA_SHARED_CACHE_DIR, ustawiany przez
+# gunicorn.conf.py) - pierwszy worker liczy wynik dla kombinacji filtrów, pozostałe go odczytują.
+# Odcisk reguł platform jest częścią klucza, bo katalog może przetrwać restart z innymi regułami.
+shared_cache_dir = os.environ.get('JIRA_SHARED_CACHE_DIR')
+shared_result_cache = open_shared_cache(shared_cache_dir) if shared_cache_dir else None
+platform_rules_fingerprint = compute_data_fingerprint(platform_rules_path)
+
+
+def get_shared_result(key_parts, compute):
+    """
+    Wynik compute() ze współdzielonego cache (gdy jest włączony) albo policzony na miejscu.
+    """
+    if shared_result_cache is None:
+        return compute()
+    return shared_result_cache.get_or_compute((platform_rules_fingerprint,) + key_parts, compute)
+
+
+# Filtry wymiarów kostki OLAP (kolejność jak w cube_dimensions): wymiar, id komponentu, etykieta
+dimension_filters = [
+    ('Assignee', 'assignee-filter', 'Wybierz osobę:'),
+    ('Sprint', 'sprint-filter', 'Wybierz sprint:'),
+    ('Issue Type', 'issue-type-filter', 'Wybierz typ zadania:'),
+    ('Issue color', 'issue-color-filter', 'Wybierz kolor zadania:')
+]
+default_dimension_values = ('All',) * len(cube_dimensions)
+
+
+def get_dimension_filters(dimension_values):
+    """
+    Słownik wymiar -> wartość dla aktywnych filtrów wymiarów ('All' oznacza brak filtra).
+    """
+    return {d: v for d, v in zip(cube_dimensions, dimension_values) if v not in (None, 'All')}
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def get_aggregate_payload(data_model, dimension_values=default_dimension_values, kpi_quarters=None):
+    """
+    Agregaty kostki OLAP dla wszystkich wartości filtrów kwartału i platformy przy danych
+    filtrach wymiarów (krotka w kolejności cube_dimensions). Trafiają do aggregate-store,
+    z którego wykresy i KPI przelicza callback w przeglądarce (assets/clientside.js).
+    kpi_quarters (krotka) pozwala liczyć KPI dla kwartałów z nagłówków layoutu, gdy model
+    pojedynczego źródła ma inne ostatnie kwartały niż model połączony.
+    Zwracany słownik jest współdzielony między wywołaniami - nie wolno go modyfikować.
+    """
+    kpi_quarters = tuple(kpi_quarters or data_model.kpi_quarters)
+
+    def compute():
+        with stage_timer('build_aggregate_payload'):
+            payload = build_aggregate_payload(
+                data_model.cube, data_model.quarters, get_dimension_filters(dimension_values)
+            )
+        payload['kpi_quarters'] = list(kpi_quarters)
+        return payload
+
+    return get_shared_result(('payload', data_model.fingerprint, tuple(dimension_values), kpi_quarters), compute)
+
+
+# Panel szczegółów zwraca jedną stronę wierszy; cache trzyma przefiltrowaną i posortowaną
+# grupę dla (kwartał, platforma, sortowanie, wyszukiwanie), więc zmiana strony to tylko wycinek.
+DETAILS_PAGE_SIZE = 25
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def get_details_rows(data_model, quarter, platform, dimension_values=default_dimension_values,
+                     sort_column=None, sort_descending=False, search_text=''):
+    """
+    Zwraca wiersze indeksu szczegółów dla (kwartał, platforma), zawężone filtrami wymiarów,
+    wyszukiwaniem (fragment tekstu, bez rozróżniania wielkości liter) i posortowane po wskazanej
+    kolumnie. Bez sortowania wiersze są w kolejności indeksu (alfabetycznie po Detail).
+    """
+    rows = data_model.details_index.group(quarter, platform)
+    for dimension, value in get_dimension_filters(dimension_values).items():
+        rows = rows[rows[dimension] == value]
+    if search_text:
+        rows = rows[rows['Detail'].str.contains(search_text, case=False, regex=False)]
+    if sort_column is not None:
+        rows = rows.sort_values(sort_column, ascending=not sort_descending, kind='stable')
+    return rows
+
+
+def payload_cache_stats():
+    """
+    Liczniki trafień/chybień cache agregatów dla przeglądarki.
+    """
+    info = get_aggregate_payload.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
+
+
+def flow_cache_stats():
+    """
+    Liczniki trafień/chybień cache figur analizy przepływu.
+    """
+    info = get_flow_charts.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
+
+
+def details_cache_stats():
+    """
+    Liczniki trafień/chybień cache wierszy panelu szczegółów.
+    """
+    info = get_details_rows.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
+
+
+def clear_result_caches():
+    """
+    Czyści cache wyników - wpisy starego modelu i tak nie zostaną już trafione.
+    """
+    get_aggregate_payload.cache_clear()
+    get_details_rows.cache_clear()
+    get_flow_charts.cache_clear()
+
+
+def reload_data_model(file_path):
+    """
+    Buduje model dla nowego eksportu i podmienia go w miejsce data_model_global.
+    Callbacki w trakcie wykonania dokańczają pracę na poprzednim, kompletnym modelu.
+    """
+    global data_model_global
+    start_time = time.perf_counter()
+    previous_model = data_model_global
+    new_model = load_data_model(file_path, previous_model=previous_model)
+    if new_model is previous_model:
+        return previous_model
+
+    data_model_global = new_model
+    clear_result_caches()
+    print(f"Przeładowano dane z '{os.path.basename(file_path)}' w {time.perf_counter() - start_time:.2f} s.")
+    return new_model
+
+
+def reload_federated_model():
+    """
+    Przeładowuje federację eksportów - ponownie wczytywane są tylko zmienione źródła.
+    """
+    global federated_model_global, data_model_global
+    start_time = time.perf_counter()
+    previous_model = federated_model_global
+    new_model = load_federated_model(export_location, previous_model=previous_model)
+    if new_model is previous_model:
+        return previous_model
+
+    federated_model_global = new_model
+    data_model_global = new_model.combined
+    clear_result_caches()
+    print(f"Przeładowano {len(new_model.source_models)} eksportów w {time.perf_counter() - start_time:.2f} s.")
+    return new_model
+
+
+def reload_store_model():
+    """
+    Odświeża model z magazynu zadań - przetwarzane są tylko zadania zmienione od rewizji
+    bieżącego modelu (delty mógł zastosować także inny proces, np. inny worker).
+    """
+    global data_model_global
+    start_time = time.perf_counter()
+    previous_model = data_model_global
+    new_model = load_store_model(issue_store, previous_model=previous_model)
+    if new_model is previous_model:
+        return previous_model
+
+    data_model_global = new_model
+    clear_result_caches()
+    print(f"Odświeżono dane z magazynu zadań (rewizja {new_model.revision}) "
+          f"w {time.perf_counter() - start_time:.2f} s.")
+    return new_model
+
+
+def get_export_signature():
+    """
+    Sygnatura (ścieżka, data modyfikacji, rozmiar) obserwowanych plików: delt magazynu zadań,
+    wszystkich źródeł federacji albo najnowszego eksportu w katalogu.
+    """
+    if issue_store is not None:
+        file_paths = ([os.path.join(delta_dir, name) for name in sorted(os.listdir(delta_dir))
+                       if name.lower().endswith('.csv')] if os.path.isdir(delta_dir) else [])
+    elif federate_exports:
+        file_paths = [path for _, path in get_export_sources(export_location)]
+        # Zmiana kolejności lub dat eksportu w manifeście też zmienia dane połączone
+        if os.path.isfile(export_location):
+            file_paths.append(export_location)
+    else:
+        file_paths = [path for path in [find_latest_export(data_dir)] if path is not None]
+    return tuple((path, os.path.getmtime(path), os.path.getsize(path)) for path in file_paths)
+
+
+def watch_exports(interval, stop_event, on_reload=None):
+    """
+    Co interval sekund sprawdza obserwowane eksporty i przeładowuje dane, gdy któryś plik
+    się zmienił. Przeładowanie następuje dopiero, gdy pliki są stabilne przez jeden cykl,
+    aby nie wczytać eksportu w trakcie zapisu. on_reload jest wywoływane po każdej podmianie
+    modelu danych (np. restart workerów gunicorn, które dziedziczą nowy model).
+    """
+    last_signature = None
+    pending_signature = None
+    while not stop_event.wait(interval):
+        previous_model = data_model_global
+        try:
+            if issue_store is not None:
+                # Delty zastosowane przez inny proces - wystarczy dociągnąć zmiany z magazynu
+                reload_store_model()
+            signature = get_export_signature()
+            if not signature or signature == last_signature:
+                continue
+            if signature != pending_signature:
+                pending_signature = signature
+                continue
+            if issue_store is not None:
+                issue_store.apply_pending_deltas(delta_dir)
+                reload_store_model()
+            elif federate_exports:
+                reload_federated_model()
+            else:
+                reload_data_model(signature[0][0])
+            last_signature = signature
+        except Exception as e:
+            print(f"Błąd podczas przeładowania eksportu: {e}")
+        if on_reload is not None and data_model_global is not previous_model:
+            on_reload()
+
+
+def start_export_watcher(interval, on_reload=None):
+    """
+    Uruchamia watch_exports w wątku w tle. Zwraca Event, którego ustawienie zatrzymuje watcher.
+    """
+    stop_event = threading.Event()
+    threading.Thread(
+        target=watch_exports, args=(interval, stop_event, on_reload), name='jira-export-watcher', daemon=True
+    ).start()
+    return stop_event
+
+
 # --- 3. Budowa aplikacji Dash z ulepszonym wyglądem i nowymi filtrami/KPI ---
 app = Dash(__name__)
 
-app.layout = html.Div(style={
-    'fontFamily': 'Arial, sans-serif',
-    'backgroundColor': '#f0f2f5', 
-    'padding': '40px 20px',
-    'minHeight': '100vh',
-    'display': 'flex',
-    'flexDirection': 'column',
-    'alignItems': 'center'
-}, children=[
-    html.H1(children='Analiza Zmian w Projektach IT', style={
-        'textAlign': 'center',
-        'color': '#2c3e50', 
-        'marginBottom': '10px',
-        'fontSize': '2.8em',
-        'fontWeight': 'bold'
-    }),
-
-    html.H2(children='Raport za I i II Kwartał 2025 Roku', style={
-        'textAlign': 'center',
-        'color': '#34495e',
-        'marginBottom': '40px',
-        'fontSize': '1.8em',
-        'fontWeight': 'normal'
-    }),
-
-    # --- KPI Section ---
-    html.Div(style={
+# Szablony wykresów dla callbacku w przeglądarce (assets/clientside.js) - zależą tylko od listy platform
+chart_templates = build_chart_templates(all_platforms_for_display)
+
+
+def serve_layout():
+    """
+    Buduje layout przy każdym wczytaniu strony, aby opcje filtrów i nagłówki
+    odpowiadały kwartałom z aktualnie wczytanego (również przeładowanego) eksportu.
+    """
+    data_model = data_model_global
+    quarters = data_model.quarters
+    kpi_q1_label, kpi_q2_label = (q or '-' for q in data_model.kpi_quarters)
+    report_subtitle = (f'Raport za okres {quarters[0]} – {quarters[-1]}' if quarters
+                       else 'Brak zakończonych zadań w danych')
+    default_quarter_value = f'All {quarters[-1].split()[-1]}' if quarters else 'All'
+    source_names = list(federated_model_global.source_models) if federated_model_global is not None else []
+
+    return html.Div(style={
+        'fontFamily': 'Arial, sans-serif',
+        'backgroundColor': '#f0f2f5', 
+        'padding': '40px 20px',
+        'minHeight': '100vh',
         'display': 'flex',
-        'justifyContent': 'space-around',
-        'width': '100%',
-        'maxWidth': '1000px',
-        'marginBottom': '40px',
-        'flexWrap': 'wrap',
-        'gap': '20px'
+        'flexDirection': 'column',
+        'alignItems': 'center'
     }, children=[
-        html.Div(style=
-            {
-                'backgroundColor': '#ffffff',
-                'borderRadius': '12px',
-                'boxShadow': '0 2px 10px rgba(0, 0, 0, 0.05)',
-                'padding': '20px',
-                'textAlign': 'center',
-                'flex': '1',
-                'minWidth': '200px'
-            }, children=[
-            html.H3("Zadania zakończone w Q1", style={'color': '#2ecc71', 'fontSize': '1.2em', 'marginBottom': '10px'}),
-            html.P(id='kpi-q1-total', style={'fontSize': '2em', 'fontWeight': 'bold', 'color': '#34495e'})
+        html.H1(children='Analiza Zmian w Projektach IT', style={
+            'textAlign': 'center',
+            'color': '#2c3e50', 
+            'marginBottom': '10px',
+            'fontSize': '2.8em',
+            'fontWeight': 'bold'
+        }),
+
+        html.H2(children=report_subtitle, style={
+            'textAlign': 'center',
+            'color': '#34495e',
+            'marginBottom': '40px',
+            'fontSize': '1.8em',
+            'fontWeight': 'normal'
+        }),
+
+        # --- KPI Section ---
+        html.Div(style={
+            'display': 'flex',
+            'justifyContent': 'space-around',
+            'width': '100%',
+            'maxWidth': '1000px',
+            'marginBottom': '40px',
+            'flexWrap': 'wrap',
+            'gap': '20px'
+        }, children=[
+            html.Div(style=
+                {
+                    'backgroundColor': '#ffffff',
+                    'borderRadius': '12px',
+                    'boxShadow': '0 2px 10px rgba(0, 0, 0, 0.05)',
+                    'padding': '20px',
+                    'textAlign': 'center',
+                    'flex': '1',
+                    'minWidth': '200px'
+                }, children=[
+                html.H3(f"Zadania zakończone w {kpi_q1_label}", style={'color': '#2ecc71', 'fontSize': '1.2em', 'marginBottom': '10px'}),
+                html.P(id='kpi-q1-total', style={'fontSize': '2em', 'fontWeight': 'bold', 'color': '#34495e'})
+            ]),
+            html.Div(style=
+                {
+                    'backgroundColor': '#ffffff',
+                    'borderRadius': '12px',
+                    'boxShadow': '0 2px 10px rgba(0, 0, 0, 0.05)',
+                    'padding': '20px',
+                    'textAlign': 'center',
+                    'flex': '1',
+                    'minWidth': '200px'
+                }, children=[
+                html.H3(f"Zadania zakończone w {kpi_q2_label}", style={'color': '#3498db', 'fontSize': '1.2em', 'marginBottom': '10px'}),
+                html.P(id='kpi-q2-total', style={'fontSize': '2em', 'fontWeight': 'bold', 'color': '#34495e'})
+            ]),
+            html.Div(style=
+                {
+                    'backgroundColor': '#ffffff',
+                    'borderRadius': '12px',
+                    'boxShadow': '0 2px 10px rgba(0, 0, 0, 0.05)',
+                    'padding': '20px',
+                    'textAlign': 'center',
+                    'flex': '1',
+                    'minWidth': '200px'
+                }, children=[
+                html.H3("Zadania zakończone ogółem", style={'color': '#8e44ad', 'fontSize': '1.2em', 'marginBottom': '10px'}),
+                html.P(id='kpi-total-overall', style={'fontSize': '2em', 'fontWeight': 'bold', 'color': '#34495e'})
+            ])
         ]),
-        html.Div(style=
-            {
-                'backgroundColor': '#ffffff',
-                'borderRadius': '12px',
-                'boxShadow': '0 2px 10px rgba(0, 0, 0, 0.05)',
-                'padding': '20px',
-                'textAlign': 'center',
-                'flex': '1',
-                'minWidth': '200px'
-            }, children=[
-            html.H3("Zadania zakończone w Q2", style={'color': '#3498db', 'fontSize': '1.2em', 'marginBottom': '10px'}),
-            html.P(id='kpi-q2-total', style={'fontSize': '2em', 'fontWeight': 'bold', 'color': '#34495e'})
+
+        # --- Filters Section ---
+        html.Div(style={
+            'backgroundColor': '#ffffff',
+            'borderRadius': '12px',
+            'boxShadow': '0 2px 10px rgba(0, 0, 0, 0.05)',
+            'padding': '20px',
+            'width': '100%',
+            'maxWidth': '1000px',
+            'marginBottom': '40px',
+            'display': 'flex',
+            'justifyContent': 'space-around',
+            'flexWrap': 'wrap',
+            'gap': '20px'
+        }, children=[
+            html.Div(style={'flex': '1', 'minWidth': '250px'}, children=[
+                html.Label("Wybierz źródło danych:", style={'display': 'block', 'marginBottom': '5px', 'fontWeight': 'bold', 'color': '#555'}),
+                dcc.Dropdown(
+                    id='source-filter',
+                    options=[{'label': 'Wszystkie źródła', 'value': ALL_SOURCES}] +
+                        [{'label': name, 'value': name} for name in source_names],
+                    value=ALL_SOURCES,
+                    clearable=False,
+                    disabled=not source_names, # Bez federacji jest tylko jeden eksport
+                    style={'borderRadius': '8px', 'borderColor': '#ccc'}
+                )
+            ]),
+            html.Div(style={'flex': '1', 'minWidth': '250px'}, children=[
+                html.Label("Wybierz kwartał:", style={'display': 'block', 'marginBottom': '5px', 'fontWeight': 'bold', 'color': '#555'}),
+                dcc.Dropdown(
+                    id='quarter-filter',
+                    options=build_quarter_filter_options(quarters),
+                    value=default_quarter_value, # Domyślna wartość - ostatni rok w danych
+                    clearable=False,
+                    style={'borderRadius': '8px', 'borderColor': '#ccc'}
+                )
+            ]),
+            html.Div(style={'flex': '1', 'minWidth': '250px'}, children=[
+                html.Label("Wybierz platformę:", style={'display': 'block', 'marginBottom': '5px', 'fontWeight': 'bold', 'color': '#555'}),
+                dcc.Dropdown(
+                    id='platform-filter',
+                    options=[{'label': 'Wszystkie Platformy', 'value': 'All Platforms'}] +
+                        [{'label': p, 'value': p} for p in all_platforms_for_display],
+                    value='All Platforms', # Domyślna wartość
+                    clearable=False,
+                    style={'borderRadius': '8px', 'borderColor': '#ccc'}
+                )
+            ])
+        ] + [
+            # Filtry wymiarów kostki OLAP - wartości z aktualnie wczytanego eksportu
+            html.Div(style={'flex': '1', 'minWidth': '200px'}, children=[
+                html.Label(label, style={'display': 'block', 'marginBottom': '5px', 'fontWeight': 'bold', 'color': '#555'}),
+                dcc.Dropdown(
+                    id=component_id,
+                    options=[{'label': 'Wszystkie', 'value': 'All'}] +
+                        [{'label': v, 'value': v} for v in data_model.cube.dimension_values[dimension]],
+                    value='All',
+                    clearable=False,
+                    style={'borderRadius': '8px', 'borderColor': '#ccc'}
+                )
+            ])
+            for dimension, component_id, label in dimension_filters
         ]),
-        html.Div(style=
-            {
-                'backgroundColor': '#ffffff',
-                'borderRadius': '12px',
-                'boxShadow': '0 2px 10px rgba(0, 0, 0, 0.05)',
-                'padding': '20px',
-                'textAlign': 'center',
-                'flex': '1',
-                'minWidth': '200px'
-            }, children=[
-            html.H3("Zadania zakończone ogółem", style={'color': '#8e44ad', 'fontSize': '1.2em', 'marginBottom': '10px'}),
-            html.P(id='kpi-total-overall', style={'fontSize': '2em', 'fontWeight': 'bold', 'color': '#34495e'})
-        ])
-    ]),
-
-    # --- Filters Section ---
-    html.Div(style={
-        'backgroundColor': '#ffffff',
-        'borderRadius': '12px',
-        'boxShadow': '0 2px 10px rgba(0, 0, 0, 0.05)',
-        'padding': '20px',
-        'width': '100%',
-        'maxWidth': '1000px',
-        'marginBottom': '40px',
-        'display': 'flex',
-        'justifyContent': 'space-around',
-        'flexWrap': 'wrap',
-        'gap': '20px'
-    }, children=[
-        html.Div(style={'flex': '1', 'minWidth': '250px'}, children=[
-            html.Label("Wybierz kwartał:", style={'display': 'block', 'marginBottom': '5px', 'fontWeight': 'bold', 'color': '#555'}),
-            dcc.Dropdown(
-                id='quarter-filter',
-                options=[
-                    {'label': 'Wszystkie Kwartały', 'value': 'All 2025'},
-                    {'label': 'Q1 2025', 'value': 'Q1 2025'},
-                    {'label': 'Q2 2025', 'value': 'Q2 2025'}
-                ],
-                value='All 2025', # Domyślna wartość
-                clearable=False,
-                style={'borderRadius': '8px', 'borderColor': '#ccc'}
+
+        # Agregaty dla wszystkich kwartałów/platform (z serwera, po zmianie filtrów wymiarów)
+        # i szablony wykresów - z nich callback w przeglądarce buduje wykresy i KPI
+        dcc.Store(id='aggregate-store'),
+        dcc.Store(id='chart-templates', data=chart_templates),
+
+        # Kontener dla wykresu 2D (Liczba zadań per Platforma)
+        html.Div(style={
+            'backgroundColor': '#ffffff',
+            'borderRadius': '12px',
+            'boxShadow': '0 4px 20px rgba(0, 0, 0, 0.08)',
+            'padding': '30px',
+            'width': '100%',
+            'maxWidth': '1000px',
+            'marginBottom': '40px'
+        }, children=[
+            html.H3(children='Liczba Zakończonych Zadań według Platform', style={
+                'textAlign': 'center', 'color': '#2c3e50', 'marginBottom': '20px', 'fontSize': '1.5em'
+            }),
+            dcc.Graph(
+                id='changes-bar-chart-2d',
+                # figure zostanie zaktualizowane przez callback w przeglądarce
             )
         ]),
-        html.Div(style={'flex': '1', 'minWidth': '250px'}, children=[
-            html.Label("Wybierz platformę:", style={'display': 'block', 'marginBottom': '5px', 'fontWeight': 'bold', 'color': '#555'}),
-            dcc.Dropdown(
-                id='platform-filter',
-                options=[
-                    {'label': 'Wszystkie Platformy', 'value': 'All Platforms'},
-                    {'label': 'UMPIRE', 'value': 'UMPIRE'},
-                    {'label': 'WICKET', 'value': 'WICKET'},
-                    {'label': 'STRIDE', 'value': 'STRIDE'},
-                    {'label': 'Ogólne/Cross-platformowe', 'value': 'Ogólne/Cross-platformowe'}
-                ],
-                value='All Platforms', # Domyślna wartość
-                clearable=False,
-                style={'borderRadius': '8px', 'borderColor': '#ccc'}
+
+        # Kontener dla Wykresu Rozkładu Typów Zadań
+        html.Div(style={
+            'backgroundColor': '#ffffff',
+            'borderRadius': '12px',
+            'boxShadow': '0 4px 20px rgba(0, 0, 0, 0.08)',
+            'padding': '30px',
+            'width': '100%',
+            'maxWidth': '1000px',
+            'marginBottom': '40px'
+        }, children=[
+            html.H3(children='Rozkład Typów Zadań w Kwartałach', style={
+                'textAlign': 'center', 'color': '#2c3e50', 'marginBottom': '20px', 'fontSize': '1.5em'
+            }),
+            dcc.Graph(
+                id='issue-type-breakdown-chart',
+                # figure zostanie zaktualizowane przez callback
             )
+        ]),
+
+        # Kontener dla analizy przepływu (czas cyklu i przepustowość per platforma/osoba)
+        html.Div(style={
+            'backgroundColor': '#ffffff',
+            'borderRadius': '12px',
+            'boxShadow': '0 4px 20px rgba(0, 0, 0, 0.08)',
+            'padding': '30px',
+            'width': '100%',
+            'maxWidth': '1000px',
+            'marginBottom': '40px'
+        }, children=[
+            html.H3(children='Czas Cyklu i Przepustowość (filtry platformy i osoby)', style={
+                'textAlign': 'center', 'color': '#2c3e50', 'marginBottom': '20px', 'fontSize': '1.5em'
+            }),
+            dcc.Graph(
+                id='cycle-time-chart',
+                # figure zostanie zaktualizowane przez callback
+            ),
+            dcc.Graph(
+                id='throughput-chart',
+                # figure zostanie zaktualizowane przez callback
+            )
+        ]),
+
+        # Kontener dla szczegółów zadań (bez zmian)
+        html.Div(style={
+            'backgroundColor': '#ffffff',
+            'borderRadius': '12px',
+            'boxShadow': '0 4px 20px rgba(0, 0, 0, 0.08)',
+            'padding': '30px',
+            'width': '100%',
+            'maxWidth': '1000px',
+            'minHeight': '200px'
+        }, children=[
+            html.H2(children='Szczegóły Zadań (Kliknij na słupek na wykresie Platform)', style={
+                'textAlign': 'center', 
+                'color': '#2c3e50', 
+                'marginBottom': '20px',
+                'fontSize': '1.8em',
+                'fontWeight': 'semibold'
+            }),
+            html.Div(id='click-data-output', style={
+                'color': '#2c3e50',
+                'fontSize': '1em',
+                'marginBottom': '15px'
+            }),
+            dcc.Input(
+                id='details-search',
+                type='text',
+                placeholder='Szukaj w zadaniach (klucz, opis, typ)...',
+                debounce=True,
+                style={
+                    'width': '100%',
+                    'boxSizing': 'border-box',
+                    'padding': '8px 12px',
+                    'border': '1px solid #bdc3c7',
+                    'borderRadius': '8px',
+                    'marginBottom': '15px'
+                }
+            ),
+            # Tabela stronicowana po stronie serwera - przeglądarka dostaje tylko bieżącą stronę
+            dash_table.DataTable(
+                id='details-table',
+                columns=[
+                    {'name': 'Klucz', 'id': 'Key'},
+                    {'name': 'Opis', 'id': 'Summary'},
+                    {'name': 'Typ Zadania', 'id': 'Issue Type'}
+                ],
+                data=[],
+                page_current=0,
+                page_size=DETAILS_PAGE_SIZE,
+                page_count=0,
+                page_action='custom',
+                sort_action='custom',
+                sort_mode='single',
+                sort_by=[],
+                style_cell={
+                    'textAlign': 'left',
+                    'fontFamily': 'monospace',
+                    'fontSize': '0.9em',
+                    'color': '#2c3e50',
+                    'padding': '8px',
+                    'whiteSpace': 'normal',
+                    'height': 'auto'
+                },
+                style_header={
+                    'backgroundColor': '#ecf0f1',
+                    'fontWeight': 'bold',
+                    'border': '1px solid #bdc3c7'
+                }
+            ),
+            # Potomkowie epika zaznaczonego w tabeli
+            html.Div(id='epic-descendants-output', style={
+                'whiteSpace': 'pre-wrap', 
+                'backgroundColor': '#ecf0f1', 
+                'border': '1px solid #bdc3c7', 
+                'borderRadius': '8px', 
+                'padding': '20px', 
+                'marginTop': '15px',
+                'fontFamily': 'monospace', 
+                'fontSize': '0.9em',
+                'color': '#2c3e50',
+                'maxHeight': '400px', 
+                'overflowY': 'auto'
+            })
         ])
-    ]),
-
-    # Kontener dla wykresu 2D (Liczba zadań per Platforma)
-    html.Div(style={
-        'backgroundColor': '#ffffff',
-        'borderRadius': '12px',
-        'boxShadow': '0 4px 20px rgba(0, 0, 0, 0.08)',
-        'padding': '30px',
-        'width': '100%',
-        'maxWidth': '1000px',
-        'marginBottom': '40px'
-    }, children=[
-        html.H3(children='Liczba Zakończonych Zadań według Platform', style={
-            'textAlign': 'center', 'color': '#2c3e50', 'marginBottom': '20px', 'fontSize': '1.5em'
-        }),
-        dcc.Graph(
-            id='changes-bar-chart-2d',
-            # figure zostanie zaktualizowane przez callback
-        )
-    ]),
-
-    # Kontener dla Wykresu Rozkładu Typów Zadań
-    html.Div(style={
-        'backgroundColor': '#ffffff',
-        'borderRadius': '12px',
-        'boxShadow': '0 4px 20px rgba(0, 0, 0, 0.08)',
-        'padding': '30px',
-        'width': '100%',
-        'maxWidth': '1000px',
-        'marginBottom': '40px'
-    }, children=[
-        html.H3(children='Rozkład Typów Zadań w Kwartałach', style={
-            'textAlign': 'center', 'color': '#2c3e50', 'marginBottom': '20px', 'fontSize': '1.5em'
-        }),
-        dcc.Graph(
-            id='issue-type-breakdown-chart',
-            # figure zostanie zaktualizowane przez callback
-        )
-    ]),
-
-    # Kontener dla szczegółów zadań (bez zmian)
-    html.Div(style={
-        'backgroundColor': '#ffffff',
-        'borderRadius': '12px',
-        'boxShadow': '0 4px 20px rgba(0, 0, 0, 0.08)',
-        'padding': '30px',
-        'width': '100%',
-        'maxWidth': '1000px',
-        'minHeight': '200px'
-    }, children=[
-        html.H2(children='Szczegóły Zadań (Kliknij na słupek na wykresie Platform)', style={
-            'textAlign': 'center', 
-            'color': '#2c3e50', 
-            'marginBottom': '20px',
-            'fontSize': '1.8em',
-            'fontWeight': 'semibold'
-        }),
-        html.Div(id='click-data-output', style={
-            'whiteSpace': 'pre-wrap', 
-            'backgroundColor': '#ecf0f1', 
-            'border': '1px solid #bdc3c7', 
-            'borderRadius': '8px', 
-            'padding': '20px', 
-            'fontFamily': 'monospace', 
-            'fontSize': '0.9em',
-            'color': '#2c3e50',
-            'maxHeight': '400px', 
-            'overflowY': 'auto'
-        })
     ])
-])
 
-# --- Callback do aktualizacji wykresów i KPI na podstawie filtrów ---
+
+app.layout = serve_layout
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def get_flow_charts(data_model, selected_platform, selected_assignee):
+    """
+    Zwraca figury czasu cyklu i przepustowości dla przekroju - percentyle i serie tygodniowe
+    są policzone przy wczytaniu danych (FlowMetrics), więc tu budowane są tylko figury.
+    """
+    return get_shared_result(
+        ('flow', data_model.fingerprint, selected_platform, selected_assignee),
+        lambda: build_flow_charts(
+            data_model.flow, all_platforms_for_display,
+            None if selected_platform == 'All Platforms' else selected_platform,
+            None if selected_assignee == 'All' else selected_assignee
+        )
+    )
+
+
+def warm_result_cache():
+    """
+    Wstępnie liczy wyniki widoku startowego (domyślne filtry wymiarów) dla wszystkich źródeł:
+    agregaty dla przeglądarki i figury analizy przepływu dla każdej platformy.
+    """
+    kpi_quarters = tuple(data_model_global.kpi_quarters)
+    source_values = [ALL_SOURCES] + (list(federated_model_global.source_models) if federated_model_global else [])
+    for source_value in source_values:
+        data_model = get_data_model(source_value)
+        # Te same argumenty co w update_aggregate_store - inaczej klucze cache się różnią
+        get_aggregate_payload(data_model, default_dimension_values, kpi_quarters)
+        for platform in platform_filter_values:
+            get_flow_charts(data_model, platform, 'All')
+
+
+# --- Callback przesyłający agregaty do przeglądarki po zmianie filtrów wymiarów lub źródła ---
 @app.callback(
+    Output('aggregate-store', 'data'),
+    *[Input(component_id, 'value') for _, component_id, _ in dimension_filters],
+    Input('source-filter', 'value')
+)
+@instrumented_callback('update_aggregate_store')
+def update_aggregate_store(assignee_value, sprint_value, issue_type_value, issue_color_value,
+                           source_value=ALL_SOURCES):
+    # Nagłówki kart KPI pochodzą z modelu połączonego - KPI liczymy dla tych samych kwartałów
+    return get_aggregate_payload(
+        get_data_model(source_value), (assignee_value, sprint_value, issue_type_value, issue_color_value),
+        tuple(data_model_global.kpi_quarters)
+    )
+
+
+# --- Callback w przeglądarce: wykresy i KPI po zmianie kwartału/platformy bez zapytania do serwera ---
+app.clientside_callback(
+    ClientsideFunction(namespace='jira', function_name='updateChartsAndKpis'),
     Output('changes-bar-chart-2d', 'figure'),
     Output('issue-type-breakdown-chart', 'figure'),
     Output('kpi-q1-total', 'children'),
     Output('kpi-q2-total', 'children'),
     Output('kpi-total-overall', 'children'),
     Input('quarter-filter', 'value'),
-    Input('platform-filter', 'value')
+    Input('platform-filter', 'value'),
+    Input('aggregate-store', 'data'),
+    State('chart-templates', 'data')
 )
-def update_charts_and_kpis(selected_quarter_value, selected_platform_value):
-    # Ponownie przetwórz dane z filtrami
-    filtered_categorized_results, filtered_issue_type_breakdown = categorize_and_filter_changes(
-        df_raw_global, selected_quarter=selected_quarter_value, selected_platform=selected_platform_value
-    )
 
-    # Aktualizacja KPI
-    total_q1 = sum(filtered_categorized_results["Q1 2025"])
-    total_q2 = sum(filtered_categorized_results["Q2 2025"])
-    total_overall = total_q1 + total_q2
-
-    # Przygotowanie danych dla wykresu 2D (Platforma vs Liczba Zadań)
-    # df_plot_2d_filtered musi odzwierciedlać tylko wybrane platformy
-    current_platforms_for_display = filtered_categorized_results["Platforma"] # Lista platform po filtrowaniu
-
-    plot_data_2d_filtered_items = []
-    for platform in current_platforms_for_display:
-        platform_idx = filtered_categorized_results["Platforma"].index(platform)
-        plot_data_2d_filtered_items.append({
-            "Platforma": platform,
-            "Liczba zadań": filtered_categorized_results["Q1 2025"][platform_idx],
-            "Kwartał": "Q1 2025"
-        })
-        plot_data_2d_filtered_items.append({
-            "Platforma": platform,
-            "Liczba zadań": filtered_categorized_results["Q2 2025"][platform_idx],
-            "Kwartał": "Q2 2025"
-        })
-    df_plot_2d_filtered = pd.DataFrame(plot_data_2d_filtered_items)
-
-    fig_2d = px.bar(df_plot_2d_filtered, 
-                    x='Platforma', 
-                    y='Liczba zadań', 
-                    color='Kwartał', 
-                    barmode='group',
-                    title='Zakończone Zadania według Platform i Kwartałów',
-                    labels={'Liczba zadań': 'Liczba Zadań', 'Platforma': 'Platforma / Kategoria'},
-                    color_discrete_map={
-                        'Q1 2025': '#2ecc71', 
-                        'Q2 2025': '#3498db'  
-                    },
-                    hover_data={'Kwartał': True, 'Liczba zadań': True, 'Platforma': False},
-                    template="plotly_white"
-                   ).update_layout(
-                       title_x=0.5, 
-                       font_size=14, 
-                       title_font_size=20,
-                       xaxis_title_font_size=16,
-                       yaxis_title_font_size=16,
-                       legend_title_font_size=14,
-                       legend_font_size=12
-                   )
-
-    # Przygotowanie danych dla wykresu rozkładu typów zadań (Issue Type Breakdown)
-    issue_type_data_filtered = []
-    current_q1_types = filtered_issue_type_breakdown.get('Q1 2025', {})
-    current_q2_types = filtered_issue_type_breakdown.get('Q2 2025', {})
-
-    # Zbierz wszystkie unikalne typy zadań zebrane przez categorize_and_filter_changes
-    all_issue_types_in_filtered_data = sorted(list(set(list(current_q1_types.keys()) + list(current_q2_types.keys()))))
-
-    for issue_type in all_issue_types_in_filtered_data:
-        issue_type_data_filtered.append({'Kwartał': 'Q1 2025', 'Typ Zadania': issue_type, 'Liczba': current_q1_types.get(issue_type, 0)})
-        issue_type_data_filtered.append({'Kwartał': 'Q2 2025', 'Typ Zadania': issue_type, 'Liczba': current_q2_types.get(issue_type, 0)})
-
-    df_issue_type_filtered = pd.DataFrame(issue_type_data_filtered)
-
-    fig_issue_type = px.bar(df_issue_type_filtered,
-                            x='Kwartał',
-                            y='Liczba',
-                            color='Typ Zadania',
-                            barmode='stack',
-                            title='Rozkład Zakończonych Zadań według Typu (Q1 vs Q2)',
-                            labels={'Liczba': 'Liczba Zadań', 'Typ Zadania': 'Typ Zadania'},
-                            template="plotly_white",
-                            hover_data={'Liczba': True, 'Kwartał': False, 'Typ Zadania': True}
-                           ).update_layout(
-                               title_x=0.5,
-                               font_size=14,
-                               title_font_size=20,
-                               xaxis_title_font_size=16,
-                               yaxis_title_font_size=16,
-                               legend_title_font_size=14,
-                               legend_font_size=12
-                           )
-    
-    return fig_2d, fig_issue_type, total_q1, total_q2, total_overall
+
+# --- Callback do aktualizacji analizy przepływu (czas cyklu, przepustowość) ---
+@app.callback(
+    Output('cycle-time-chart', 'figure'),
+    Output('throughput-chart', 'figure'),
+    Input('platform-filter', 'value'),
+    Input('assignee-filter', 'value'),
+    Input('source-filter', 'value')
+)
+@instrumented_callback('update_flow_charts')
+def update_flow_charts(selected_platform_value, selected_assignee_value, source_value=ALL_SOURCES):
+    return get_flow_charts(get_data_model(source_value), selected_platform_value, selected_assignee_value)
+
+
+# Ile zadań podrzędnych epika pokazujemy pod tabelą szczegółów
+EPIC_DESCENDANTS_LIMIT = 500
+
+def describe_epic_descendants(data_model, epic_keys, limit=None):
+    """
+    Zwraca linie tekstu z wszystkimi potomkami (na każdym poziomie) podanych epików.
+    Przy podanym limit pokazuje najwyżej tyle potomków na epik i dopisuje liczbę pominiętych.
+    """
+    lines = []
+    for epic_key in sorted(epic_keys):
+        descendant_details = data_model.descendant_details(epic_key)
+        if not descendant_details:
+            continue
+        lines.append(f"\n[{epic_key}] - zadania podrzędne ({len(descendant_details)}):")
+        lines.extend(f"    └ {detail}" for detail in descendant_details[:limit])
+        if limit is not None and len(descendant_details) > limit:
+            lines.append(f"    ... i {len(descendant_details) - limit} więcej")
+    return lines
+
+
+def get_clicked_group(clickData):
+    """
+    Zwraca (kwartał, platforma) słupka klikniętego na wykresie Platform.
+    """
+    point_data = clickData['points'][0]
+    return point_data['customdata'][0], point_data['x']
+
+
+def get_visible_details(data_model, clickData, selected_quarter_value, selected_platform_value,
+                        dimension_values=default_dimension_values, sort_by=None, search_text=''):
+    """
+    Zwraca (kwartał, platforma, wiersze szczegółów) dla klikniętego słupka, z uwzględnieniem
+    aktywnych filtrów. Gdy filtry wykluczają słupek, lista wierszy jest pusta.
+    """
+    quarter, platform = get_clicked_group(clickData)
+    platform_in_filter = selected_platform_value in (None, 'All Platforms') or selected_platform_value == platform
+    if not (platform_in_filter and quarter_in_filter(quarter, selected_quarter_value)):
+        return quarter, platform, data_model.details_index.empty
+
+    sort_column, sort_descending = None, False
+    if sort_by:
+        sort_column = sort_by[0]['column_id']
+        sort_descending = sort_by[0]['direction'] == 'desc'
+    rows = get_details_rows(
+        data_model, quarter, platform, tuple(dimension_values), sort_column, sort_descending, (search_text or '').strip()
+    )
+    return quarter, platform, rows
 
 
 # --- Callback do wyświetlania szczegółów po kliknięciu na słupek (tylko z wykresu 2D Platform) ---
@@ -472,35 +760,187 @@ def update_charts_and_kpis(selected_quarter_value, selected_platform_value):
     Output('click-data-output', 'children'),
     Input('changes-bar-chart-2d', 'clickData'),
     Input('quarter-filter', 'value'), # Potrzebne do odświeżenia szczegółów po zmianie filtra
-    Input('platform-filter', 'value') # Potrzebne do odświeżenia szczegółów po zmianie filtra
+    Input('platform-filter', 'value'), # Potrzebne do odświeżenia szczegółów po zmianie filtra
+    *[Input(component_id, 'value') for _, component_id, _ in dimension_filters],
+    Input('source-filter', 'value')
 )
-def display_click_data(clickData, selected_quarter_value, selected_platform_value):
-    # Wczytujemy dane ponownie z uwzględnieniem aktywnych filtrów,
-    # aby szczegóły wyświetlały tylko to, co jest faktycznie przefiltrowane
-    current_categorized_results, _ = categorize_and_filter_changes(
-        df_raw_global, selected_quarter=selected_quarter_value, selected_platform=selected_platform_value
-    )
-
+@instrumented_callback('display_click_data')
+def display_click_data(clickData, selected_quarter_value, selected_platform_value,
+                       assignee_value, sprint_value, issue_type_value, issue_color_value,
+                       source_value=ALL_SOURCES):
     if clickData is None:
         return "Kliknij na słupek na wykresie Platform, aby zobaczyć szczegóły zadań."
-    
-    point_data = clickData['points'][0]
-    platform = point_data['x']
-    quarter = point_data['customdata'][0] 
-
-    details_key = f"Details {quarter}"
-    
-    details_list = []
-    # Używamy current_categorized_results, aby szczegóły były zgodne z filtrami
-    if details_key in current_categorized_results and platform in current_categorized_results[details_key]:
-        details_list = current_categorized_results[details_key][platform]
-
-    if details_list:
-        return f"Szczegóły zadań dla {platform} w {quarter}:\n\n" + "\n".join(sorted(list(set(details_list))))
+
+    quarter, platform, rows = get_visible_details(
+        get_data_model(source_value), clickData, selected_quarter_value, selected_platform_value,
+        (assignee_value, sprint_value, issue_type_value, issue_color_value)
+    )
+    if len(rows):
+        return f"Szczegóły zadań dla {platform} w {quarter} ({len(rows)} zadań):"
     else:
         return f"Brak szczegółów zadań dla {platform} w {quarter}."
 
 
+# --- Callback stronicowania, sortowania i wyszukiwania w tabeli szczegółów ---
+@app.callback(
+    Output('details-table', 'data'),
+    Output('details-table', 'page_count'),
+    Output('details-table', 'page_current'),
+    Output('details-table', 'active_cell'),
+    Input('changes-bar-chart-2d', 'clickData'),
+    Input('quarter-filter', 'value'),
+    Input('platform-filter', 'value'),
+    *[Input(component_id, 'value') for _, component_id, _ in dimension_filters],
+    Input('details-search', 'value'),
+    Input('details-table', 'page_current'),
+    Input('details-table', 'sort_by'),
+    Input('source-filter', 'value'),
+    State('details-table', 'page_size')
+)
+@instrumented_callback('update_details_table')
+def update_details_table(clickData, selected_quarter_value, selected_platform_value,
+                         assignee_value, sprint_value, issue_type_value, issue_color_value,
+                         search_text, page_current, sort_by, source_value, page_size):
+    if clickData is None:
+        return [], 0, 0, None
+
+    _, _, rows = get_visible_details(
+        get_data_model(source_value), clickData, selected_quarter_value, selected_platform_value,
+        (assignee_value, sprint_value, issue_type_value, issue_color_value), sort_by, search_text
+    )
+    page_count = max(1, -(-len(rows) // page_size))
+    # Nowy słupek, filtr, wyszukiwanie lub sortowanie - wracamy na pierwszą stronę
+    if 'details-table.page_current' not in ctx.triggered_prop_ids:
+        page_current = 0
+    page_current = min(page_current or 0, page_count - 1)
+
+    page_rows = rows.iloc[page_current * page_size:(page_current + 1) * page_size]
+    return page_rows[['Key', 'Summary', 'Issue Type']].to_dict('records'), page_count, page_current, None
+
+
+# --- Callback do wyświetlania potomków epika zaznaczonego w tabeli szczegółów ---
+@app.callback(
+    Output('epic-descendants-output', 'children'),
+    Input('details-table', 'active_cell'),
+    State('details-table', 'data'),
+    State('source-filter', 'value')
+)
+@instrumented_callback('display_epic_descendants')
+def display_epic_descendants(active_cell, table_data, source_value=ALL_SOURCES):
+    if active_cell is None or not table_data or active_cell['row'] >= len(table_data):
+        return "Zaznacz epik w tabeli, aby zobaczyć wszystkie zadania podrzędne."
+
+    row = table_data[active_cell['row']]
+    if row['Issue Type'] != 'Epic':
+        return f"[{row['Key']}] nie jest epikiem."
+    lines = describe_epic_descendants(get_data_model(source_value), [row['Key']], limit=EPIC_DESCENDANTS_LIMIT)
+    if not lines:
+        return f"[{row['Key']}] nie ma zadań podrzędnych."
+    return "\n".join(lines).lstrip("\n")
+
+
+# --- Podgląd liczników cache (trafienia/chybienia) ---
+@app.server.route('/cache-stats')
+def cache_stats():
+    stats = {'payloads': payload_cache_stats(), 'flow': flow_cache_stats(), 'details': details_cache_stats()}
+    if shared_result_cache is not None:
+        stats['shared'] = shared_result_cache.stats()
+    return stats
+
+
+# --- Rozmiar kostki OLAP aktualnego modelu (budżet pamięci) ---
+@app.server.route('/cube-stats')
+def cube_stats():
+    return data_model_global.cube.memory_report()
+
+
+# --- Stan magazynu zadań (rewizja, ostatnia delta, liczniki kategoryzacji) ---
+@app.server.route('/store-stats')
+def store_stats():
+    if issue_store is None:
+        return Response("Magazyn zadań jest wyłączony - ustaw JIRA_ISSUE_STORE.\n", status=404, mimetype='text/plain')
+    return issue_store.stats()
+
+
+# --- Instrumentacja (JIRA_INSTRUMENTATION=1): /metrics w formacie Prometheusa i profilowanie ---
+def collect_cache_metrics():
+    caches = {'payloads': payload_cache_stats(), 'flow': flow_cache_stats(), 'details': details_cache_stats()}
+    if shared_result_cache is not None:
+        caches['shared'] = shared_result_cache.stats()
+    return [
+        ('jira_cache_hits_total', 'counter', 'Trafienia cache wyników.',
+         [({'cache': name}, stats['hits']) for name, stats in caches.items()]),
+        ('jira_cache_misses_total', 'counter', 'Chybienia cache wyników.',
+         [({'cache': name}, stats['misses']) for name, stats in caches.items()]),
+        ('jira_cache_entries', 'gauge', 'Liczba wpisów w cache wyników.',
+         [({'cache': name}, stats['size']) for name, stats in caches.items()]),
+        ('jira_categorized_rows', 'gauge', 'Liczba wierszy tabeli skategoryzowanych zadań aktualnego modelu.',
+         [({}, data_model_global.categorized_rows)])
+    ]
+
+
+if instrumentation_enabled:
+    stage_metrics.add_collector(collect_cache_metrics)
+
+    # Czas całego żądania callbacku (z serializacją odpowiedzi przez Dash) - różnica względem
+    # czasu samego callbacku to narzut serializacji i HTTP
+    @app.server.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+
+    @app.server.after_request
+    def record_request_time(response):
+        if request.path == '/_dash-update-component' and 'request_start' in g:
+            stage_metrics.record('http_dash_update_component', time.perf_counter() - g.request_start)
+        return response
+
+    @app.server.route('/metrics')
+    def metrics():
+        return Response(stage_metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    # /profile?requests=N profiluje N kolejnych wywołań callbacków; /profile/report zwraca
+    # raport najwolniejszego z nich
+    @app.server.route('/profile')
+    def profile():
+        if 'requests' in request.args:
+            profile_sampler.arm(request.args.get('requests', type=int) or 0)
+        return profile_sampler.status()
+
+    @app.server.route('/profile/report')
+    def profile_report():
+        slowest = profile_sampler.slowest
+        if slowest is None:
+            return Response("Brak profilu - uzbrój profilowanie przez /profile?requests=N.\n",
+                            status=404, mimetype='text/plain')
+        header = f"{slowest['callback']}: {slowest['seconds']} s ({slowest['profiler']}, {slowest['timestamp']})\n\n"
+        return Response(header + slowest['report'], mimetype='text/plain')
+
+
+# Hot reload włączany przez JIRA_RELOAD_INTERVAL (sekundy między sprawdzeniami katalogu)
+reload_interval = float(os.environ.get('JIRA_RELOAD_INTERVAL', '0'))
+
+
+def start_reload_watcher(on_reload=None):
+    """
+    Uruchamia watcher eksportów, jeśli hot reload jest włączony. Zwraca Event zatrzymujący go albo None.
+    """
+    if reload_interval > 0:
+        return start_export_watcher(reload_interval, on_reload)
+    return None
+
+
+# Przy preload_app (gunicorn.conf.py) jedyny watcher działa w procesie głównym gunicorn
+# (hook when_ready) i po przeładowaniu danych restartuje workery, które dziedziczą nowy model
+if os.environ.get('JIRA_PRELOAD_APP') != '1':
+    export_watcher_stop = start_reload_watcher()
+
+
 # --- 4. Uruchomienie serwera aplikacji ---
+# Tryb produkcyjny: serwer WSGI, np. gunicorn -c gunicorn.conf.py analiza_jira_app:server
+server = app.server
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    if os.environ.get('WARM_FIGURE_CACHE') == '1':
+        warm_result_cache()
+    # Reloader Werkzeuga importuje moduł w dwóch procesach - z hot reloadem działałyby dwa watchery
+    app.run(debug=True, use_reloader=reload_interval <= 0)
\ No newline at end of file
@@ -0,0 +1,142 @@
+/*
+ * Callbacki wykonywane w przeglądarce: zmiana filtra kwartału lub platformy przelicza KPI
+ * i oba wykresy z agregatów przesłanych raz w aggregate-store (build_aggregate_payload),
+ * bez zapytania do serwera. Logika odpowiada aggregate_cube i build_charts_and_kpis
+ * z pakietu analiza_jira, a wygląd wykresów pochodzi z build_chart_templates.
+ */
+(function () {
+    // Odpowiedniki get_quarters_in_scope i quarter_in_filter z analiza_jira.core
+    function quartersInScope(quarters, selectedQuarter) {
+        if (selectedQuarter === null || selectedQuarter === undefined || selectedQuarter === 'All') {
+            return quarters.slice();
+        }
+        var year = selectedQuarter.split(' ').pop();
+        return quarters.filter(function (q) { return q.split(' ').pop() === year; });
+    }
+
+    function quarterInFilter(quarter, selectedQuarter) {
+        if (selectedQuarter === null || selectedQuarter === undefined || selectedQuarter === 'All') {
+            return true;
+        }
+        if (selectedQuarter.indexOf('All ') === 0) {
+            return quarter.slice(-4) === selectedQuarter.split(' ').pop();
+        }
+        return quarter === selectedQuarter;
+    }
+
+    function sum(values) {
+        return values.reduce(function (total, value) { return total + value; }, 0);
+    }
+
+    // Odpowiednik aggregate_cube: liczby zadań na platformę i rozkład typów dla kwartałów z zakresu
+    function aggregatePayload(payload, selectedQuarter, selectedPlatform) {
+        var platformSelected = payload.platforms.map(function (p) {
+            return selectedPlatform === null || selectedPlatform === undefined ||
+                selectedPlatform === 'All Platforms' || p === selectedPlatform;
+        });
+        var quarters = quartersInScope(payload.quarters, selectedQuarter);
+        var counts = {};
+        var breakdown = {};
+        quarters.forEach(function (quarter) {
+            breakdown[quarter] = {};
+            // Pojedynczy kwartał w filtrze: pozostałe kwartały roku zostają na osi z zerami
+            if (!quarterInFilter(quarter, selectedQuarter)) {
+                counts[quarter] = payload.platforms.map(function () { return 0; });
+                return;
+            }
+            counts[quarter] = payload.counts[quarter].map(function (n, i) { return platformSelected[i] ? n : 0; });
+            Object.keys(payload.issue_type_counts[quarter]).forEach(function (issueType) {
+                var n = sum(payload.issue_type_counts[quarter][issueType].map(function (v, i) {
+                    return platformSelected[i] ? v : 0;
+                }));
+                if (n) {
+                    breakdown[quarter][issueType] = n;
+                }
+            });
+        });
+        return {platforms: payload.platforms, quarters: quarters, counts: counts, breakdown: breakdown};
+    }
+
+    function clone(value) {
+        return JSON.parse(JSON.stringify(value));
+    }
+
+    // Seria wykresu ze szkieletu z build_chart_templates (te same pola co w Plotly Express)
+    function buildTrace(skeleton, name, color, x, y) {
+        var trace = clone(skeleton);
+        trace.name = name;
+        trace.legendgroup = name;
+        if ('offsetgroup' in trace) {
+            trace.offsetgroup = name;
+        }
+        trace.customdata = x.map(function () { return [name]; });
+        trace.marker.color = color;
+        trace.x = x;
+        trace.y = y;
+        return trace;
+    }
+
+    function chartLayout(template, traces) {
+        var layout = clone(template);
+        if (!traces.length) {
+            // Plotly Express bez danych nie ustawia tytułu legendy
+            delete layout.legend.title.text;
+        }
+        return layout;
+    }
+
+    // Odpowiednik build_charts_and_kpis
+    function buildChartsAndKpis(aggregates, kpiQuarters, templates) {
+        var quarters = aggregates.quarters;
+        var counts = aggregates.counts;
+        var breakdown = aggregates.breakdown;
+        var platforms = aggregates.platforms;
+        var colorway = templates.colorway;
+
+        var totalQ1 = sum(counts[kpiQuarters[0]] || []);
+        var totalQ2 = sum(counts[kpiQuarters[1]] || []);
+        var totalOverall = sum(quarters.map(function (q) { return sum(counts[q]); }));
+
+        // Stałe kolory kwartałów roku mają sens tylko w obrębie jednego roku
+        var years = {};
+        quarters.forEach(function (q) { years[q.split(' ').pop()] = true; });
+        var singleYear = Object.keys(years).length === 1;
+        var platformTraces = quarters.map(function (quarter, i) {
+            var color = singleYear ? templates.quarter_colors[quarter.split(' ')[0]] : colorway[i % colorway.length];
+            return buildTrace(templates.platform_trace, quarter, color, platforms, counts[quarter]);
+        });
+
+        var issueTypes = {};
+        quarters.forEach(function (q) {
+            Object.keys(breakdown[q]).forEach(function (issueType) { issueTypes[issueType] = true; });
+        });
+        var issueTypeTraces = Object.keys(issueTypes).sort().map(function (issueType, i) {
+            return buildTrace(
+                templates.issue_type_trace, issueType, colorway[i % colorway.length], quarters,
+                quarters.map(function (q) { return breakdown[q][issueType] || 0; })
+            );
+        });
+
+        var issueTypeLayout = chartLayout(templates.issue_type_layout, issueTypeTraces);
+        issueTypeLayout.title.text = 'Rozkład Zakończonych Zadań według Typu (' + quarters.join(' vs ') + ')';
+        return [
+            {data: platformTraces, layout: chartLayout(templates.platform_layout, platformTraces)},
+            {data: issueTypeTraces, layout: issueTypeLayout},
+            totalQ1,
+            totalQ2,
+            totalOverall
+        ];
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        jira: {
+            updateChartsAndKpis: function (selectedQuarter, selectedPlatform, payload, templates) {
+                if (!payload || !templates) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                var aggregates = aggregatePayload(payload, selectedQuarter, selectedPlatform);
+                return buildChartsAndKpis(aggregates, payload.kpi_quarters, templates);
+            }
+        }
+    });
+})();
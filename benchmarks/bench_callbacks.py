@@ -0,0 +1,56 @@
+"""
+Koszt zmiany filtra kwartału/platformy po stronie serwera: dawny callback update_charts_and_kpis
+(agregacja + budowa figur Plotly Express przy każdej zmianie) wobec agregatów wysyłanych raz
+do przeglądarki (update_aggregate_store), z których wykresy przelicza callback w przeglądarce.
+
+Uruchomienie z katalogu repozytorium:
+    python benchmarks/bench_callbacks.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analiza_jira_app as jira_app  # noqa: E402
+from analiza_jira.charts import build_charts_and_kpis  # noqa: E402
+from analiza_jira.core import aggregate_cube, build_aggregate_payload  # noqa: E402
+
+
+def server_side_callback(selected_quarter, selected_platform):
+    # Ścieżka sprzed callbacków w przeglądarce: agregacja + budowa figur przy każdej zmianie filtra
+    data_model = jira_app.data_model_global
+    categorized_results, issue_type_breakdown = aggregate_cube(
+        data_model.cube, data_model.quarters, selected_quarter, selected_platform
+    )
+    return build_charts_and_kpis(categorized_results, issue_type_breakdown, data_model.kpi_quarters)
+
+
+def run(repeat=5, number=20):
+    data_model = jira_app.data_model_global
+    quarter_options = jira_app.build_quarter_filter_options(data_model.quarters)
+    combinations = [(o['value'], p) for o in quarter_options for p in jira_app.platform_filter_values]
+
+    def all_server_side():
+        for q, p in combinations:
+            server_side_callback(q, p)
+
+    def payload():
+        return build_aggregate_payload(data_model.cube, data_model.quarters)
+
+    payload_bytes = len(json.dumps(payload()))
+    figure_bytes = sum(len(json.dumps(server_side_callback(q, p)[:2])) for q, p in combinations)
+    results = {
+        'przed (serwer, zmiana filtra)': min(timeit.repeat(all_server_side, repeat=repeat, number=1)) / len(combinations),
+        'po (agregaty, raz na widok)': min(timeit.repeat(payload, repeat=repeat, number=number)) / number,
+    }
+    for label, seconds in results.items():
+        print(f"{label:>30}: {seconds * 1e6:.1f} µs")
+    print(f"Przesyłane dane: figury dla {len(combinations)} kombinacji {figure_bytes / 1024:.0f} KiB, "
+          f"agregaty {payload_bytes / 1024:.1f} KiB")
+    return results
+
+
+if __name__ == '__main__':
+    run()
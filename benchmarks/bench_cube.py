@@ -0,0 +1,68 @@
+"""
+Pomiar budowy kostki OLAP (OlapCube), czasu odczytu komórki i budżetu pamięci
+dla syntetycznej tabeli skategoryzowanych zadań o zadanych licznościach wymiarów.
+
+Uruchomienie z katalogu repozytorium:
+    python benchmarks/bench_cube.py [liczba_zadań] [osoby] [sprinty] [typy] [kolory]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analiza_jira import core  # noqa: E402
+
+
+def generate_categorized_issues(n_issues, assignees, sprints, issue_types, colors, n_quarters=8, seed=0):
+    """
+    Tabela w formacie build_categorized_issues (kolumny kostki) z losowymi wartościami wymiarów.
+    """
+    rng = np.random.default_rng(seed)
+    keys = np.array([f"TPD-{i}" for i in range(n_issues)], dtype=object)
+    quarters = np.array([f"Q{q % 4 + 1} {2020 + q // 4}" for q in range(n_quarters)], dtype=object)
+    platforms = np.array(core.all_platforms_for_display, dtype=object)
+
+    def pick(prefix, cardinality):
+        values = np.array([f"{prefix} {i}" for i in range(cardinality)], dtype=object)
+        return values[rng.integers(0, cardinality, size=n_issues)]
+
+    return pd.DataFrame({
+        'Key': keys,
+        'Detail': "[" + keys + "]",
+        'Quarter': quarters[rng.integers(0, n_quarters, size=n_issues)],
+        'Platforma': platforms[rng.integers(0, len(platforms), size=n_issues)],
+        'Assignee': pick('Osoba', assignees),
+        'Sprint': pick('Sprint', sprints),
+        'Issue Type': pick('Typ', issue_types),
+        'Issue color': pick('Kolor', colors)
+    })
+
+
+def run(n_issues=100_000, assignees=50, sprints=26, issue_types=6, colors=11):
+    categorized_issues = generate_categorized_issues(n_issues, assignees, sprints, issue_types, colors)
+
+    start = time.perf_counter()
+    cube = core.OlapCube(categorized_issues)
+    build_seconds = time.perf_counter() - start
+
+    filters = {'Assignee': 'Osoba 1', 'Issue Type': 'Typ 2'}
+    n_lookups = 100_000
+    start = time.perf_counter()
+    for _ in range(n_lookups):
+        cube.count('Q1 2020', core.all_platforms_for_display[0], filters)
+    lookup_seconds = (time.perf_counter() - start) / n_lookups
+
+    report = cube.memory_report()
+    print(f"zadania: {n_issues}, liczności wymiarów: {report['dimensions']}")
+    print(f"budowa kostki: {build_seconds:.3f} s")
+    print(f"odczyt komórki: {lookup_seconds * 1e6:.2f} µs")
+    print(f"komórki niepuste: {report['cells']} (gęsta kostka: {report['dense_cells']})")
+    print(f"pamięć: {report['estimated_bytes'] / 2**20:.1f} MiB ({report['bytes_per_cell']} B / komórkę)")
+
+
+if __name__ == '__main__':
+    run(*(int(arg) for arg in sys.argv[1:6]))
@@ -0,0 +1,72 @@
+"""
+Odświeżenie danych po zmianie części zadań: pełny eksport CSV wczytywany ponownie
+(load_data_model z poprzednim modelem) wobec delty zastosowanej w magazynie SQLite
+(IssueStore.apply_delta_file) i modelu odświeżonego z magazynu (load_store_model).
+
+Uruchomienie z katalogu repozytorium:
+    python benchmarks/bench_delta_store.py [liczba_wierszy] [rozmiary delt...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analiza_jira.core import load_data_model  # noqa: E402
+from analiza_jira.issue_store import IssueStore, load_store_model  # noqa: E402
+from generate_export import generate_jira_export  # noqa: E402
+
+
+def make_delta(df_export, n_changed, rng):
+    """
+    n_changed losowych zadań z eksportu z nowym tytułem (inna platforma) i statusem Done.
+    """
+    delta = df_export.iloc[rng.choice(len(df_export), n_changed, replace=False)].copy()
+    delta['Summary'] = 'Umpire ' + delta['Summary'].fillna('')
+    delta['Status'] = 'Done'
+    return delta
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def run(n_rows=100_000, delta_sizes=(10, 100, 1000)):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as work_dir:
+        export_path = generate_jira_export(n_rows, os.path.join(work_dir, 'export.csv'))
+        df_export = pd.read_csv(export_path, dtype=str)
+        csv_model = load_data_model(export_path)
+
+        store = IssueStore(os.path.join(work_dir, 'store.sqlite'))
+        _, import_seconds = timed(lambda: store.apply_delta_file(export_path))
+        store_model, load_seconds = timed(lambda: load_store_model(store))
+        print(f"zadania: {n_rows}, import do magazynu: {import_seconds:.2f} s, "
+              f"model z magazynu: {load_seconds:.2f} s")
+        print(f"{'delta':>8} {'pełny CSV':>10} {'delta SQLite':>13} {'model z magazynu':>17}")
+
+        for n_changed in delta_sizes:
+            delta = make_delta(df_export, n_changed, rng)
+            delta_path = os.path.join(work_dir, f'delta_{n_changed}.csv')
+            delta.to_csv(delta_path, index=False)
+
+            # Dotychczasowa ścieżka: nowy pełny eksport z tymi samymi zmianami
+            df_export = df_export.set_index('Key')
+            df_export.loc[delta['Key']] = delta.set_index('Key')
+            df_export = df_export.reset_index()
+            df_export.to_csv(export_path, index=False)
+            csv_model, csv_seconds = timed(lambda: load_data_model(export_path, previous_model=csv_model))
+
+            _, apply_seconds = timed(lambda: store.apply_delta_file(delta_path))
+            store_model, refresh_seconds = timed(lambda: load_store_model(store, previous_model=store_model))
+            print(f"{n_changed:>8} {csv_seconds:>9.2f}s {apply_seconds:>12.2f}s {refresh_seconds:>16.2f}s")
+
+
+if __name__ == '__main__':
+    run(*(int(arg) for arg in sys.argv[1:2]), *([tuple(int(arg) for arg in sys.argv[2:])] if sys.argv[2:] else []))
@@ -0,0 +1,60 @@
+"""
+Pomiar budowy indeksu hierarchii (IssueHierarchy) i zapytań o potomków epika
+na syntetycznej, głębokiej hierarchii zadań.
+
+Uruchomienie z katalogu repozytorium:
+    python benchmarks/bench_hierarchy.py [liczba_zadań] [głębokość]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analiza_jira import core  # noqa: E402
+
+
+def generate_hierarchy(n_issues, depth, n_epics=1000, seed=0):
+    """
+    Zwraca (klucze, klucze rodziców, rangi): n_epics drzew, w których każde zadanie
+    na poziomie d > 0 ma losowego rodzica z poziomu d - 1.
+    """
+    rng = np.random.default_rng(seed)
+    keys = np.array([f"TPD-{i}" for i in range(n_issues)], dtype=object)
+    level = np.minimum(np.arange(n_issues) // n_epics, depth - 1)
+    parents = np.full(n_issues, None, dtype=object)
+    for d in range(1, depth):
+        on_level = np.flatnonzero(level == d)
+        previous_level = np.flatnonzero(level == d - 1)
+        parents[on_level] = keys[rng.choice(previous_level, size=on_level.size)]
+    ranks = rng.integers(0, core.platform_rules.default_rank + 1, size=n_issues)
+    return keys, parents, ranks
+
+
+def run(n_issues=1_000_000, depth=50):
+    keys, parents, ranks = generate_hierarchy(n_issues, depth)
+
+    start = time.perf_counter()
+    hierarchy = core.IssueHierarchy(keys, parents, ranks, core.platform_rules.default_rank)
+    build_seconds = time.perf_counter() - start
+
+    epic_positions = np.arange(10)
+    start = time.perf_counter()
+    descendant_counts = [hierarchy.descendants([p]).size for p in epic_positions]
+    query_seconds = (time.perf_counter() - start) / len(epic_positions)
+
+    start = time.perf_counter()
+    hierarchy.parent_ranks(parents)
+    parent_rank_seconds = time.perf_counter() - start
+
+    print(f"zadania: {n_issues}, głębokość: {depth}")
+    print(f"budowa indeksu: {build_seconds:.3f} s")
+    print(f"potomkowie epika: {query_seconds * 1000:.3f} ms / zapytanie "
+          f"(średnio {np.mean(descendant_counts):.0f} potomków)")
+    print(f"rangi dziedziczone dla wszystkich zadań: {parent_rank_seconds:.3f} s")
+
+
+if __name__ == '__main__':
+    run(*(int(arg) for arg in sys.argv[1:3]))
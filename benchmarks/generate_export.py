@@ -0,0 +1,120 @@
+"""
+Generator syntetycznych eksportów Jira o tych samych kolumnach co eksport produkcyjny:
+klucze TPD-N, epiki z zadaniami podrzędnymi (także wielopoziomowo), słowa kluczowe platform
+w tytułach, osoby, sprinty i daty w formacie RRRR/MM/DD.
+
+Uruchomienie z katalogu repozytorium:
+    python benchmarks/generate_export.py liczba_wierszy plik.csv [ziarno]
+"""
+import csv
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analiza_jira import core  # noqa: E402
+
+export_columns = [
+    'Key', 'Issue Type', 'Parent', 'Summary', 'Status', 'Assignee', 'Sprint',
+    'Start date', 'Inferred start date', 'Due date', 'Inferred due date', 'Issue color'
+]
+
+# Rozkłady wartości zbliżone do eksportu produkcyjnego
+issue_types = ['Epic', 'Story', 'Bug', 'Service Bug', 'Service request', 'Ticket']
+issue_type_weights = [0.03, 0.45, 0.20, 0.10, 0.10, 0.12]
+statuses = ['Done', 'In Progress', 'Backlog', 'In Review', 'To Do', 'Ready to Deploy']
+status_weights = [0.55, 0.10, 0.15, 0.05, 0.10, 0.05]
+issue_colors = ['dark_blue', 'purple', 'yellow', 'dark_purple', 'grey', 'blue', 'green', 'teal', 'orange', 'red']
+summary_words = [
+    'Implementacja', 'Migracja', 'Poprawka', 'Aktualizacja', 'Refaktoryzacja', 'Integracja',
+    'player', 'logowania', 'płatności', 'CDN', 'API', 'statystyk', 'katalogu', 'powiadomień'
+]
+
+GENERATOR_CHUNK_ROWS = 1_000_000
+
+
+def generate_chunk(rng, first_index, n_rows, epic_indices, story_indices, n_assignees=50, n_sprints=52):
+    """
+    Zwraca DataFrame z n_rows wierszami eksportu o kluczach od TPD-(first_index + 1).
+    Rodzice wskazują epiki (i historie - drugi poziom) z wcześniejszych porcji lub z tej samej porcji.
+    """
+    index = np.arange(first_index, first_index + n_rows)
+    keys = np.char.add('TPD-', (index + 1).astype(str)).astype(object)
+    issue_type = np.array(issue_types, dtype=object)[rng.choice(len(issue_types), n_rows, p=issue_type_weights)]
+    is_epic = issue_type == 'Epic'
+
+    # Epiki i historie tej porcji mogą być rodzicami zadań z tej samej porcji (klucze są unikalne)
+    epic_indices = np.concatenate([epic_indices, index[is_epic]])
+    story_indices = np.concatenate([story_indices, index[issue_type == 'Story']])
+
+    parent = np.full(n_rows, '', dtype=object)
+    parent_draw = rng.random(n_rows)
+    to_epic = ~is_epic & (parent_draw < 0.6) & (len(epic_indices) > 0)
+    to_story = ~is_epic & (issue_type != 'Story') & (parent_draw >= 0.6) & (parent_draw < 0.7) & (len(story_indices) > 0)
+    if to_epic.any():
+        parent[to_epic] = np.char.add('TPD-', (rng.choice(epic_indices, to_epic.sum()) + 1).astype(str))
+    if to_story.any():
+        parent[to_story] = np.char.add('TPD-', (rng.choice(story_indices, to_story.sum()) + 1).astype(str))
+
+    # Tytuły: dwa słowa i numer, u części zadań ze słowem kluczowym platformy
+    keywords = np.array([''] + [f'[{keyword}] ' for keyword in core.platform_rules.keyword_ranks], dtype=object)
+    keyword_weights = np.array([0.55] + [0.45 / (len(keywords) - 1)] * (len(keywords) - 1))
+    words = np.array(summary_words, dtype=object)
+    summary = (
+        keywords[rng.choice(len(keywords), n_rows, p=keyword_weights)]
+        + words[rng.integers(0, len(words), n_rows)] + ' '
+        + words[rng.integers(0, len(words), n_rows)] + ' '
+        + rng.integers(1, 1000, n_rows).astype(str).astype(object)
+    )
+
+    status = np.array(statuses, dtype=object)[rng.choice(len(statuses), n_rows, p=status_weights)]
+    assignees = np.array([f'Osoba {i}' for i in range(n_assignees)], dtype=object)
+    assignee = np.where(rng.random(n_rows) < 0.25, '', assignees[rng.integers(0, n_assignees, n_rows)])
+    sprints = np.array([f'TPD {i}' for i in range(1, n_sprints + 1)], dtype=object)
+    sprint = np.where(rng.random(n_rows) < 0.4, '', sprints[rng.integers(0, n_sprints, n_rows)])
+
+    # Daty zakończenia z dwóch lat, rozpoczęcie 1-60 dni wcześniej; część dat pusta
+    due = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 730, n_rows), unit='D')
+    start = due - pd.to_timedelta(rng.integers(1, 61, n_rows), unit='D')
+    due_text = np.where(rng.random(n_rows) < 0.9, due.strftime('%Y/%m/%d').to_numpy(dtype=object), '')
+    start_text = np.where(rng.random(n_rows) < 0.6, start.strftime('%Y/%m/%d').to_numpy(dtype=object), '')
+
+    chunk = pd.DataFrame({
+        'Key': keys,
+        'Issue Type': issue_type,
+        'Parent': parent,
+        'Summary': summary,
+        'Status': status,
+        'Assignee': assignee,
+        'Sprint': sprint,
+        'Start date': start_text,
+        'Inferred start date': start_text,
+        'Due date': due_text,
+        'Inferred due date': due_text,
+        'Issue color': np.array(issue_colors, dtype=object)[rng.integers(0, len(issue_colors), n_rows)]
+    }, columns=export_columns)
+    return chunk, epic_indices, story_indices
+
+
+def generate_jira_export(n_rows, file_path, seed=0):
+    """
+    Zapisuje syntetyczny eksport n_rows wierszy do file_path. Plik jest pisany porcjami,
+    więc generowanie 10 mln wierszy nie wymaga trzymania całego eksportu w pamięci.
+    """
+    rng = np.random.default_rng(seed)
+    epic_indices = np.array([], dtype=int)
+    story_indices = np.array([], dtype=int)
+    for first_index in range(0, n_rows, GENERATOR_CHUNK_ROWS):
+        chunk, epic_indices, story_indices = generate_chunk(
+            rng, first_index, min(GENERATOR_CHUNK_ROWS, n_rows - first_index), epic_indices, story_indices
+        )
+        chunk.to_csv(file_path, mode='w' if first_index == 0 else 'a', header=first_index == 0,
+                     index=False, quoting=csv.QUOTE_ALL)
+    return file_path
+
+
+if __name__ == '__main__':
+    generate_jira_export(int(sys.argv[1]), sys.argv[2], *(int(arg) for arg in sys.argv[3:4]))
@@ -0,0 +1,121 @@
+"""
+Test obciążeniowy trybu produkcyjnego: uruchamia aplikację pod gunicorn (gunicorn.conf.py)
+z 1 i N workerami, obciąża ją scenariuszem locustfile.py i porównuje liczbę żądań na sekundę
+oraz czasy odpowiedzi. Wymaga pakietów gunicorn i locust.
+
+Uruchomienie z katalogu repozytorium:
+    python benchmarks/load_test.py [--workers 1 4] [--users 20] [--duration 30s]
+"""
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+repo_dir = os.path.dirname(benchmarks_dir)
+
+SERVER_START_TIMEOUT = 300
+
+
+def wait_for_server(url, process, timeout=SERVER_START_TIMEOUT):
+    """
+    Czeka, aż serwer odpowie na url (wczytanie eksportu przy starcie może chwilę potrwać).
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn zakończył działanie z kodem {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=5):
+                return
+        except OSError:
+            time.sleep(1)
+    raise TimeoutError(f"Serwer nie odpowiedział w ciągu {timeout} s: {url}")
+
+
+def read_locust_totals(csv_prefix):
+    """
+    Wiersz 'Aggregated' ze statystyk locust: żądania/s, błędy i percentyle czasu odpowiedzi.
+    """
+    with open(csv_prefix + '_stats.csv', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if row['Name'] == 'Aggregated':
+                return {
+                    'requests': int(row['Request Count']),
+                    'failures': int(row['Failure Count']),
+                    'requests_per_second': round(float(row['Requests/s']), 2),
+                    'median_ms': float(row['Median Response Time']),
+                    'p95_ms': float(row['95%'])
+                }
+    raise ValueError(f"Brak wiersza 'Aggregated' w '{csv_prefix}_stats.csv'")
+
+
+def run_load_test(workers, users, duration, port):
+    """
+    Uruchamia gunicorn z podaną liczbą workerów (z nowym katalogiem współdzielonego cache),
+    wykonuje scenariusz locust i zwraca zagregowane wyniki.
+    """
+    host = f'http://127.0.0.1:{port}'
+    cache_dir = tempfile.TemporaryDirectory(prefix='analiza_jira_cache_')
+    env = dict(os.environ, JIRA_WORKERS=str(workers), JIRA_BIND=f'127.0.0.1:{port}',
+               JIRA_SHARED_CACHE_DIR=cache_dir.name)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'analiza_jira_app:server'],
+        cwd=repo_dir, env=env
+    )
+    try:
+        wait_for_server(host + '/_dash-layout', server)
+        with tempfile.TemporaryDirectory() as stats_dir:
+            csv_prefix = os.path.join(stats_dir, 'locust')
+            subprocess.run(
+                [sys.executable, '-m', 'locust', '-f', os.path.join(benchmarks_dir, 'locustfile.py'),
+                 '--headless', '-u', str(users), '-r', str(users), '-t', duration,
+                 '--host', host, '--csv', csv_prefix, '--only-summary'],
+                cwd=repo_dir, check=True
+            )
+            return read_locust_totals(csv_prefix)
+    finally:
+        server.terminate()
+        server.wait()
+        cache_dir.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Test obciążeniowy aplikacji pod gunicorn (1 vs N workerów).')
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, os.cpu_count() or 1],
+                        help='liczby workerów do porównania (domyślnie: 1 i liczba rdzeni)')
+    parser.add_argument('--users', type=int, default=20, help='liczba równoczesnych użytkowników locust')
+    parser.add_argument('--duration', default='30s', help='czas obciążenia dla każdej liczby workerów')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--results-dir', default=os.path.join(benchmarks_dir, 'results'),
+                        help='katalog na pliki wyników JSON')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for workers in args.workers:
+        print(f"Obciążenie: {workers} worker(ów), {args.users} użytkowników, {args.duration}...")
+        results[str(workers)] = run_load_test(workers, args.users, args.duration, args.port)
+
+    print(f"\n{'workery':>8} {'żądania/s':>10} {'mediana ms':>11} {'p95 ms':>8} {'błędy':>6}")
+    baseline = results[str(args.workers[0])]['requests_per_second']
+    for workers, totals in results.items():
+        speedup = f"  x{totals['requests_per_second'] / baseline:.2f}" if baseline else ''
+        print(f"{workers:>8} {totals['requests_per_second']:>10.1f} {totals['median_ms']:>11.0f} "
+              f"{totals['p95_ms']:>8.0f} {totals['failures']:>6}{speedup}")
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    results_path = os.path.join(args.results_dir, f"load_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'users': args.users,
+                   'duration': args.duration, 'results': results}, f, indent=2)
+    print(f"\nWyniki zapisano w '{results_path}'.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
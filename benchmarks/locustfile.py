@@ -0,0 +1,80 @@
+"""
+Scenariusz obciążenia aplikacji dla locust: użytkownik zmienia filtry osoby, sprintu
+i platformy, co wywołuje callbacki agregatów i analizy przepływu (jak przeglądarka).
+Zmiany kwartału/platformy na głównych wykresach obsługuje przeglądarka bez zapytań do serwera.
+
+Uruchamiany przez load_test.py albo bezpośrednio:
+    locust -f benchmarks/locustfile.py --headless -u 20 -r 20 -t 30s --host http://127.0.0.1:8050
+"""
+import random
+
+from locust import HttpUser, constant, task
+
+dimension_filter_ids = ['assignee-filter', 'sprint-filter', 'issue-type-filter', 'issue-color-filter']
+aggregate_outputs = [('aggregate-store', 'data')]
+flow_outputs = [('cycle-time-chart', 'figure'), ('throughput-chart', 'figure')]
+
+
+def find_dropdown_options(component, options_by_id):
+    """
+    Zbiera wartości opcji wszystkich dropdownów z layoutu Dash (JSON z /_dash-layout).
+    """
+    if isinstance(component, list):
+        for child in component:
+            find_dropdown_options(child, options_by_id)
+    elif isinstance(component, dict):
+        props = component.get('props', {})
+        if component.get('type') == 'Dropdown':
+            options_by_id[props['id']] = [option['value'] for option in props.get('options', [])]
+        find_dropdown_options(props.get('children'), options_by_id)
+    return options_by_id
+
+
+def build_update_request(outputs, inputs, changed_id):
+    """
+    Treść żądania /_dash-update-component dla callbacku z podanymi wyjściami i wejściami.
+    Dash rejestruje callback z jednym wyjściem jako 'id.prop' (bez kropek na brzegach)
+    i oczekuje wtedy słownika zamiast listy w 'outputs'.
+    """
+    output_specs = [{'id': component_id, 'property': prop} for component_id, prop in outputs]
+    if len(outputs) == 1:
+        output = '{}.{}'.format(*outputs[0])
+    else:
+        output = '..' + '...'.join(f'{component_id}.{prop}' for component_id, prop in outputs) + '..'
+    return {
+        'output': output,
+        'outputs': output_specs[0] if len(outputs) == 1 else output_specs,
+        'inputs': [{'id': component_id, 'property': 'value', 'value': value} for component_id, value in inputs],
+        'changedPropIds': [f'{changed_id}.value']
+    }
+
+
+class DashboardUser(HttpUser):
+    # Bez przerw między żądaniami - mierzymy maksymalną przepustowość serwera
+    wait_time = constant(0)
+
+    def on_start(self):
+        layout = self.client.get('/_dash-layout', name='/_dash-layout').json()
+        self.options = find_dropdown_options(layout, {})
+
+    @task(3)
+    def update_aggregates(self):
+        inputs = [
+            ('assignee-filter', random.choice(self.options['assignee-filter'][:5])),
+            ('sprint-filter', random.choice(self.options['sprint-filter'][:5]))
+        ]
+        inputs += [(component_id, 'All') for component_id in dimension_filter_ids[2:]]
+        inputs += [('source-filter', 'All Sources')]
+        self.client.post('/_dash-update-component',
+                         json=build_update_request(aggregate_outputs, inputs, 'assignee-filter'),
+                         name='update_aggregate_store')
+
+    @task(1)
+    def update_flow(self):
+        inputs = [
+            ('platform-filter', random.choice(self.options['platform-filter'])),
+            ('assignee-filter', random.choice(self.options['assignee-filter'][:5])),
+            ('source-filter', 'All Sources')
+        ]
+        self.client.post('/_dash-update-component', json=build_update_request(flow_outputs, inputs, 'platform-filter'),
+                         name='update_flow_charts')
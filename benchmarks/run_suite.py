@@ -0,0 +1,247 @@
+"""
+Zestaw benchmarków całego przetwarzania na syntetycznych eksportach (generate_export.py):
+wczytanie, kategoryzacja, agregacja, budowa figur i callbacki aplikacji, z czasem
+i szczytowym zużyciem pamięci każdego etapu. Wyniki trafiają do pliku JSON w katalogu
+wyników i są porównywane z poprzednim uruchomieniem.
+
+Uruchomienie z katalogu repozytorium:
+    python benchmarks/run_suite.py [--sizes 10000 100000 1000000 10000000] [--skip-memory]
+"""
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(benchmarks_dir))
+
+from analiza_jira import core  # noqa: E402
+from analiza_jira.charts import build_charts_and_kpis  # noqa: E402
+from generate_export import generate_jira_export  # noqa: E402
+
+benchmark_sizes = [10_000, 100_000, 1_000_000, 10_000_000]
+# Etap wolniejszy o ponad 20% niż w poprzednim uruchomieniu jest oznaczany jako regresja;
+# etapy krótsze niż REGRESSION_MIN_SECONDS pomijamy, bo ich pomiar to głównie szum
+REGRESSION_THRESHOLD = 1.2
+REGRESSION_MIN_SECONDS = 0.05
+
+
+def get_export_path(data_dir, n_rows):
+    """
+    Ścieżka syntetycznego eksportu n_rows wierszy; plik jest generowany tylko raz (stałe ziarno).
+    """
+    file_path = os.path.join(data_dir, f'synthetic_{n_rows}.csv')
+    if not os.path.exists(file_path):
+        os.makedirs(data_dir, exist_ok=True)
+        generate_jira_export(n_rows, file_path)
+    return file_path
+
+
+def run_pipeline(file_path, jira_app, track_memory=False):
+    """
+    Wykonuje kolejne etapy przetwarzania eksportu i zwraca {etap: {'seconds' | 'peak_mb': ...}}.
+    Przy track_memory mierzony jest szczyt pamięci etapu (tracemalloc) zamiast czasu, bo śledzenie
+    alokacji spowalnia obliczenia.
+    """
+    stages = {}
+    state = {}
+
+    def measure(stage, function):
+        gc.collect()
+        if track_memory:
+            # Szczyt ponad pamięć zajętą przed etapem (dane poprzednich etapów się nie liczą)
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            function()
+            stages[stage] = {'peak_mb': round((tracemalloc.get_traced_memory()[1] - baseline) / 2**20, 2)}
+        else:
+            start = time.perf_counter()
+            function()
+            stages[stage] = {'seconds': round(time.perf_counter() - start, 6)}
+
+    snapshot_path = core.get_snapshot_path(file_path)
+    if os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
+
+    def load():
+        state['df_raw'] = core.load_jira_export(file_path)
+
+    def load_snapshot():
+        core.load_jira_export(file_path)
+
+    def categorize():
+        state['hierarchy'] = core.build_issue_hierarchy(state['df_raw'])
+        state['categorized'] = core.build_categorized_issues(state['df_raw'], state['hierarchy'])
+
+    def categorize_and_filter():
+        core.categorize_and_filter_changes(state['df_raw'], 'All', 'All Platforms')
+
+    def build_model():
+        state['model'] = core.JiraDataModel(
+            file_path, core.compute_data_fingerprint(file_path), state['df_raw'],
+            state['categorized'], state['hierarchy']
+        )
+        state['combinations'] = [
+            (option['value'], p)
+            for option in core.build_quarter_filter_options(state['model'].quarters)
+            for p in core.platform_filter_values
+        ]
+
+    def aggregate():
+        model = state['model']
+        state['aggregates'] = [
+            core.aggregate_cube(model.cube, model.quarters, q, p) for q, p in state['combinations']
+        ]
+
+    def build_figures():
+        for categorized_data, issue_type_breakdown in state['aggregates']:
+            build_charts_and_kpis(categorized_data, issue_type_breakdown, state['model'].kpi_quarters)
+
+    def prepare_app():
+        # Aplikacja pracuje na modelu benchmarku - jak po przeładowaniu eksportu, z pustymi cache
+        jira_app.data_model_global = state['model']
+        jira_app.clear_result_caches()
+
+    def server_callbacks():
+        # Zmiany kwartału/platformy obsługuje przeglądarka - serwer dostaje tylko zmiany
+        # filtrów wymiarów (tu: każda osoba) i analizę przepływu
+        for assignee in ['All'] + state['model'].cube.dimension_values['Assignee']:
+            jira_app.update_aggregate_store(assignee, *jira_app.default_dimension_values[1:])
+        for p in core.platform_filter_values:
+            jira_app.update_flow_charts(p, 'All')
+
+    def callbacks_cold():
+        prepare_app()
+        server_callbacks()
+
+    def callbacks_warm():
+        server_callbacks()
+
+    def click_details():
+        model = state['model']
+        quarter = model.quarters[-1] if model.quarters else None
+        for p in core.all_platforms_for_display:
+            click = {'points': [{'x': p, 'customdata': [quarter]}]}
+            jira_app.display_click_data(click, 'All', 'All Platforms', *jira_app.default_dimension_values)
+
+    measure('load_csv', load)
+    if core.PARQUET_AVAILABLE:
+        measure('load_snapshot', load_snapshot)
+    measure('categorize', categorize)
+    measure('categorize_and_filter_changes', categorize_and_filter)
+    measure('build_model', build_model)
+    measure('aggregate_all_filters', aggregate)
+    measure('build_figures_all_filters', build_figures)
+    measure('callbacks_cold', callbacks_cold)
+    measure('callbacks_warm', callbacks_warm)
+    measure('display_click_data', click_details)
+    return stages
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=benchmarks_dir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def find_previous_results(results_dir):
+    """
+    Najnowszy plik wyników z katalogu albo None.
+    """
+    result_files = sorted(glob.glob(os.path.join(results_dir, 'bench_*.json')))
+    if not result_files:
+        return None
+    with open(result_files[-1], encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(current, previous):
+    """
+    Wypisuje czasy etapów względem poprzedniego uruchomienia i zwraca listę regresji.
+    """
+    regressions = []
+    for size, result in current['results'].items():
+        previous_stages = (previous or {}).get('results', {}).get(size, {}).get('stages', {})
+        print(f"\nwiersze: {size}")
+        for stage, metrics in result['stages'].items():
+            seconds = metrics.get('seconds')
+            line = f"  {stage:<32} {seconds:10.4f} s"
+            if 'peak_mb' in metrics:
+                line += f"  {metrics['peak_mb']:10.1f} MiB"
+            previous_seconds = previous_stages.get(stage, {}).get('seconds')
+            if previous_seconds:
+                ratio = seconds / previous_seconds
+                line += f"  x{ratio:.2f} vs poprzednio"
+                if ratio > REGRESSION_THRESHOLD and seconds >= REGRESSION_MIN_SECONDS:
+                    line += "  <-- REGRESJA"
+                    regressions.append((size, stage, ratio))
+            print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark przetwarzania syntetycznych eksportów Jira.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=benchmark_sizes,
+                        help='liczby wierszy eksportów (domyślnie: 10k, 100k, 1M, 10M)')
+    parser.add_argument('--data-dir', default=os.path.join(benchmarks_dir, 'data'),
+                        help='katalog na wygenerowane eksporty')
+    parser.add_argument('--results-dir', default=os.path.join(benchmarks_dir, 'results'),
+                        help='katalog na pliki wyników JSON')
+    parser.add_argument('--skip-memory', action='store_true', help='pomiń przebieg mierzący szczyt pamięci')
+    args = parser.parse_args(argv)
+
+    # Import aplikacji wczytuje jej eksport startowy; benchmark podmienia potem model danych
+    import analiza_jira_app as jira_app
+
+    current = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': get_git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+        'results': {}
+    }
+    for n_rows in args.sizes:
+        file_path = get_export_path(args.data_dir, n_rows)
+        print(f"Benchmark dla {n_rows} wierszy ({os.path.basename(file_path)})...")
+        stages = run_pipeline(file_path, jira_app)
+        if not args.skip_memory:
+            tracemalloc.start()
+            for stage, metrics in run_pipeline(file_path, jira_app, track_memory=True).items():
+                stages[stage].update(metrics)
+            tracemalloc.stop()
+        current['results'][str(n_rows)] = {'rows': n_rows, 'stages': stages}
+
+    # Szczytowe RSS procesu (ru_maxrss: KiB na Linuksie, bajty na macOS)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    current['max_rss_mb'] = round(max_rss / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+    previous = find_previous_results(args.results_dir)
+    regressions = compare_results(current, previous)
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    results_path = os.path.join(args.results_dir, f"bench_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(f"\nWyniki zapisano w '{results_path}' (szczytowe RSS: {current['max_rss_mb']} MiB).")
+    if regressions:
+        print(f"Regresje (> x{REGRESSION_THRESHOLD}): {len(regressions)}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
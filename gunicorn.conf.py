@@ -0,0 +1,67 @@
+"""
+Konfiguracja gunicorn dla trybu produkcyjnego aplikacji:
+    gunicorn -c gunicorn.conf.py analiza_jira_app:server
+
+Model danych jest wczytywany raz w procesie głównym (preload_app), a workery dziedziczą go
+po fork() - strony pamięci są współdzielone, dopóki worker ich nie zmodyfikuje (copy-on-write).
+Wyniki callbacków trafiają do współdzielonego cache na dysku, więc każdy liczy jeden worker.
+
+Hot reload (JIRA_RELOAD_INTERVAL) działa w procesie głównym: jeden watcher przeładowuje model
+raz, po czym gunicorn (SIGHUP) uruchamia nowe workery z nowym modelem i łagodnie zamyka stare.
+Workery nie przeładowują danych same - nie powtarzają tej pracy N razy i nie tracą
+współdzielenia pamięci. Ceną jest restart workerów po każdej zmianie danych (żądania
+w toku są dokańczane, a lokalne cache LRU zaczynają od zera - cache na dysku zostaje).
+
+Zmienne środowiskowe: JIRA_WORKERS (liczba workerów, domyślnie liczba rdzeni), JIRA_THREADS
+(wątki na workera), JIRA_BIND (adres, domyślnie 127.0.0.1:8050) oraz JIRA_SHARED_CACHE_DIR
+(katalog cache, domyślnie katalog tymczasowy usuwany przy zamknięciu serwera).
+"""
+import gc
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+
+# Ustawiane przed wczytaniem aplikacji - moduł aplikacji nie uruchamia wtedy watchera eksportów
+os.environ['JIRA_PRELOAD_APP'] = '1'
+if not os.environ.get('JIRA_SHARED_CACHE_DIR'):
+    os.environ['JIRA_SHARED_CACHE_DIR'] = tempfile.mkdtemp(prefix='analiza_jira_cache_')
+    # Zmienna środowiskowa, a nie zmienna modułu - SIGHUP wczytuje ten plik ponownie
+    os.environ['JIRA_TEMPORARY_CACHE_DIR'] = os.environ['JIRA_SHARED_CACHE_DIR']
+
+bind = os.environ.get('JIRA_BIND', '127.0.0.1:8050')
+workers = int(os.environ.get('JIRA_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('JIRA_THREADS', '1'))
+preload_app = True
+# Pierwsze wywołanie callbacku dla nowej kombinacji filtrów buduje wyniki od zera
+timeout = 120
+
+
+def restart_workers(server):
+    """
+    Po przeładowaniu modelu w procesie głównym: nowe obiekty wyłączamy z przeglądów GC
+    (jak przy starcie) i zlecamy gunicorn wymianę workerów - przy preload_app SIGHUP nie
+    importuje aplikacji ponownie, tylko uruchamia workery z bieżącej pamięci procesu głównego.
+    """
+    gc.freeze()
+    server.log.info("Przeładowano dane - restart workerów")
+    os.kill(server.pid, signal.SIGHUP)
+
+
+def when_ready(server):
+    import analiza_jira_app
+    if os.environ.get('WARM_FIGURE_CACHE') == '1':
+        # Wyniki policzone przed fork() trafiają do cache LRU każdego workera i do cache na dysku
+        analiza_jira_app.warm_result_cache()
+    # Obiekty wczytane przed fork() wyłączamy z przeglądów GC - inaczej pierwszy przegląd
+    # w workerze zapisałby nagłówki wszystkich obiektów i skopiował ich strony pamięci
+    gc.freeze()
+    server.log.info("Model danych wczytany, współdzielony cache: %s", os.environ['JIRA_SHARED_CACHE_DIR'])
+    analiza_jira_app.start_reload_watcher(on_reload=lambda: restart_workers(server))
+
+
+def on_exit(server):
+    temporary_cache_dir = os.environ.get('JIRA_TEMPORARY_CACHE_DIR')
+    if temporary_cache_dir:
+        shutil.rmtree(temporary_cache_dir, ignore_errors=True)
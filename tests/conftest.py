@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Testy importują pakiet analiza_jira i moduły benchmarków z katalogu repozytorium
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repo_dir)
+sys.path.insert(0, os.path.join(repo_dir, 'benchmarks'))
+
+bundled_export_path = os.path.join(repo_dir, 'products_development_2025-06-19_11.34am.csv')
+
+
+@pytest.fixture(scope='session')
+def bundled_export():
+    """
+    Eksport dołączony do repozytorium, wczytany jak w pierwotnym skrypcie (bez dtype).
+    """
+    return pd.read_csv(bundled_export_path)
+
+
+@pytest.fixture
+def export_copy(bundled_export):
+    return bundled_export.copy()
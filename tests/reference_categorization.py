@@ -0,0 +1,157 @@
+"""
+Wzorcowa implementacja kategoryzacji sprzed wektoryzacji (pętla po iterrows) - kopia
+funkcji categorize_and_filter_changes z pierwotnego skryptu aplikacji, bez zmian.
+Służy wyłącznie testom zgodności: wektoryzowana ścieżka z analiza_jira.core musi dawać
+identyczne categorized_data i issue_type_breakdown dla kwartałów Q1/Q2 2025.
+"""
+import pandas as pd
+
+def categorize_and_filter_changes(df_raw_input, selected_quarter=None, selected_platform=None):
+    """
+    Kategoryzuje i filtruje zakończone zadania dla Q1 i Q2 2025
+    oraz dla wybranych kwartałów/platform.
+    """
+    
+    df = df_raw_input.copy()
+
+    df['Due date'] = pd.to_datetime(df['Due date'], errors='coerce', format='%Y/%m/%d')
+    df['Inferred due date'] = pd.to_datetime(df['Inferred due date'], errors='coerce', format='%Y/%m/%d')
+    df['Completion_Date'] = df['Due date'].fillna(df['Inferred due date'])
+
+    df_done = df[df['Status'] == 'Done'].copy()
+
+    q1_start = pd.Timestamp('2025-01-01')
+    q1_end = pd.Timestamp('2025-03-31')
+    q2_start = pd.Timestamp('2025-04-01')
+    q2_end = pd.Timestamp('2025-06-30')
+
+    all_platforms_for_display = ["UMPIRE", "WICKET", "STRIDE", "Ogólne/Cross-platformowe"]
+
+    # Nowe, wyczyszczone struktury dla danych
+    categorized_data = {
+        "Platforma": all_platforms_for_display,
+        "Q1 2025": [0] * len(all_platforms_for_display), 
+        "Q2 2025": [0] * len(all_platforms_for_display),
+        "Details Q1 2025": {p: [] for p in all_platforms_for_display},
+        "Details Q2 2025": {p: [] for p in all_platforms_for_display}
+    }
+
+    issue_type_breakdown = {
+        'Q1 2025': {},
+        'Q2 2025': {}
+    }
+
+    df['Key'] = df['Key'].astype(str)
+    df_temp_for_epic = df.copy()
+    df_temp_for_epic['Parent'] = df_temp_for_epic['Parent'].astype(str)
+    epic_summaries = df_temp_for_epic.set_index('Key')['Summary'].astype(str).to_dict()
+
+    # Manualne mapowania kluczy zadań do przypisanych platform i kwartałów
+    # Te mapowania powinny być tworzone raz i używane do kategoryzacji
+    # Zmieniono strukturę, aby klucz mapował na (kwartał, lista_kategorii)
+    all_manual_overrides = {}
+
+    # Q1 specific keys and their primary/secondary categories
+    q1_specific_keys_mapping = {
+        "TPD-474": ["UMPIRE", "STRIDE"], 
+        "TPD-535": ["UMPIRE"], "TPD-375": ["UMPIRE"], "TPD-376": ["UMPIRE"], "TPD-252": ["UMPIRE"], 
+        "TPD-333": ["WICKET"], "TPD-331": ["WICKET"], "TPD-332": ["WICKET"], "TPD-178": ["WICKET"], 
+        "TPD-516": ["WICKET"], "TPD-517": ["WICKET"], "TPD-530": ["WICKET"], 
+        "TPD-240": ["STRIDE"], "TPD-263": ["STRIDE"],
+        # Przykłady z Q1, które były wcześniej "Ogólne", ale chcemy je tu śledzić by nie pomijać w filtrowaniu kwartału
+        "TPD-158": ["Ogólne/Cross-platformowe"], # Epic CDN
+        "TPD-452": ["Ogólne/Cross-platformowe"], # Epic OTT/Quiz
+        "TPD-448": ["Ogólne/Cross-platformowe"], # Epic Analityka GA
+        "TPD-451": ["Ogólne/Cross-platformowe"], # Epic Mobile bugs
+        "TPD-330": ["Ogólne/Cross-platformowe"], # Epic QF Paweł (ale jego subtaski są Wicket)
+        "TPD-200": ["Ogólne/Cross-platformowe"], # Epic Predictor Game
+    }
+
+    # Q2 specific keys and their primary/secondary categories
+    q2_specific_keys_mapping = {
+        "TPD-440": ["WICKET"], "TPD-442": ["WICKET"], "TPD-443": ["WICKET"], "TPD-447": ["WICKET"],
+        "TPD-444": ["WICKET"], "TPD-441": ["WICKET"], "TPD-445": ["WICKET"],
+        "TPD-687": ["WICKET"], "TPD-700": ["WICKET"], "TPD-763": ["WICKET"],
+        "TPD-453": ["STRIDE"],
+        # Przykłady z Q2, które były wcześniej "Ogólne"
+        "TPD-439": ["Ogólne/Cross-platformowe"], # Epic Stride Support Improvements
+        "TPD-631": ["Ogólne/Cross-platformowe"], # Epic Support
+        "TPD-731": ["Ogólne/Cross-platformowe"], # Epic Bugs and Improvements
+        "TPD-851": ["Ogólne/Cross-platformowe"], # Epic Scalenie środowisk
+        "TPD-880": ["Ogólne/Cross-platformowe"], # Epic BRNDS ads
+    }
+
+    # Budujemy all_manual_overrides dla szybkiego dostępu
+    for k, v in q1_specific_keys_mapping.items():
+        all_manual_overrides[k] = {'quarter': 'Q1 2025', 'categories': v}
+    for k, v in q2_specific_keys_mapping.items():
+        all_manual_overrides[k] = {'quarter': 'Q2 2025', 'categories': v}
+
+
+    # Iterujemy po WSZYSTKICH zakończonych zadaniach z oryginalnego df_done
+    # Filtrowanie platform i kwartałów odbywa się wewnątrz pętli
+    for index, row in df_done.iterrows(): 
+        summary = str(row['Summary']) if pd.notna(row['Summary']) else ''
+        issue_type = str(row['Issue Type']) if pd.notna(row['Issue Type']) else ''
+        key = str(row['Key']) if pd.notna(row['Key']) else ''
+        
+        parent_key = str(row['Parent']) if pd.notna(row['Parent']) else None
+        parent_summary = epic_summaries.get(parent_key, '') if parent_key else ''
+        
+        item_detail = f"[{key}] {summary} ({issue_type})"
+
+        # 1. Określenie kwartału (najpierw z daty, potem z manualnych nadpisań)
+        current_item_quarter_str = None
+        if pd.notna(row['Completion_Date']):
+            if q1_start <= row['Completion_Date'] <= q1_end:
+                current_item_quarter_str = 'Q1 2025'
+            elif q2_start <= row['Completion_Date'] <= q2_end:
+                current_item_quarter_str = 'Q2 2025'
+        
+        # 2. Określenie kategorii (najpierw z manualnych nadpisań, potem z keywords)
+        item_categories = [] # Lista kategorii, do których należy to zadanie
+
+        if key in all_manual_overrides:
+            # Jeśli klucz jest w manualnych nadpisaniach, użyj zdefiniowanych tam kategorii i kwartału
+            item_categories = all_manual_overrides[key]['categories']
+            current_item_quarter_str = all_manual_overrides[key]['quarter'] # Nadpisz kwartał z manualnego override
+        else:
+            # Jeśli nie ma manualnego nadpisania, użyj logiki słów kluczowych
+            determined_category = "Ogólne/Cross-platformowe" # Domyślna
+            if "Umpire" in summary or "Umpire" in parent_summary or "[Umpire" in summary:
+                determined_category = "UMPIRE"
+            elif "Wicket" in summary or "Wicket" in parent_summary or "[Wicket" in summary:
+                determined_category = "WICKET"
+            elif "Stride" in summary or "Stride" in parent_summary or "[Stride" in summary:
+                determined_category = "STRIDE"
+            item_categories.append(determined_category)
+
+
+        # --- Główne filtrowanie i zliczanie ---
+        # Sprawdzamy, czy zadanie pasuje do filtra kwartału
+        quarter_match = (selected_quarter is None or selected_quarter == 'All 2025' or selected_quarter == current_item_quarter_str)
+
+        if quarter_match and current_item_quarter_str:
+            for cat in item_categories:
+                # Sprawdzamy, czy zadanie pasuje do filtra platformy
+                platform_match = (selected_platform is None or selected_platform == 'All Platforms' or selected_platform == cat)
+                
+                if platform_match:
+                    details_key_q = f"Details {current_item_quarter_str}"
+                    if cat in categorized_data[details_key_q]: # Upewnij się, że kategoria istnieje
+                        categorized_data[details_key_q][cat].append(item_detail)
+                        
+                        # Zliczanie dla issue_type_breakdown (dotyczy tylko wybranego kwartału)
+                        if current_item_quarter_str in issue_type_breakdown:
+                            issue_type_breakdown[current_item_quarter_str][issue_type] = issue_type_breakdown[current_item_quarter_str].get(issue_type, 0) + 1
+        
+    # Finalne przeliczenie unikalnych zadań na podstawie szczegółowych list (dla głównego wykresu)
+    for platform in categorized_data["Platforma"]:
+        # Używamy set() dla usunięcia duplikatów
+        q1_unique_items = set(categorized_data["Details Q1 2025"][platform])
+        q2_unique_items = set(categorized_data["Details Q2 2025"][platform])
+        
+        categorized_data["Q1 2025"][categorized_data["Platforma"].index(platform)] = len(q1_unique_items)
+        categorized_data["Q2 2025"][categorized_data["Platforma"].index(platform)] = len(q2_unique_items)
+
+    return categorized_data, issue_type_breakdown 
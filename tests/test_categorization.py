@@ -0,0 +1,63 @@
+"""
+Zgodność wektoryzowanej kategoryzacji (analiza_jira.core) z pierwotną pętlą po iterrows
+(tests/reference_categorization.py) dla filtrów kwartałów roku 2025 i platform.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analiza_jira.core import categorize_and_filter_changes
+from reference_categorization import categorize_and_filter_changes as reference_categorize
+
+quarter_filters = ['All 2025', 'Q1 2025', 'Q2 2025']
+platform_filters = [None, 'All Platforms', 'UMPIRE', 'WICKET', 'STRIDE', 'Ogólne/Cross-platformowe']
+
+
+def assert_matches_reference(df, selected_quarter, selected_platform):
+    expected = reference_categorize(df, selected_quarter, selected_platform)
+    assert categorize_and_filter_changes(df, selected_quarter, selected_platform) == expected
+
+
+@pytest.mark.parametrize('selected_platform', platform_filters)
+@pytest.mark.parametrize('selected_quarter', quarter_filters)
+def test_bundled_export_matches_reference(bundled_export, selected_quarter, selected_platform):
+    assert_matches_reference(bundled_export, selected_quarter, selected_platform)
+
+
+@pytest.mark.parametrize('selected_platform', [None, 'UMPIRE', 'Ogólne/Cross-platformowe'])
+@pytest.mark.parametrize('selected_quarter', quarter_filters)
+def test_missing_values_and_duplicates_match_reference(bundled_export, selected_quarter, selected_platform):
+    # Powtórzone wiersze (również w innej kolejności) i braki w kolumnach używanych przy kategoryzacji
+    df = pd.concat([bundled_export] * 2 + [bundled_export.sample(frac=1, random_state=1)], ignore_index=True)
+    rng = np.random.default_rng(0)
+    for column in ['Summary', 'Issue Type', 'Parent', 'Due date']:
+        df.loc[rng.choice(len(df), 40, replace=False), column] = np.nan
+    assert_matches_reference(df, selected_quarter, selected_platform)
+
+
+def test_nan_summary_uses_parent_keywords(export_copy):
+    # Zadanie bez tytułu dziedziczy platformę z tytułu rodzica
+    done = export_copy.index[(export_copy['Status'] == 'Done') & export_copy['Parent'].notna()]
+    export_copy.loc[done[:25], 'Summary'] = np.nan
+    parent = export_copy.index[export_copy['Key'] == export_copy.loc[done[0], 'Parent']]
+    export_copy.loc[parent, 'Summary'] = 'Wicket release'
+    for selected_quarter in quarter_filters:
+        assert_matches_reference(export_copy, selected_quarter, None)
+
+
+def test_manual_override_sets_quarter_and_platforms(export_copy):
+    # TPD-474 ma ręczne przypisanie do Q1 2025 i dwóch platform niezależnie od daty i tytułu
+    override = export_copy['Key'] == 'TPD-474'
+    if not override.any():
+        export_copy = pd.concat([export_copy, export_copy.iloc[[0]].assign(Key='TPD-474')], ignore_index=True)
+        override = export_copy['Key'] == 'TPD-474'
+    export_copy.loc[override, ['Status', 'Due date', 'Summary']] = ['Done', '2025/05/20', 'Bez słów kluczowych']
+
+    categorized_data, _ = categorize_and_filter_changes(export_copy, 'Q1 2025', None)
+    for platform in ['UMPIRE', 'STRIDE']:
+        assert any(detail.startswith('[TPD-474]') for detail in categorized_data['Details Q1 2025'][platform])
+    assert not any(
+        detail.startswith('[TPD-474]') for details in categorized_data['Details Q2 2025'].values() for detail in details
+    )
+    for selected_quarter in quarter_filters:
+        assert_matches_reference(export_copy, selected_quarter, None)
@@ -0,0 +1,97 @@
+"""
+Callback przeglądarki (assets/clientside.js) wobec ścieżki serwerowej: dla tych samych
+agregatów kostki figury i KPI z updateChartsAndKpis muszą być identyczne z wynikiem
+build_charts_and_kpis(aggregate_cube(...)). Wymaga Node.js.
+"""
+import base64
+import json
+import os
+import random
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+from plotly.io.json import to_json_plotly
+
+from analiza_jira.charts import build_chart_templates, build_charts_and_kpis
+from analiza_jira.core import (
+    OlapCube, aggregate_cube, all_platforms_for_display, build_aggregate_payload, build_categorized_issues,
+    build_quarter_filter_options, cube_dimensions, discover_quarters, platform_filter_values
+)
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='wymaga Node.js')
+
+clientside_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'clientside.js')
+
+node_runner = r'''
+const vm = require('vm');
+const fs = require('fs');
+const [clientsidePath, inputPath, outputPath] = process.argv.slice(2);
+const context = {window: {}};
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(clientsidePath, 'utf8'), context);
+const input = JSON.parse(fs.readFileSync(inputPath, 'utf8'));
+const update = context.window.dash_clientside.jira.updateChartsAndKpis;
+const output = input.cases.map(c => update(c.quarter, c.platform, input.payloads[c.payload], input.templates));
+fs.writeFileSync(outputPath, JSON.stringify(output));
+'''
+
+
+def decode_typed_arrays(value):
+    """
+    Zamienia tablice zakodowane przez plotly ({'dtype', 'bdata'}) na listy liczb.
+    """
+    if isinstance(value, dict):
+        if set(value) == {'dtype', 'bdata'}:
+            return np.frombuffer(base64.b64decode(value['bdata']), dtype=np.dtype(value['dtype'])).tolist()
+        return {k: decode_typed_arrays(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_typed_arrays(v) for v in value]
+    return value
+
+
+def as_browser_json(value):
+    # Dash serializuje dane komponentów i odpowiedzi callbacków enkoderem plotly
+    return decode_typed_arrays(json.loads(to_json_plotly(value)))
+
+
+def test_clientside_charts_match_server(tmp_path, bundled_export):
+    categorized_issues = build_categorized_issues(bundled_export)
+    cube = OlapCube(categorized_issues)
+    quarters = discover_quarters(categorized_issues)
+    kpi_quarters = ([None, None] + quarters)[-2:]
+
+    rng = random.Random(1)
+    dimension_choices = [[None] + cube.dimension_values[d][:4] for d in cube_dimensions]
+    quarter_values = [option['value'] for option in build_quarter_filter_options(quarters)] + ['Q1 2019']
+    selections = [(q, p) for q in quarter_values for p in platform_filter_values]
+    # Bez filtrów wymiarów wszystkie pary kwartał/platforma, z filtrami - losowa próbka
+    # (build_charts_and_kpis z plotly express to ok. 0,2 s na wywołanie)
+    filter_sets = [({}, selections)] + [
+        ({d: v for d, v in zip(cube_dimensions, (rng.choice(c) for c in dimension_choices)) if v is not None},
+         rng.sample(selections, 4))
+        for _ in range(4)
+    ]
+
+    payloads, cases, expected = [], [], []
+    for filters, filter_selections in filter_sets:
+        payload = build_aggregate_payload(cube, quarters, filters)
+        payload['kpi_quarters'] = kpi_quarters
+        payloads.append(payload)
+        for quarter, platform in filter_selections:
+            cases.append({'payload': len(payloads) - 1, 'quarter': quarter, 'platform': platform})
+            categorized_data, issue_type_breakdown = aggregate_cube(cube, quarters, quarter, platform, filters)
+            expected.append(list(build_charts_and_kpis(categorized_data, issue_type_breakdown, kpi_quarters)))
+
+    input_path, output_path, runner_path = tmp_path / 'input.json', tmp_path / 'output.json', tmp_path / 'run.js'
+    input_path.write_text(to_json_plotly({
+        'cases': cases, 'payloads': payloads, 'templates': build_chart_templates(all_platforms_for_display)
+    }))
+    runner_path.write_text(node_runner)
+    subprocess.run(['node', str(runner_path), clientside_path, str(input_path), str(output_path)], check=True)
+
+    output = json.loads(output_path.read_text())
+    assert len(output) == len(expected)
+    for case, clientside_result, server_result in zip(cases, output, expected):
+        assert clientside_result == as_browser_json(server_result), case
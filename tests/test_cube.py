@@ -0,0 +1,76 @@
+"""
+Kostka OLAP (aggregate_cube, build_aggregate_payload) wobec agregacji wierszy tabeli
+skategoryzowanych zadań przefiltrowanych po wymiarach (aggregate_categorized_issues).
+"""
+import itertools
+
+import pytest
+
+from analiza_jira.core import (
+    OlapCube, aggregate_categorized_issues, aggregate_cube, all_platforms_for_display, build_aggregate_payload,
+    build_categorized_issues, cube_dimensions, discover_quarters
+)
+from bench_cube import generate_categorized_issues
+
+
+@pytest.fixture(scope='module')
+def categorized_issues(bundled_export):
+    return build_categorized_issues(bundled_export)
+
+
+def filter_rows(categorized_issues, filters):
+    rows = categorized_issues
+    for dimension, value in filters.items():
+        rows = rows[rows[dimension] == value]
+    return rows
+
+
+def sample_filters(categorized_issues):
+    """
+    Brak filtrów, pojedyncze wartości każdego wymiaru i kilka kombinacji dwóch wymiarów.
+    """
+    values = {d: categorized_issues[d].value_counts().index[:3].tolist() for d in cube_dimensions}
+    filters = [{}]
+    filters += [{d: v} for d in cube_dimensions for v in values[d]]
+    filters += [{a: values[a][0], b: values[b][-1]} for a, b in itertools.combinations(cube_dimensions, 2)]
+    filters.append({d: values[d][0] for d in cube_dimensions})
+    return filters
+
+
+def assert_cube_matches_rows(categorized_issues, cube, filters, selected_quarter, selected_platform):
+    quarters = discover_quarters(categorized_issues)
+    expected_data, expected_breakdown = aggregate_categorized_issues(
+        filter_rows(categorized_issues, filters), selected_quarter, selected_platform
+    )
+    cube_data, cube_breakdown = aggregate_cube(cube, quarters, selected_quarter, selected_platform, filters)
+    # Wiersze po filtrze mogą nie mieć części kwartałów - w kostce są one zerami
+    for quarter in [q for q in cube_data if q != 'Platforma']:
+        assert cube_data[quarter] == expected_data.get(quarter, [0] * len(all_platforms_for_display))
+        assert cube_breakdown.get(quarter, {}) == expected_breakdown.get(quarter, {})
+
+
+@pytest.mark.parametrize('selected_quarter, selected_platform', [
+    ('All', 'All Platforms'), ('All 2025', 'UMPIRE'), ('Q1 2025', 'All Platforms'), ('Q2 2025', 'WICKET')
+])
+def test_bundled_export_cube_matches_filtered_rows(categorized_issues, selected_quarter, selected_platform):
+    cube = OlapCube(categorized_issues)
+    for filters in sample_filters(categorized_issues):
+        assert_cube_matches_rows(categorized_issues, cube, filters, selected_quarter, selected_platform)
+
+
+def test_synthetic_cube_matches_filtered_rows():
+    categorized_issues = generate_categorized_issues(5000, assignees=7, sprints=5, issue_types=4, colors=3)
+    cube = OlapCube(categorized_issues)
+    for filters in sample_filters(categorized_issues):
+        assert_cube_matches_rows(categorized_issues, cube, filters, 'All', 'All Platforms')
+
+
+def test_aggregate_payload_matches_cube(categorized_issues):
+    cube = OlapCube(categorized_issues)
+    quarters = discover_quarters(categorized_issues)
+    filters = {'Issue Type': categorized_issues['Issue Type'].iloc[0]}
+    payload = build_aggregate_payload(cube, quarters, filters)
+    for quarter in quarters:
+        cube_data, cube_breakdown = aggregate_cube(cube, quarters, quarter, 'All Platforms', filters)
+        assert payload['counts'][quarter] == cube_data[quarter]
+        assert {t: sum(c) for t, c in payload['issue_type_counts'][quarter].items()} == cube_breakdown[quarter]
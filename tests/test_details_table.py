@@ -0,0 +1,150 @@
+"""
+Tabela szczegółów aplikacji (callback update_details_table): stronicowanie, sortowanie
+i wyszukiwanie po stronie serwera wobec wycinków grupy (kwartał, platforma) bez powtórzonych
+opisów, także na granicach stron i dla pustych grup.
+"""
+import importlib
+import sys
+from contextvars import copy_context
+
+import pytest
+from dash._callback_context import context_value
+from dash._utils import AttributeDict
+
+from generate_export import generate_jira_export
+
+page_size = 10
+app_environment = ['JIRA_EXPORT_MANIFEST', 'JIRA_FEDERATE_EXPORTS', 'JIRA_ISSUE_STORE', 'JIRA_SHARED_CACHE_DIR',
+                   'JIRA_RELOAD_INTERVAL', 'JIRA_INSTRUMENTATION', 'JIRA_STREAMING_INGEST']
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    # Aplikacja wczytuje eksport przy imporcie - katalog z wygenerowanym eksportem zamiast repozytorium
+    data_dir = tmp_path_factory.mktemp('app')
+    generate_jira_export(3000, str(data_dir / 'export.csv'), seed=13)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('JIRA_DATA_DIR', str(data_dir))
+        for name in app_environment:
+            patch.delenv(name, raising=False)
+        sys.modules.pop('analiza_jira_app', None)
+        yield importlib.import_module('analiza_jira_app')
+        sys.modules.pop('analiza_jira_app', None)
+
+
+def update_table(app_module, group, triggered='changes-bar-chart-2d.clickData', page_current=0, sort_by=None,
+                 search_text='', selected_quarter='All', selected_platform='All Platforms',
+                 dimension_values=('All',) * 4):
+    click_data = None if group is None else {'points': [{'customdata': [group[0]], 'x': group[1]}]}
+
+    def run():
+        context_value.set(AttributeDict(triggered_inputs=[{'prop_id': triggered, 'value': None}]))
+        return app_module.update_details_table(
+            click_data, selected_quarter, selected_platform, *dimension_values,
+            search_text, page_current, sort_by or [], app_module.ALL_SOURCES, page_size
+        )
+
+    return copy_context().run(run)
+
+
+def expected_group(app_module, group):
+    # Grupa wprost z tabeli skategoryzowanych zadań: jeden wiersz na opis, kolejność po Detail
+    quarter, platform = group
+    categorized_issues = app_module.data_model_global.categorized_issues
+    rows = categorized_issues[(categorized_issues['Quarter'] == quarter) & (categorized_issues['Platforma'] == platform)]
+    return rows.drop_duplicates('Detail').sort_values('Detail', kind='stable').reset_index(drop=True)
+
+
+def records(rows):
+    return rows[['Key', 'Summary', 'Issue Type']].to_dict('records')
+
+
+@pytest.fixture(scope='module')
+def large_group(app_module):
+    sizes = app_module.data_model_global.categorized_issues.groupby(['Quarter', 'Platforma']).size()
+    group = sizes.idxmax()
+    assert sizes[group] > 3 * page_size
+    return group
+
+
+def test_pages_match_group_slices(app_module, large_group):
+    expected = expected_group(app_module, large_group)
+    page_count = -(-len(expected) // page_size)
+    assert len(expected) % page_size, 'ostatnia strona powinna być niepełna'
+
+    data, count, current, active_cell = update_table(app_module, large_group)
+    assert (data, count, current, active_cell) == (records(expected.iloc[:page_size]), page_count, 0, None)
+    for page in range(page_count):
+        data, count, current, _ = update_table(
+            app_module, large_group, triggered='details-table.page_current', page_current=page
+        )
+        assert (count, current) == (page_count, page)
+        assert data == records(expected.iloc[page * page_size:(page + 1) * page_size])
+    assert len(data) == len(expected) % page_size
+
+    # Strona za ostatnią (np. po zawężeniu grupy) to ostatnia strona
+    data, _, current, _ = update_table(
+        app_module, large_group, triggered='details-table.page_current', page_current=page_count + 5
+    )
+    assert (data, current) == (records(expected.iloc[(page_count - 1) * page_size:]), page_count - 1)
+
+
+@pytest.mark.parametrize('column', ['Key', 'Summary', 'Issue Type'])
+@pytest.mark.parametrize('direction', ['asc', 'desc'])
+def test_sorted_pages(app_module, large_group, column, direction):
+    expected = expected_group(app_module, large_group).sort_values(
+        column, ascending=direction == 'asc', kind='stable'
+    )
+    sort_by = [{'column_id': column, 'direction': direction}]
+    # Zmiana sortowania wraca na pierwszą stronę, kolejne strony to kolejne wycinki
+    data, _, current, _ = update_table(
+        app_module, large_group, triggered='details-table.sort_by', page_current=2, sort_by=sort_by
+    )
+    assert (data, current) == (records(expected.iloc[:page_size]), 0)
+    data, _, current, _ = update_table(
+        app_module, large_group, triggered='details-table.page_current', page_current=2, sort_by=sort_by
+    )
+    assert (data, current) == (records(expected.iloc[2 * page_size:3 * page_size]), 2)
+
+
+def test_search_with_sort_and_paging(app_module, large_group):
+    group = expected_group(app_module, large_group)
+    search_text = group['Summary'].str.split().str[0].value_counts().index[0].upper()
+    expected = group[group['Detail'].str.lower().str.contains(search_text.lower(), regex=False)]
+    expected = expected.sort_values('Key', ascending=False, kind='stable')
+    assert page_size < len(expected) < len(group)
+
+    sort_by = [{'column_id': 'Key', 'direction': 'desc'}]
+    data, count, current, _ = update_table(
+        app_module, large_group, triggered='details-search.value', page_current=1, sort_by=sort_by,
+        search_text=f'  {search_text} '
+    )
+    assert (data, count, current) == (records(expected.iloc[:page_size]), -(-len(expected) // page_size), 0)
+    data, _, _, _ = update_table(
+        app_module, large_group, triggered='details-table.page_current', page_current=1, sort_by=sort_by,
+        search_text=search_text
+    )
+    assert data == records(expected.iloc[page_size:2 * page_size])
+
+
+def test_dimension_filter(app_module, large_group):
+    group = expected_group(app_module, large_group)
+    assignee = group['Assignee'].value_counts().index[0]
+    data, count, _, _ = update_table(app_module, large_group, dimension_values=(assignee, 'All', 'All', 'All'))
+    expected = group[group['Assignee'] == assignee]
+    assert (data, count) == (records(expected.iloc[:page_size]), max(1, -(-len(expected) // page_size)))
+
+
+def test_empty_groups(app_module, large_group):
+    empty_page = ([], 1, 0, None)
+    # Grupa bez zadań, wyszukiwanie bez wyników i słupek wykluczony filtrem platformy
+    assert update_table(app_module, ('Q1 1999', large_group[1])) == empty_page
+    assert update_table(app_module, large_group, search_text='brak-takiego-tekstu') == empty_page
+    other_platform = next(p for p in app_module.all_platforms_for_display if p != large_group[1])
+    assert update_table(app_module, large_group, selected_platform=other_platform) == empty_page
+    assert update_table(app_module, large_group, selected_quarter='Q1 1999') == empty_page
+    assert update_table(
+        app_module, ('Q1 1999', large_group[1]), triggered='details-table.page_current', page_current=3
+    ) == empty_page
+    # Bez klikniętego słupka tabela nie ma stron
+    assert update_table(app_module, None) == ([], 0, 0, None)
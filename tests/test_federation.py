@@ -0,0 +1,102 @@
+"""
+Federacja eksportów: deduplikacja po Key (wygrywa najnowsze źródło), kolejność źródeł
+w trybie katalogu i manifestu oraz przyrostowe przeładowanie modelu połączonego.
+"""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from analiza_jira.core import build_categorized_issues, load_federated_model, prepare_jira_export
+
+
+@pytest.fixture
+def snapshots(bundled_export):
+    """
+    Dwa nakładające się snapshoty: w nowszym wszystkie zadania są zakończone,
+    a wspólne zadania mają zmieniony tytuł.
+    """
+    older = bundled_export.iloc[:len(bundled_export) * 2 // 3].copy()
+    newer = bundled_export.iloc[len(bundled_export) // 3:].copy()
+    newer['Status'] = 'Done'
+    newer['Summary'] = 'Wicket ' + newer['Summary'].fillna('')
+    return older, newer
+
+
+def write_export(df, path, mtime):
+    df.to_csv(path, index=False)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def expected_categorized(frames):
+    combined = pd.concat(frames).drop_duplicates('Key', keep='last').reset_index(drop=True)
+    return build_categorized_issues(prepare_jira_export(combined)).reset_index(drop=True)
+
+
+def assert_categorized_equal(model, expected):
+    pd.testing.assert_frame_equal(
+        model.combined.categorized_issues.reset_index(drop=True).astype(str), expected.astype(str)
+    )
+
+
+def test_directory_mode_newest_file_wins(tmp_path, snapshots):
+    older, newer = snapshots
+    # Nazwy w odwrotnej kolejności niż daty - o pierwszeństwie decyduje data modyfikacji
+    write_export(older, tmp_path / 'b_older.csv', 1_000_000)
+    write_export(newer, tmp_path / 'a_newer.csv', 2_000_000)
+    model = load_federated_model(str(tmp_path))
+    assert list(model.source_models) == ['b_older', 'a_newer']
+    assert_categorized_equal(model, expected_categorized([older, newer]))
+
+
+def test_manifest_order_wins_over_mtime(tmp_path, snapshots):
+    older, newer = snapshots
+    # Skopiowany starszy snapshot ma nowszą datę modyfikacji niż nowszy eksport
+    write_export(older, tmp_path / 'older.csv', 2_000_000)
+    write_export(newer, tmp_path / 'newer.csv', 1_000_000)
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text(json.dumps({'exports': ['older.csv', {'name': 'Nowy', 'path': 'newer.csv'}]}))
+    model = load_federated_model(str(manifest_path))
+    assert list(model.source_models) == ['older', 'Nowy']
+    assert_categorized_equal(model, expected_categorized([older, newer]))
+
+
+def test_manifest_exported_at_overrides_order(tmp_path, snapshots):
+    older, newer = snapshots
+    write_export(older, tmp_path / 'older.csv', 1_000_000)
+    write_export(newer, tmp_path / 'newer.csv', 1_000_000)
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text(json.dumps([
+        {'path': 'newer.csv', 'exported_at': '2025-06-19T11:34'},
+        {'path': 'older.csv', 'exported_at': '2025-05-01'}
+    ]))
+    model = load_federated_model(str(manifest_path))
+    assert list(model.source_models) == ['older', 'newer']
+    assert_categorized_equal(model, expected_categorized([older, newer]))
+
+
+def test_manifest_requires_exported_at_on_every_entry(tmp_path, snapshots):
+    older, newer = snapshots
+    write_export(older, tmp_path / 'older.csv', 1_000_000)
+    write_export(newer, tmp_path / 'newer.csv', 1_000_000)
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text(json.dumps([{'path': 'newer.csv', 'exported_at': '2025-06-19'}, 'older.csv']))
+    with pytest.raises(ValueError):
+        load_federated_model(str(manifest_path))
+
+
+def test_incremental_reload_matches_fresh_load(tmp_path, snapshots):
+    older, newer = snapshots
+    write_export(older, tmp_path / 'a.csv', 1_000_000)
+    write_export(newer, tmp_path / 'b.csv', 2_000_000)
+    model = load_federated_model(str(tmp_path))
+    assert load_federated_model(str(tmp_path), previous_model=model) is model
+
+    changed = older.copy()
+    changed.loc[changed.index[:50], 'Summary'] = 'Umpire zmiana'
+    write_export(changed, tmp_path / 'a.csv', 1_500_000)
+    reloaded = load_federated_model(str(tmp_path), previous_model=model)
+    assert reloaded.source_models['b'] is model.source_models['b']
+    assert_categorized_equal(reloaded, expected_categorized([changed, newer]))
@@ -0,0 +1,105 @@
+"""
+Analiza przepływu (FlowMetrics, build_flow_charts) wobec naiwnych obliczeń pandas
+(groupby/quantile) na tabeli skategoryzowanych zadań - dla każdego przekroju platforma/osoba,
+w tym zbiorczych (None).
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analiza_jira.charts import build_flow_charts
+from analiza_jira.core import (
+    VELOCITY_WINDOW_WEEKS, FlowMetrics, all_platforms_for_display, build_categorized_issues
+)
+from generate_export import generate_jira_export
+from test_clientside import decode_typed_arrays
+
+
+@pytest.fixture(scope='module', params=['bundled', 'synthetic'])
+def categorized_issues(request, bundled_export, tmp_path_factory):
+    if request.param == 'bundled':
+        return build_categorized_issues(bundled_export)
+    export_path = generate_jira_export(3000, str(tmp_path_factory.mktemp('flow') / 'export.csv'), seed=11)
+    return build_categorized_issues(pd.read_csv(export_path, dtype=str))
+
+
+def slice_rows(categorized_issues, platform, assignee):
+    rows = categorized_issues
+    if platform is not None:
+        rows = rows[rows['Platforma'] == platform]
+    if assignee is not None:
+        rows = rows[rows['Assignee'] == assignee]
+    # Zadanie liczy się w przekroju raz, niezależnie od liczby kwartałów i platform
+    return rows.drop_duplicates('Key')
+
+
+def naive_percentiles(rows):
+    days = (rows['Completion_Date'] - rows['Start_Date']).dt.total_seconds() / 86400
+    days = days[days >= 0]
+    if days.empty:
+        return None
+    quantiles = days.quantile([0.5, 0.9, 0.99])
+    return {'p50': quantiles[0.5], 'p90': quantiles[0.9], 'p99': quantiles[0.99], 'count': len(days)}
+
+
+def naive_throughput(rows, all_rows):
+    weeks = rows['Completion_Date'].dropna().dt.to_period('W').dt.start_time
+    all_weeks = all_rows['Completion_Date'].dropna().dt.to_period('W').dt.start_time
+    axis = pd.date_range(all_weeks.min(), all_weeks.max(), freq='W-MON')
+    throughput = weeks.groupby(weeks).size().reindex(axis, fill_value=0)
+    return throughput, throughput.rolling(VELOCITY_WINDOW_WEEKS, min_periods=1).mean()
+
+
+def all_slices(categorized_issues):
+    platforms = [None] + sorted(categorized_issues['Platforma'].unique())
+    assignees = [None] + sorted(categorized_issues['Assignee'].dropna().unique())
+    return [(platform, assignee) for platform in platforms for assignee in assignees]
+
+
+def test_slices_match_naive_groupby(categorized_issues):
+    flow = FlowMetrics(categorized_issues)
+    for platform, assignee in all_slices(categorized_issues):
+        rows = slice_rows(categorized_issues, platform, assignee)
+        expected = naive_percentiles(rows)
+        stats = flow.slice_percentiles(platform, assignee)
+        if expected is None:
+            assert stats is None, (platform, assignee)
+        else:
+            assert stats['count'] == expected['count'], (platform, assignee)
+            for percentile in ['p50', 'p90', 'p99']:
+                assert stats[percentile] == pytest.approx(expected[percentile]), (platform, assignee, percentile)
+
+        throughput, velocity = flow.slice_throughput(platform, assignee)
+        expected_throughput, expected_velocity = naive_throughput(rows, categorized_issues)
+        np.testing.assert_array_equal(throughput.index, expected_throughput.index)
+        np.testing.assert_array_equal(throughput.to_numpy(), expected_throughput.to_numpy())
+        np.testing.assert_allclose(velocity.to_numpy(), expected_velocity.to_numpy())
+
+
+def test_flow_charts_show_slice_values(categorized_issues):
+    flow = FlowMetrics(categorized_issues)
+    assignee = categorized_issues['Assignee'].value_counts().index[0]
+    for selected_platform, selected_assignee in [(None, None), (None, assignee), ('UMPIRE', None), ('UMPIRE', assignee)]:
+        fig_cycle, fig_throughput = map(decode_typed_arrays, build_flow_charts(
+            flow, all_platforms_for_display, selected_platform, selected_assignee
+        ))
+        bars = {
+            (label, trace['name']): value
+            for trace in fig_cycle['data'] for label, value in zip(trace['x'], trace['y'])
+        }
+        labels = [('Wszystkie', None)] if selected_platform is None else []
+        labels += [(p, p) for p in all_platforms_for_display if selected_platform in (None, p)]
+        for label, platform in labels:
+            expected = naive_percentiles(slice_rows(categorized_issues, platform, selected_assignee))
+            for percentile in ['p50', 'p90', 'p99']:
+                if expected is None:
+                    assert (label, percentile) not in bars
+                else:
+                    assert bars[(label, percentile)] == pytest.approx(round(expected[percentile], 1))
+
+        expected_throughput, expected_velocity = naive_throughput(
+            slice_rows(categorized_issues, selected_platform, selected_assignee), categorized_issues
+        )
+        throughput_bars, velocity_line = fig_throughput['data']
+        assert throughput_bars['y'] == expected_throughput.tolist()
+        np.testing.assert_allclose(velocity_line['y'], expected_velocity.round(2).to_numpy())
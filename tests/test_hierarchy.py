@@ -0,0 +1,88 @@
+"""
+IssueHierarchy (podwajanie wskaźników i układ CSR) wobec naiwnego przechodzenia łańcucha
+rodziców zadanie po zadaniu, również dla zapętlonych i nieznanych rodziców.
+"""
+import numpy as np
+import pytest
+
+from analiza_jira.core import IssueHierarchy
+from bench_hierarchy import generate_hierarchy
+
+DEFAULT_RANK = 3
+
+
+def naive_walk(keys, parent_keys, ranks):
+    """
+    Zwraca (rodzic, korzeń, ranga dziedziczona) dla każdego zadania. Zadanie, którego łańcuch
+    rodziców nie kończy się korzeniem (cykl), traci rodzica, jak w IssueHierarchy.
+    """
+    position = {key: i for i, key in enumerate(keys)}
+    parent = [position.get(p, -1) if isinstance(p, str) and p != keys[i] else -1 for i, p in enumerate(parent_keys)]
+    effective_parent, root, inherited = [], [], []
+    for i in range(len(keys)):
+        chain, seen, node = [i], {i}, parent[i]
+        while node >= 0 and node not in seen:
+            chain.append(node)
+            seen.add(node)
+            node = parent[node]
+        if node >= 0:
+            chain = [i]
+        effective_parent.append(parent[i] if node < 0 else -1)
+        root.append(chain[-1])
+        inherited.append(min(ranks[j] for j in chain))
+    return np.array(effective_parent), np.array(root), np.array(inherited)
+
+
+def naive_descendants(effective_parent, position):
+    found, frontier = set(), {position}
+    while frontier:
+        frontier = {i for i, p in enumerate(effective_parent) if p in frontier}
+        found |= frontier
+    return found
+
+
+def random_hierarchy(n_issues, seed):
+    """
+    Generuje hierarchię z bench_hierarchy i psuje część rodziców: cykle, odwołania
+    do samego siebie, nieznane klucze i braki.
+    """
+    rng = np.random.default_rng(seed)
+    keys, parents, ranks = generate_hierarchy(n_issues, depth=6, n_epics=n_issues // 8, seed=seed)
+    broken = rng.choice(n_issues, n_issues // 10, replace=False)
+    for i in broken:
+        parents[i] = rng.choice([keys[rng.integers(n_issues)], keys[i], 'TPD-UNKNOWN', None])
+    ranks = np.minimum(ranks, DEFAULT_RANK)
+    return keys, parents, ranks
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_naive_parent_walk(seed):
+    keys, parents, ranks = random_hierarchy(400, seed)
+    hierarchy = IssueHierarchy(keys, parents, ranks, DEFAULT_RANK)
+    effective_parent, root, inherited = naive_walk(list(keys), list(parents), list(ranks))
+
+    np.testing.assert_array_equal(hierarchy.parent, effective_parent)
+    np.testing.assert_array_equal(hierarchy.root, root)
+    np.testing.assert_array_equal(hierarchy.inherited_rank, inherited)
+    for position in np.random.default_rng(seed).choice(len(keys), 30, replace=False):
+        assert set(hierarchy.descendants([position]).tolist()) == naive_descendants(effective_parent, position)
+
+
+def test_parent_ranks_for_unknown_and_missing_parents():
+    keys, parents, ranks = random_hierarchy(200, 7)
+    hierarchy = IssueHierarchy(keys, parents, ranks, DEFAULT_RANK)
+    _, _, inherited = naive_walk(list(keys), list(parents), list(ranks))
+    queried = [keys[5], 'TPD-UNKNOWN', None, np.nan, keys[150]]
+    expected = [inherited[5], DEFAULT_RANK, DEFAULT_RANK, DEFAULT_RANK, inherited[150]]
+    assert hierarchy.parent_ranks(queried).tolist() == expected
+
+
+def test_chains_ending_in_cycle_lose_parents():
+    # A -> B -> C -> A to cykl, D i E wiszą pod nim, G jest zwykłym dzieckiem F
+    keys = np.array(['A', 'B', 'C', 'D', 'E', 'F', 'G'], dtype=object)
+    parents = np.array(['B', 'C', 'A', 'A', 'D', None, 'F'], dtype=object)
+    hierarchy = IssueHierarchy(keys, parents, [2, 0, 3, 1, 3, 1, 3], DEFAULT_RANK)
+    assert hierarchy.parent.tolist() == [-1, -1, -1, -1, -1, -1, 5]
+    assert hierarchy.inherited_rank.tolist() == [2, 0, 3, 1, 3, 1, 1]
+    assert hierarchy.descendants([3]).size == 0
+    assert hierarchy.descendants([5]).tolist() == [6]
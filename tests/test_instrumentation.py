@@ -0,0 +1,117 @@
+"""
+Metryki w formacie tekstowym Prometheusa (StageMetrics.render_prometheus i adres /metrics):
+skumulowane kubełki histogramu z le="+Inf", _sum i _count, etykiety z ucieczką znaków
+oraz metryki kolektorów.
+"""
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from analiza_jira.instrumentation import StageMetrics
+from conftest import repo_dir
+from generate_export import generate_jira_export
+
+sample_pattern = re.compile(r'^(?P<name>[a-z_]+)(?:\{(?P<labels>.*)\})? (?P<value>\S+)$')
+label_pattern = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_exposition(text):
+    """
+    Próbki (nazwa, etykiety, wartość) oraz typy metryk z tekstu w formacie Prometheusa 0.0.4.
+    """
+    assert text.endswith('\n')
+    samples, types = [], {}
+    for line in text.splitlines():
+        if line.startswith('# TYPE '):
+            _, _, name, metric_type = line.split(' ')
+            types[name] = metric_type
+        elif not line.startswith('# HELP '):
+            match = sample_pattern.match(line)
+            assert match, line
+            labels = dict(label_pattern.findall(match['labels'] or ''))
+            samples.append((match['name'], labels, float(match['value'])))
+    return samples, types
+
+
+def histogram_samples(samples, stage):
+    buckets = [(labels['le'], value) for name, labels, value in samples
+               if name == 'jira_stage_duration_seconds_bucket' and labels['stage'] == stage]
+    totals = {name: value for name, labels, value in samples
+              if name in ('jira_stage_duration_seconds_sum', 'jira_stage_duration_seconds_count')
+              and labels['stage'] == stage}
+    return buckets, totals
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = StageMetrics(buckets=[0.01, 0.1, 1])
+    durations = {'parse_csv': [0.005, 0.01, 0.05, 0.5, 3.0], 'etap "z" \\ukośnikiem\n': [0.2]}
+    for stage, seconds in durations.items():
+        for value in seconds:
+            metrics.record(stage, value, rows=100)
+    metrics.add_collector(lambda: [
+        ('jira_cache_hits_total', 'counter', 'Trafienia cache wyników.', [({'cache': 'flow'}, 3)]),
+        ('jira_categorized_rows', 'gauge', 'Liczba wierszy.', [({}, 42)])
+    ])
+
+    samples, types = parse_exposition(metrics.render_prometheus())
+    assert types == {
+        'jira_stage_duration_seconds': 'histogram', 'jira_stage_rows_total': 'counter',
+        'jira_cache_hits_total': 'counter', 'jira_categorized_rows': 'gauge'
+    }
+    for stage, seconds in durations.items():
+        label = stage.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        buckets, totals = histogram_samples(samples, label)
+        # Kubełek le zawiera wszystkie pomiary <= le, a ostatni (+Inf) - wszystkie
+        assert [le for le, _ in buckets] == ['0.01', '0.1', '1', '+Inf']
+        expected = [sum(value <= float(le) for value in seconds) for le, _ in buckets]
+        assert [count for _, count in buckets] == expected
+        assert buckets[-1][1] == totals['jira_stage_duration_seconds_count'] == len(seconds)
+        assert totals['jira_stage_duration_seconds_sum'] == pytest.approx(sum(seconds), abs=1e-6)
+        assert ('jira_stage_rows_total', {'stage': label}, 100.0 * len(seconds)) in samples
+    assert ('jira_cache_hits_total', {'cache': 'flow'}, 3.0) in samples
+    assert ('jira_categorized_rows', {}, 42.0) in samples
+
+
+def test_empty_registry_renders_headers_only():
+    samples, types = parse_exposition(StageMetrics().render_prometheus())
+    assert samples == []
+    assert types == {'jira_stage_duration_seconds': 'histogram', 'jira_stage_rows_total': 'counter'}
+
+
+def test_metrics_route(tmp_path):
+    # /metrics jest rejestrowany przy imporcie aplikacji z JIRA_INSTRUMENTATION=1 - osobny proces
+    generate_jira_export(500, str(tmp_path / 'export.csv'), seed=2)
+    env = dict(os.environ, JIRA_INSTRUMENTATION='1', JIRA_DATA_DIR=str(tmp_path))
+    for name in ['JIRA_EXPORT_MANIFEST', 'JIRA_FEDERATE_EXPORTS', 'JIRA_ISSUE_STORE', 'JIRA_SHARED_CACHE_DIR',
+                 'JIRA_RELOAD_INTERVAL']:
+        env.pop(name, None)
+    script = (
+        "import analiza_jira_app\n"
+        "client = analiza_jira_app.server.test_client()\n"
+        "response = client.get('/metrics')\n"
+        "print(response.status_code, response.mimetype)\n"
+        "print(response.get_data(as_text=True), end='')\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=repo_dir, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    status_line, text = result.stdout.split('\n', 1)
+    assert status_line == '200 text/plain'
+
+    samples, types = parse_exposition(text)
+    assert types['jira_stage_duration_seconds'] == 'histogram'
+    assert types['jira_cache_hits_total'] == 'counter'
+    # Etapy wczytania eksportu przy starcie aplikacji
+    for stage in ['parse_csv', 'prepare_export', 'build_olap_cube']:
+        buckets, totals = histogram_samples(samples, stage)
+        counts = [count for _, count in buckets]
+        assert buckets[-1][0] == '+Inf'
+        assert counts == sorted(counts)
+        assert counts[-1] == totals['jira_stage_duration_seconds_count'] >= 1
+        assert totals['jira_stage_duration_seconds_sum'] >= 0
+    categorized_rows = [value for name, _, value in samples if name == 'jira_categorized_rows']
+    assert len(categorized_rows) == 1 and categorized_rows[0] > 0
+    caches = {labels['cache'] for name, labels, _ in samples if name == 'jira_cache_misses_total'}
+    assert caches == {'payloads', 'flow', 'details'}
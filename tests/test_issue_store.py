@@ -0,0 +1,105 @@
+"""
+Magazyn zadań: model odświeżany z dziennika zmian (load_store_model z poprzednim modelem)
+zgodny z modelem zbudowanym od nowa z magazynu, liczniki kategoryzacji i potomkowie zadań.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analiza_jira import issue_store
+from analiza_jira.core import build_categorized_issues, load_data_model, prepare_jira_export
+from analiza_jira.issue_store import IssueStore, load_store_model
+from generate_export import generate_jira_export
+
+
+@pytest.fixture(scope='module')
+def synthetic_export(tmp_path_factory):
+    return generate_jira_export(3000, str(tmp_path_factory.mktemp('store') / 'export.csv'), seed=5)
+
+
+def make_delta(df_export, rng, n_changed=60):
+    """
+    Zmienione zadania: status, tytuł, data zakończenia i rodzic (platforma dziedziczona przez
+    potomków), do tego kilka nowych zadań.
+    """
+    delta = df_export.iloc[rng.choice(len(df_export), n_changed, replace=False)].copy()
+    delta['Status'] = rng.choice(['Done', 'In Progress'], n_changed)
+    delta['Summary'] = 'Umpire ' + delta['Summary'].fillna('')
+    delta['Due date'] = rng.choice(['2025/01/15', '2025/04/30', '2025/07/01'], n_changed)
+    epics = df_export.loc[df_export['Issue Type'] == 'Epic', 'Key'].to_numpy()
+    delta['Parent'] = rng.choice(epics, n_changed)
+    delta.loc[delta['Issue Type'] == 'Epic', 'Parent'] = np.nan
+    new_issues = delta.head(5).assign(Key=[f'NEW-{rng.integers(10 ** 9)}' for _ in range(5)])
+    return pd.concat([delta, new_issues], ignore_index=True)
+
+
+def assert_models_equal(model, expected):
+    assert model.cube.cells == expected.cube.cells
+    assert model.cube.dimension_values == expected.cube.dimension_values
+    assert (model.quarters, model.kpi_quarters) == (expected.quarters, expected.kpi_quarters)
+    assert model.categorized_rows == expected.categorized_rows
+
+    assert model.flow.percentiles == expected.flow.percentiles
+    assert model.flow.weekly.keys() == expected.flow.weekly.keys()
+    for key, weeks in expected.flow.weekly.items():
+        pd.testing.assert_series_equal(model.flow.weekly[key], weeks)
+
+    assert model.details_index.groups.keys() == expected.details_index.groups.keys()
+    for group, rows in expected.details_index.groups.items():
+        pd.testing.assert_frame_equal(model.details_index.groups[group].astype(str), rows.astype(str))
+
+
+def test_incremental_refresh_matches_full_load(tmp_path, synthetic_export):
+    rng = np.random.default_rng(0)
+    df_export = pd.read_csv(synthetic_export, dtype=str)
+    store = IssueStore(str(tmp_path / 'store.sqlite'))
+    store.apply_delta_file(synthetic_export)
+    model = load_store_model(store)
+    assert load_store_model(store, model) is model
+
+    for _ in range(3):
+        # Dwie delty między odświeżeniami - zadanie zmienione w obu liczy się raz
+        for _ in range(2):
+            delta = make_delta(df_export, rng)
+            store.apply_delta(delta)
+            df_export = pd.concat([df_export, delta]).drop_duplicates('Key', keep='last')
+        model = load_store_model(store, model)
+        assert model.revision == store.revision()
+        assert_models_equal(model, load_store_model(store))
+
+    # Model z magazynu zgodny z pełnym eksportem o tej samej zawartości
+    export_path = str(tmp_path / 'export.csv')
+    df_export.to_csv(export_path, index=False)
+    csv_model = load_data_model(export_path)
+    assert model.cube.cells == csv_model.cube.cells
+    assert model.flow.percentiles == csv_model.flow.percentiles
+
+    expected_counts = build_categorized_issues(prepare_jira_export(df_export.reset_index(drop=True))).groupby(
+        ['Quarter', 'Platforma', 'Issue Type']
+    ).size()
+    counts = store.category_counts().set_index(['quarter', 'platform', 'issue_type'])['issue_count']
+    assert counts.to_dict() == expected_counts.to_dict()
+
+    epic_key = df_export.loc[df_export['Issue Type'] == 'Epic', 'Key'].iloc[0]
+    assert model.descendant_details(epic_key) == csv_model.descendant_details(epic_key)
+
+
+def test_model_older_than_change_log_is_rebuilt(tmp_path, synthetic_export, monkeypatch):
+    monkeypatch.setattr(issue_store, 'CHANGE_LOG_REVISIONS', 2)
+    rng = np.random.default_rng(1)
+    df_export = pd.read_csv(synthetic_export, dtype=str)
+    store = IssueStore(str(tmp_path / 'store.sqlite'))
+    store.apply_delta_file(synthetic_export)
+    model = load_store_model(store)
+    for _ in range(3):
+        store.apply_delta(make_delta(df_export, rng))
+
+    with store.transaction() as connection:
+        assert connection.execute('SELECT MIN(revision) FROM categorized_changes').fetchone()[0] == 3
+    # Dziennik nie obejmuje już rewizji modelu - różnicy nie da się odczytać
+    def read_changes_fails(*args):
+        raise AssertionError('model starszy niż dziennik zmian')
+
+    monkeypatch.setattr(issue_store, 'read_categorized_changes', read_changes_fails)
+    refreshed = load_store_model(store, model)
+    assert_models_equal(refreshed, load_store_model(store))
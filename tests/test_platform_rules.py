@@ -0,0 +1,130 @@
+"""
+Reguły platform (PlatformRules, platform_rules.json): priorytet przy nakładających się
+słowach kluczowych, słowo powtórzone w kilku regułach, błędne pliki reguł i zgodność
+domyślnych reguł z pierwotnym mapowaniem (tests/reference_categorization.py).
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analiza_jira import core
+from analiza_jira.core import PlatformRules, categorize_and_filter_changes, load_platform_rules
+from reference_categorization import categorize_and_filter_changes as reference_categorize
+
+platforms = ['UMPIRE', 'WICKET', 'STRIDE', 'Ogólne/Cross-platformowe']
+
+
+def make_rules(keyword_rules, manual_overrides=()):
+    return PlatformRules(platforms, 'Ogólne/Cross-platformowe', keyword_rules, list(manual_overrides))
+
+
+def assigned_platforms(rules, *texts):
+    return rules.rank_platforms[rules.rank(*texts)].tolist()
+
+
+def test_priority_decides_overlapping_keywords():
+    rules = make_rules([
+        {'platform': 'WICKET', 'priority': 2, 'keywords': ['Web']},
+        {'platform': 'UMPIRE', 'priority': 1, 'keywords': ['WebTV']},
+        {'platform': 'STRIDE', 'priority': 3, 'keywords': ['TV app']}
+    ])
+    # Słowa zaczynające się w tym samym miejscu i zawarte jedno w drugim - wygrywa wyższy priorytet,
+    # niezależnie od kolejności reguł w pliku i pozycji słowa w tekście
+    texts = ['WebTV app', 'Web app', 'TV app, potem Web', 'Nowy WebTV', 'bez słów', 'TV app']
+    assert assigned_platforms(rules, texts) == ['UMPIRE', 'WICKET', 'WICKET', 'UMPIRE', 'Ogólne/Cross-platformowe',
+                                                'STRIDE']
+
+    reversed_rules = make_rules([
+        {'platform': 'WICKET', 'priority': 1, 'keywords': ['Web']},
+        {'platform': 'UMPIRE', 'priority': 2, 'keywords': ['WebTV']}
+    ])
+    assert assigned_platforms(reversed_rules, ['WebTV app', 'Nowy WebTV']) == ['WICKET', 'WICKET']
+    # Słowo z tytułu rodzica konkuruje z tytułem zadania na tych samych zasadach
+    assert assigned_platforms(rules, ['Web app', 'bez słów'], ['Epik WebTV', 'TV app']) == ['UMPIRE', 'STRIDE']
+
+
+def test_repeated_keyword_belongs_to_first_rule():
+    rules = make_rules([
+        {'platform': 'STRIDE', 'priority': 3, 'keywords': ['Player']},
+        {'platform': 'WICKET', 'priority': 2, 'keywords': ['Player', 'Wicket']},
+        {'platform': 'UMPIRE', 'priority': 2, 'keywords': ['Player', 'Umpire']}
+    ])
+    # Przy równym priorytecie rozstrzyga kolejność reguł w pliku
+    assert rules.keyword_ranks == {'Player': 0, 'Wicket': 1, 'Umpire': 2}
+    assert assigned_platforms(rules, ['Player', 'Umpire Player', 'Stride']) == [
+        'WICKET', 'WICKET', 'Ogólne/Cross-platformowe'
+    ]
+
+
+@pytest.mark.parametrize('content, message', [
+    ('{"platforms": ["UMPIRE"], ', 'Błędny plik reguł'),
+    ('[]', 'Błędny plik reguł'),
+    ('{"default_platform": "UMPIRE"}', 'platforms'),
+    ('{"platforms": ["UMPIRE"], "default_platform": "UMPIRE", "keyword_rules": [{"platform": "UMPIRE"}]}',
+     'priority'),
+    ('{"platforms": ["UMPIRE"], "default_platform": "WICKET"}', "Nieznana platforma w regułach: 'WICKET'"),
+    ('{"platforms": ["UMPIRE"], "default_platform": "UMPIRE", '
+     '"keyword_rules": [{"platform": "STRIDE", "priority": 1, "keywords": ["Stride"]}]}',
+     "Nieznana platforma w regułach: 'STRIDE'"),
+    ('{"platforms": ["UMPIRE"], "default_platform": "UMPIRE", '
+     '"manual_overrides": [{"key": "TPD-1", "quarter": "Q1 2025", "platforms": ["WICKET"]}]}',
+     "Nieznana platforma 'WICKET' w nadpisaniu TPD-1"),
+])
+def test_invalid_rules_file(tmp_path, monkeypatch, content, message):
+    rules_path = tmp_path / 'platform_rules.json'
+    rules_path.write_text(content, encoding='utf-8')
+    with pytest.raises(ValueError, match=message) as error:
+        load_platform_rules(str(rules_path))
+    assert str(rules_path) in str(error.value)
+
+    # Reguły wczytywane przy pierwszym użyciu - błąd pojawia się dopiero wtedy, nie przy imporcie
+    monkeypatch.setattr(core, 'platform_rules_path', str(rules_path))
+    monkeypatch.setattr(core, '_platform_rules', None)
+    with pytest.raises(ValueError, match=message):
+        core.get_platform_rules()
+
+
+def baseline_platform(summary, parent_summary):
+    """
+    Platforma ze słów kluczowych wg pierwotnej pętli (reference_categorization.py).
+    """
+    if "Umpire" in summary or "Umpire" in parent_summary:
+        return "UMPIRE"
+    if "Wicket" in summary or "Wicket" in parent_summary:
+        return "WICKET"
+    if "Stride" in summary or "Stride" in parent_summary:
+        return "STRIDE"
+    return "Ogólne/Cross-platformowe"
+
+
+def test_default_rules_match_baseline_mapping():
+    rules = load_platform_rules(core.platform_rules_path)
+    assert rules.platforms == platforms
+    assert rules.default_platform == 'Ogólne/Cross-platformowe'
+
+    fragments = ['', 'Umpire', '[Wicket] ', 'Stride', 'umpire', 'Wicketkeeper']
+    texts = [' '.join(parts) for parts in itertools.product(fragments, repeat=2)]
+    summaries, parent_summaries = zip(*itertools.product(texts, repeat=2))
+    expected = [baseline_platform(s, p) for s, p in zip(summaries, parent_summaries)]
+    assert assigned_platforms(rules, list(summaries), list(parent_summaries)) == expected
+
+
+def test_default_overrides_match_baseline_mapping():
+    # Każdy klucz z manualnym nadpisaniem jako zakończone zadanie z datą spoza nadpisanego kwartału
+    override_keys = load_platform_rules(core.platform_rules_path).overrides['Key'].unique()
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Key': override_keys,
+        'Summary': rng.choice(['Umpire fix', 'Wicket', 'Stride task', 'Inne'], len(override_keys)),
+        'Issue Type': 'Story',
+        'Status': 'Done',
+        'Parent': np.nan,
+        'Due date': rng.choice(['2025/02/10', '2025/05/10', '2024/11/02'], len(override_keys)),
+        'Inferred due date': np.nan,
+        **{column: np.nan for column in ['Start date', 'Inferred start date', 'Assignee', 'Sprint', 'Issue color']}
+    })
+    for selected_quarter in ['All 2025', 'Q1 2025', 'Q2 2025']:
+        expected = reference_categorize(df, selected_quarter, None)
+        assert categorize_and_filter_changes(df, selected_quarter, None) == expected
@@ -0,0 +1,121 @@
+"""
+Przyrostowe przeładowanie eksportu (load_data_model z poprzednim modelem): wynik taki sam
+jak model zbudowany od nowa, także po zmianie tytułu przodka, usunięciu i dodaniu zadań,
+a przy dużej zmianie - pełna przebudowa. Hierarchia z rangami z poprzedniego indeksu.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analiza_jira import core
+from analiza_jira.core import build_issue_hierarchy, load_data_model
+from generate_export import generate_jira_export
+
+
+@pytest.fixture(scope='module')
+def synthetic_export(tmp_path_factory):
+    return pd.read_csv(
+        generate_jira_export(3000, str(tmp_path_factory.mktemp('reload') / 'export.csv'), seed=7), dtype=str
+    )
+
+
+def assert_models_equal(model, expected):
+    pd.testing.assert_frame_equal(model.categorized_issues, expected.categorized_issues)
+    assert model.cube.cells == expected.cube.cells
+    assert model.cube.dimension_values == expected.cube.dimension_values
+    assert (model.quarters, model.kpi_quarters, model.categorized_rows) == (
+        expected.quarters, expected.kpi_quarters, expected.categorized_rows
+    )
+    assert model.flow.percentiles == expected.flow.percentiles
+    assert model.flow.weekly.keys() == expected.flow.weekly.keys()
+    for key, weeks in expected.flow.weekly.items():
+        pd.testing.assert_series_equal(model.flow.weekly[key], weeks)
+    assert model.details_index.groups.keys() == expected.details_index.groups.keys()
+    for group, rows in expected.details_index.groups.items():
+        pd.testing.assert_frame_equal(model.details_index.groups[group], rows)
+    np.testing.assert_array_equal(model.hierarchy.keyword_ranks, expected.hierarchy.keyword_ranks)
+    np.testing.assert_array_equal(model.hierarchy.inherited_rank, expected.hierarchy.inherited_rank)
+
+
+def reload_and_compare(tmp_path, df_before, df_after, monkeypatch, incremental=True):
+    export_path = str(tmp_path / 'export.csv')
+    df_before.to_csv(export_path, index=False)
+    previous_model = load_data_model(export_path)
+    df_after.to_csv(export_path, index=False)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('nieoczekiwana ścieżka przeładowania')
+
+    with monkeypatch.context() as patch:
+        # Ścieżka przyrostowa nie kategoryzuje całego eksportu, a pełna nie porównuje zmian
+        patch.setattr(core, 'build_categorized_issues' if incremental else 'update_categorized_issues', fail)
+        model = load_data_model(export_path, previous_model=previous_model)
+    assert model.fingerprint != previous_model.fingerprint
+    fresh_path = str(tmp_path / 'fresh.csv')
+    df_after.to_csv(fresh_path, index=False)
+    fresh_model = load_data_model(fresh_path)
+    assert_models_equal(model, fresh_model)
+    return previous_model, model, fresh_model
+
+
+def test_summary_changes_including_ancestor(tmp_path, synthetic_export, monkeypatch):
+    df = synthetic_export.copy()
+    df.loc[df.index[:10], 'Summary'] = 'Zmiana ' + df.loc[df.index[:10], 'Summary'].fillna('')
+    # Epik z potomkami dostaje słowo kluczowe o najwyższym priorytecie - potomkowie zmieniają platformę
+    parents = df['Parent'].dropna()
+    epic_index = df.index[df['Key'] == parents.value_counts().index[0]][0]
+    top_keyword = min(core.get_platform_rules().keyword_ranks, key=core.get_platform_rules().keyword_ranks.get)
+    df.loc[epic_index, 'Summary'] = f'[{top_keyword}] ' + str(df.loc[epic_index, 'Summary'])
+    previous_model, model, fresh_model = reload_and_compare(tmp_path, synthetic_export, df, monkeypatch)
+
+    # Zmiana przodka przenosi na inną platformę zadania, których wiersze się nie zmieniły
+    unchanged_keys = df['Key'].iloc[10:]
+    platforms = model.categorized_issues.merge(
+        previous_model.categorized_issues, on=['Key', 'Quarter'], suffixes=('', '_before')
+    )
+    platforms = platforms[platforms['Key'].isin(unchanged_keys)]
+    assert (platforms['Platforma'] != platforms['Platforma_before']).any()
+    epic_key = df.loc[epic_index, 'Key']
+    assert model.descendant_details(epic_key) == fresh_model.descendant_details(epic_key)
+
+
+def test_added_removed_and_reparented_issues(tmp_path, synthetic_export, monkeypatch):
+    rng = np.random.default_rng(0)
+    df = synthetic_export.drop(synthetic_export.index[rng.choice(len(synthetic_export), 40, replace=False)])
+    reparented = df.index[df['Parent'].notna()][:30]
+    epics = df.loc[df['Issue Type'] == 'Epic', 'Key'].to_numpy()
+    df.loc[reparented, 'Parent'] = rng.choice(epics, len(reparented))
+    df.loc[df.index[100:130], 'Status'] = 'Done'
+    df.loc[df.index[130:140], 'Due date'] = '2025/03/31'
+    added = df.iloc[:20].assign(Key=[f'NEW-{i}' for i in range(20)])
+    reload_and_compare(tmp_path, synthetic_export, pd.concat([df, added], ignore_index=True), monkeypatch)
+
+
+def test_large_change_rebuilds_model(tmp_path, synthetic_export, monkeypatch):
+    df = synthetic_export.assign(Summary='Umpire ' + synthetic_export['Summary'].fillna(''))
+    reload_and_compare(tmp_path, synthetic_export, df, monkeypatch, incremental=False)
+
+
+def test_hierarchy_reuses_ranks_of_unchanged_issues(synthetic_export):
+    previous_hierarchy = build_issue_hierarchy(synthetic_export)
+    df = synthetic_export.copy()
+    df.loc[df.index[:50], 'Summary'] = 'Wicket ' + df.loc[df.index[:50], 'Summary'].fillna('')
+    changed_keys = df['Key'].iloc[:50].to_numpy()
+    hierarchy = build_issue_hierarchy(df, previous_hierarchy, changed_keys)
+    expected = build_issue_hierarchy(df)
+    np.testing.assert_array_equal(hierarchy.keyword_ranks, expected.keyword_ranks)
+    np.testing.assert_array_equal(hierarchy.inherited_rank, expected.inherited_rank)
+    # Bez listy zmienionych kluczy zmienione tytuły zachowałyby stare rangi
+    stale = build_issue_hierarchy(df, previous_hierarchy, [])
+    assert (stale.keyword_ranks != expected.keyword_ranks).any()
+
+
+def test_model_without_hierarchy_reports_missing_descendants(tmp_path, synthetic_export):
+    export_path = str(tmp_path / 'export.csv')
+    synthetic_export.to_csv(export_path, index=False)
+    model = load_data_model(export_path)
+    no_changes = model.categorized_issues.iloc[0:0]
+    changed = model.with_changes('zmieniony', None, None, None, no_changes, no_changes)
+    assert changed.cube.cells == model.cube.cells
+    with pytest.raises(ValueError, match='hierarchii'):
+        changed.descendant_details(synthetic_export['Key'].iloc[0])
@@ -0,0 +1,54 @@
+"""
+Raporty wsadowe: unikalne nazwy eksportów o tej samej nazwie pliku w różnych katalogach
+oraz import pakietu bez pliku reguł platform.
+"""
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from analiza_jira.report import build_export_names, main
+from conftest import repo_dir
+
+
+def test_export_names_relative_to_common_directory(tmp_path):
+    paths = [str(tmp_path / 'teamA' / 'export.csv'), str(tmp_path / 'teamB' / 'export.csv')]
+    assert build_export_names(paths) == ['teamA/export', 'teamB/export']
+    assert build_export_names(paths[:1]) == ['export']
+
+
+def test_export_names_differing_only_by_extension(tmp_path):
+    paths = [str(tmp_path / 'export.csv'), str(tmp_path / 'export.CSV'), str(tmp_path / 'export.txt')]
+    assert build_export_names(paths) == ['export', 'export-2', 'export-3']
+
+
+def test_reports_for_same_file_name_in_two_directories(tmp_path, bundled_export):
+    for team, status in [('teamA', 'Done'), ('teamB', 'In Progress')]:
+        os.makedirs(tmp_path / team)
+        bundled_export.assign(Status=status).to_csv(tmp_path / team / 'export.csv', index=False)
+    output_dir = tmp_path / 'raporty'
+
+    assert main([str(tmp_path / 'teamA'), str(tmp_path / 'teamB'), '-o', str(output_dir), '--workers', '1']) == 0
+    assert (output_dir / 'teamA' / 'export.html').exists()
+    assert (output_dir / 'teamB' / 'export.html').exists()
+    platform_counts = pd.read_csv(output_dir / 'platform_counts.csv')
+    # Eksport teamB nie ma zakończonych zadań, więc wszystkie wiersze pochodzą z teamA
+    assert set(platform_counts['Eksport']) == {'teamA/export'}
+    index = (output_dir / 'index.html').read_text(encoding='utf-8')
+    assert 'href="teamA/export.html"' in index and 'href="teamB/export.html"' in index
+
+
+def test_package_imports_without_platform_rules(tmp_path):
+    env = dict(os.environ, JIRA_PLATFORM_RULES=str(tmp_path / 'brak.json'))
+    script = (
+        "import analiza_jira\n"
+        "from analiza_jira import core\n"
+        "try:\n"
+        "    core.all_platforms_for_display\n"
+        "except FileNotFoundError:\n"
+        "    print('lazy')\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=repo_dir, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'lazy'
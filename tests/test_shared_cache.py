@@ -0,0 +1,131 @@
+"""
+Cache wyników współdzielony przez procesy (open_shared_cache): wpis policzony w jednym
+procesie trafiany w drugim, równoległe zapisy tego samego klucza, nowy odcisk modelu jako
+chybienie oraz katalog plików pickle, gdy diskcache nie jest zainstalowany.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from analiza_jira import shared_cache
+from analiza_jira.core import load_data_model
+from analiza_jira.shared_cache import FileResultCache, SharedResultCache, open_shared_cache
+from conftest import repo_dir
+
+# Proces workera: wynik dla klucza z argv, informacja, czy był liczony, i liczniki cache.
+# Ustawienie JIRA_TEST_NO_DISKCACHE udaje brak pakietu diskcache.
+worker_script = '''
+import json, os, sys, time
+if os.environ.get('JIRA_TEST_NO_DISKCACHE') == '1':
+    sys.modules['diskcache'] = None
+from analiza_jira.shared_cache import open_shared_cache
+
+cache = open_shared_cache(sys.argv[1])
+computed = []
+
+def compute():
+    computed.append(os.getpid())
+    time.sleep(float(os.environ.get('JIRA_TEST_COMPUTE_SECONDS', '0')))
+    return {'pid': os.getpid(), 'rows': list(range(100))}
+
+value = cache.get_or_compute(tuple(sys.argv[2:]), compute)
+print(json.dumps({'value': value, 'computed': bool(computed), 'stats': cache.stats()}))
+'''
+
+
+def start_worker(cache_dir, *key_parts, **env):
+    return subprocess.Popen(
+        [sys.executable, '-c', worker_script, str(cache_dir), *key_parts], cwd=repo_dir,
+        env=dict(os.environ, **env), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+
+
+def worker_result(process):
+    stdout, stderr = process.communicate(timeout=60)
+    assert process.returncode == 0, stderr
+    return json.loads(stdout)
+
+
+def run_worker(cache_dir, *key_parts, **env):
+    return worker_result(start_worker(cache_dir, *key_parts, **env))
+
+
+@pytest.mark.parametrize('no_diskcache', ['0', '1'])
+def test_entry_shared_between_processes(tmp_path, no_diskcache):
+    first = run_worker(tmp_path, 'payload', 'odcisk-1', JIRA_TEST_NO_DISKCACHE=no_diskcache)
+    second = run_worker(tmp_path, 'payload', 'odcisk-1', JIRA_TEST_NO_DISKCACHE=no_diskcache)
+    assert first['computed'] and not second['computed']
+    assert second['value'] == first['value']
+    assert (first['stats']['misses'], first['stats']['hits']) == (1, 0)
+    assert (second['stats']['misses'], second['stats']['hits']) == (0, 1)
+    assert second['stats']['size'] == 1
+    if no_diskcache == '1':
+        assert first['stats']['backend'] == second['stats']['backend'] == 'files'
+
+
+def test_parallel_writers_of_same_key(tmp_path):
+    # Kilka workerów liczy ten sam wynik jednocześnie - każdy dostaje kompletny wynik,
+    # a wpis w cache pochodzi od jednego z nich
+    processes = [
+        start_worker(tmp_path, 'flow', 'odcisk-1', JIRA_TEST_NO_DISKCACHE='1', JIRA_TEST_COMPUTE_SECONDS='0.3')
+        for _ in range(4)
+    ]
+    results = [worker_result(process) for process in processes]
+    assert all(result['value']['rows'] == list(range(100)) for result in results)
+    reader = run_worker(tmp_path, 'flow', 'odcisk-1', JIRA_TEST_NO_DISKCACHE='1')
+    assert not reader['computed']
+    assert reader['value'] in [result['value'] for result in results if result['computed']]
+    assert sorted(os.listdir(tmp_path)) == [shared_cache.shared_cache_key('flow', 'odcisk-1') + '.pkl']
+
+
+def test_changed_export_fingerprint_misses(tmp_path, bundled_export):
+    export_path = str(tmp_path / 'export.csv')
+    bundled_export.to_csv(export_path, index=False)
+    model = load_data_model(export_path)
+    bundled_export.assign(Summary='Umpire zmiana').to_csv(export_path, index=False)
+    changed_model = load_data_model(export_path, previous_model=model)
+    assert changed_model.fingerprint != model.fingerprint
+
+    cache = SharedResultCache(FileResultCache(str(tmp_path / 'cache')))
+    key_parts = ('reguły', 'payload', model.fingerprint)
+    assert cache.get_or_compute(key_parts, lambda: 'stary wynik') == 'stary wynik'
+    assert cache.get_or_compute(key_parts, lambda: 'nieużywany') == 'stary wynik'
+    # Ten sam filtr po zmianie eksportu (albo reguł platform) to inny klucz - wynik liczony od nowa
+    assert cache.get_or_compute(('reguły', 'payload', changed_model.fingerprint), lambda: 'nowy wynik') == 'nowy wynik'
+    assert cache.get_or_compute(('inne reguły', 'payload', model.fingerprint), lambda: 'reguły') == 'reguły'
+    assert (cache.stats()['hits'], cache.stats()['misses'], cache.stats()['size']) == (1, 3, 3)
+
+
+def test_file_cache_without_diskcache(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_cache, 'DISKCACHE_AVAILABLE', False)
+    cache = open_shared_cache(str(tmp_path / 'cache'))
+    assert isinstance(cache.store, FileResultCache)
+    assert cache.stats()['backend'] == 'files'
+
+    # Uszkodzony wpis to chybienie, a nie błąd
+    key = shared_cache.shared_cache_key('payload', 'odcisk-1')
+    (tmp_path / 'cache' / (key + '.pkl')).write_bytes(b'uszkodzony')
+    assert cache.get_or_compute(('payload', 'odcisk-1'), lambda: 'przeliczony') == 'przeliczony'
+    assert cache.get_or_compute(('payload', 'odcisk-1'), lambda: 'nieużywany') == 'przeliczony'
+
+
+def test_file_cache_culls_oldest_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_cache, 'FILE_CACHE_CULL_EVERY', 5)
+    store = FileResultCache(str(tmp_path), max_files=3)
+    for i in range(5):
+        store.set(f'wpis-{i}', i)
+        os.utime(tmp_path / f'wpis-{i}.pkl', (1_000_000 + i, 1_000_000 + i))
+    store.cull()
+    assert store.size() == 3
+    assert [store.get(f'wpis-{i}') for i in range(5)] == [None, None, 2, 3, 4]
+
+
+def test_diskcache_backend(tmp_path):
+    pytest.importorskip('diskcache')
+    cache = open_shared_cache(str(tmp_path))
+    assert cache.stats()['backend'] == 'diskcache'
+    assert cache.get_or_compute(('payload', 'odcisk-1'), lambda: 'wynik') == 'wynik'
+    assert open_shared_cache(str(tmp_path)).get_or_compute(('payload', 'odcisk-1'), lambda: 'nieużywany') == 'wynik'
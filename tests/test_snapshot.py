@@ -0,0 +1,66 @@
+"""
+Snapshot Parquet eksportu: używany tylko dla tej samej zawartości pliku CSV.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from analiza_jira import core
+
+pytestmark = pytest.mark.skipif(not core.PARQUET_AVAILABLE, reason='wymaga pyarrow')
+
+
+def test_snapshot_reused_for_unchanged_export(tmp_path, bundled_export, monkeypatch):
+    export_path = str(tmp_path / 'export.csv')
+    bundled_export.to_csv(export_path, index=False)
+    expected = core.load_jira_export(export_path)
+    assert os.path.exists(core.get_snapshot_path(export_path))
+
+    def fail_read_csv(*args, **kwargs):
+        raise AssertionError('CSV parsowany mimo aktualnego snapshotu')
+
+    monkeypatch.setattr(core.pd, 'read_csv', fail_read_csv)
+    snapshot = core.load_jira_export(export_path)
+    pd.testing.assert_frame_equal(snapshot, expected)
+    assert snapshot.attrs == {}
+
+
+def test_snapshot_ignored_when_export_rewritten_with_older_mtime(tmp_path, bundled_export):
+    export_path = str(tmp_path / 'export.csv')
+    bundled_export.to_csv(export_path, index=False)
+    core.load_jira_export(export_path)
+
+    # Nowszy eksport skopiowany z zachowaniem starszej daty modyfikacji (np. rsync -t)
+    changed = bundled_export.assign(Summary='Wicket zmiana')
+    changed.to_csv(export_path, index=False)
+    os.utime(export_path, (1_000_000, 1_000_000))
+    assert (core.load_jira_export(export_path)['Summary'] == 'Wicket zmiana').all()
+
+
+def test_stale_snapshot_not_read(tmp_path, bundled_export, monkeypatch):
+    export_path = str(tmp_path / 'export.csv')
+    bundled_export.to_csv(export_path, index=False)
+    core.load_jira_export(export_path)
+    snapshot_path = core.get_snapshot_path(export_path)
+    assert core.read_snapshot_fingerprint(snapshot_path) == core.compute_data_fingerprint(export_path)
+
+    # Zmieniony eksport: odcisk z metadanych nie pasuje, więc dane snapshotu nie są wczytywane
+    bundled_export.assign(Summary='Umpire zmiana').to_csv(export_path, index=False)
+
+    def fail_read_parquet(*args, **kwargs):
+        raise AssertionError('wczytano nieaktualny snapshot')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(core.pd, 'read_parquet', fail_read_parquet)
+        assert (core.load_jira_export(export_path)['Summary'] == 'Umpire zmiana').all()
+    assert core.read_snapshot_fingerprint(snapshot_path) == core.compute_data_fingerprint(export_path)
+
+
+def test_unreadable_snapshot_rebuilt(tmp_path, bundled_export):
+    export_path = str(tmp_path / 'export.csv')
+    bundled_export.to_csv(export_path, index=False)
+    with open(core.get_snapshot_path(export_path), 'wb') as snapshot_file:
+        snapshot_file.write(b'to nie jest parquet')
+    assert core.read_snapshot_fingerprint(core.get_snapshot_path(export_path)) is None
+    assert len(core.load_jira_export(export_path)) == len(bundled_export)
@@ -0,0 +1,118 @@
+"""
+Tryb strumieniowy (JIRA_STREAMING_INGEST=1): kostka, analiza przepływu i wiersze szczegółów
+zgodne z pełnym wczytaniem eksportu (także przy powtórzonych kluczach), federacja czytająca
+każdy plik najwyżej dwa razy i raporty.
+"""
+import os
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from analiza_jira.core import (
+    FlowMetrics, OlapCube, build_categorized_issues, load_data_model, load_federated_model,
+    stream_categorized_issues
+)
+from analiza_jira.report import compute_export_report
+from generate_export import generate_jira_export
+
+
+@pytest.fixture(scope='module')
+def synthetic_export(tmp_path_factory):
+    return generate_jira_export(3000, str(tmp_path_factory.mktemp('streaming') / 'export.csv'), seed=3)
+
+
+def assert_streamed_matches(streamed, expected, df_raw):
+    categorized_issues, hierarchy, cube = streamed
+    expected_cube = OlapCube(expected)
+    assert cube.cells == expected_cube.cells
+    assert cube.dimension_values == expected_cube.dimension_values
+    assert (cube.quarter_count, cube.platform_count) == (expected_cube.quarter_count, expected_cube.platform_count)
+
+    streamed_flow, expected_flow = FlowMetrics(categorized_issues), FlowMetrics(expected)
+    assert streamed_flow.percentiles == expected_flow.percentiles
+    assert streamed_flow.weekly.keys() == expected_flow.weekly.keys()
+    for key, weeks in expected_flow.weekly.items():
+        pd.testing.assert_series_equal(streamed_flow.weekly[key], weeks)
+
+    # Zwarte wiersze: bez tytułów, Detail to sam klucz - poza zadaniami z powtórzonym kluczem
+    compared = ['Key', 'Issue Type', 'Quarter', 'Platforma', 'Assignee', 'Sprint', 'Issue color',
+                'Start_Date', 'Completion_Date']
+    pd.testing.assert_frame_equal(categorized_issues[compared], expected[compared])
+    is_repeated = expected['Key'].isin(df_raw['Key'][df_raw['Key'].duplicated()]).to_numpy()
+    compact = categorized_issues[~is_repeated]
+    assert (compact['Summary'] == '').all()
+    assert (compact['Detail'] == compact['Key']).all()
+    pd.testing.assert_frame_equal(categorized_issues[is_repeated], expected[is_repeated])
+
+
+def test_streamed_export_matches_full_load(synthetic_export):
+    df = pd.read_csv(synthetic_export, dtype=str)
+    expected = build_categorized_issues(df)
+    assert_streamed_matches(stream_categorized_issues(synthetic_export, chunksize=500), expected, df)
+
+
+def test_repeated_keys_counted_like_full_load(tmp_path, synthetic_export):
+    df = pd.read_csv(synthetic_export, dtype=str)
+    # Ponowione zadania na końcu pliku (w innej porcji): zmieniony status, część z tym samym tytułem
+    repeated = df.sample(300, random_state=1).assign(Status='Done')
+    repeated.loc[repeated.index[:150], 'Summary'] = 'Wicket poprawka'
+    df = pd.concat([df, repeated], ignore_index=True)
+    export_path = str(tmp_path / 'repeated.csv')
+    df.to_csv(export_path, index=False)
+
+    # Jak w trybie pełnym: każdy wiersz jest kategoryzowany, a kostka liczy unikalne opisy
+    expected = build_categorized_issues(df)
+    assert_streamed_matches(stream_categorized_issues(export_path, chunksize=500), expected, df)
+
+
+def test_streaming_federation_and_reload(tmp_path, synthetic_export, monkeypatch):
+    df = pd.read_csv(synthetic_export, dtype=str)
+    older, newer = df.iloc[:2000].copy(), df.iloc[1000:].copy()
+    newer['Status'] = 'Done'
+    older.to_csv(tmp_path / 'a.csv', index=False)
+    newer.to_csv(tmp_path / 'b.csv', index=False)
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text('["a.csv", "b.csv"]')
+
+    full = load_federated_model(str(manifest_path))
+    monkeypatch.setenv('JIRA_STREAMING_INGEST', '1')
+    csv_reads = Counter()
+    read_csv = pd.read_csv
+
+    def counting_read_csv(path, *args, **kwargs):
+        csv_reads[os.path.basename(path)] += 1
+        return read_csv(path, *args, **kwargs)
+
+    monkeypatch.setattr(pd, 'read_csv', counting_read_csv)
+    streamed = load_federated_model(str(manifest_path))
+    # Indeks hierarchii i kategoryzacja - jeden przebieg każdy, wspólny dla źródła i modelu połączonego
+    assert csv_reads == {'a.csv': 2, 'b.csv': 2}
+    assert all(model.df_raw is None for model in streamed.source_models.values())
+    for name, model in streamed.source_models.items():
+        assert model.cube.cells == full.source_models[name].cube.cells
+    assert streamed.combined.cube.cells == full.combined.cube.cells
+    assert streamed.combined.flow.percentiles == full.combined.flow.percentiles
+    assert load_federated_model(str(manifest_path), previous_model=streamed) is streamed
+
+    older.loc[older.index[:100], 'Summary'] = 'Umpire zmiana'
+    older.to_csv(tmp_path / 'a.csv', index=False)
+    csv_reads.clear()
+    reloaded = load_federated_model(str(manifest_path), previous_model=streamed)
+    # Niezmieniony plik czytany tylko do kategoryzacji modelu połączonego
+    assert csv_reads == {'a.csv': 2, 'b.csv': 1}
+    assert reloaded.source_models['b'] is streamed.source_models['b']
+    monkeypatch.delenv('JIRA_STREAMING_INGEST')
+    full = load_federated_model(str(manifest_path))
+    assert reloaded.combined.cube.cells == full.combined.cube.cells
+    assert reloaded.source_models['a'].cube.cells == full.source_models['a'].cube.cells
+
+
+def test_report_in_streaming_mode(synthetic_export, monkeypatch):
+    expected = compute_export_report(synthetic_export)
+    monkeypatch.setenv('JIRA_STREAMING_INGEST', '1')
+    assert load_data_model(synthetic_export).df_raw is None
+    report = compute_export_report(synthetic_export)
+    assert report['kpi'] == expected['kpi']
+    pd.testing.assert_frame_equal(report['platform_counts'], expected['platform_counts'])
+    pd.testing.assert_frame_equal(report['issue_type_counts'], expected['issue_type_counts'])